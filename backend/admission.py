@@ -0,0 +1,214 @@
+"""Priority-aware admission control and backpressure for the message pipeline."""
+
+import asyncio
+import heapq
+import itertools
+import math
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from config import settings
+from data.memory import memories
+from models.schemas import EmployerMessage
+
+# Priority classes, most urgent first
+PRIORITY_INTERVIEW = 0
+PRIORITY_REPLY = 1
+PRIORITY_COLD = 2
+PRIORITY_NAMES = {PRIORITY_INTERVIEW: "interview", PRIORITY_REPLY: "reply", PRIORITY_COLD: "cold"}
+
+INTERVIEW_PATTERN = re.compile(
+    r"\b(interview|schedul\w*|availab\w*|call|meeting|time slot)\b", re.IGNORECASE
+)
+
+
+def classify_priority(message: EmployerMessage) -> int:
+    """Interview scheduling first, then replies to existing threads, then cold outreach."""
+    if INTERVIEW_PATTERN.search(message.subject) or INTERVIEW_PATTERN.search(message.message):
+        return PRIORITY_INTERVIEW
+    memory = memories.find(message.profile_id)
+    known_sender = memory is not None and memory.count(message.sender_email) > 0
+    if known_sender or message.subject.lower().startswith("re:"):
+        return PRIORITY_REPLY
+    return PRIORITY_COLD
+
+
+class AdmissionRejected(Exception):
+    """Raised when a message is shed instead of admitted to the pipeline."""
+
+    def __init__(self, status_code: int, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("priority", "seq", "future", "sheddable", "enqueued_at")
+
+    def __init__(self, priority: int, seq: int, sheddable: bool):
+        self.priority = priority
+        self.seq = seq
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.sheddable = sheddable
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+def _granted(waiter: _Waiter) -> bool:
+    future = waiter.future
+    return future.done() and not future.cancelled() and future.exception() is None
+
+
+class AdmissionController:
+    """Bounds concurrent pipeline runs with a prioritised, deadline-limited wait queue.
+
+    - At most ``max_in_flight`` messages run the pipeline at once.
+    - Others wait in a priority queue of at most ``max_queue`` entries; a
+      freed slot goes to the most urgent waiter (FIFO within a class).
+    - When the queue is full, a new message displaces the least urgent
+      waiter if it outranks it; otherwise it is rejected with 429.
+    - A waiter not admitted within ``queue_timeout`` seconds is shed with 503.
+
+    Non-sheddable callers (the inbound mailbox connector, which bounds its own
+    concurrency) wait without a deadline and are never displaced.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = settings.ADMISSION_MAX_IN_FLIGHT,
+        max_queue: int = settings.ADMISSION_MAX_QUEUE,
+        queue_timeout: float = settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._queue: list[_Waiter] = []
+        self._seq = itertools.count()
+        # Exponentially weighted pipeline run time, for Retry-After estimates
+        self._avg_service_seconds = 5.0
+        self.admitted = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.shed = {"queue_full": 0, "displaced": 0, "deadline": 0}
+        self.shed_by_class = {name: 0 for name in PRIORITY_NAMES.values()}
+        self.total_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def admit(self, message: EmployerMessage, sheddable: bool = True):
+        """Hold a pipeline slot for the duration of the ``async with`` block.
+
+        Raises:
+            AdmissionRejected: The message was shed (queue full, displaced by a
+                more urgent message, or its queue deadline passed).
+        """
+        priority = classify_priority(message)
+        await self._acquire(priority, sheddable)
+        started = time.monotonic()
+        try:
+            yield PRIORITY_NAMES[priority]
+        finally:
+            elapsed = time.monotonic() - started
+            self._avg_service_seconds = 0.8 * self._avg_service_seconds + 0.2 * elapsed
+            self._release()
+
+    async def _acquire(self, priority: int, sheddable: bool) -> None:
+        name = PRIORITY_NAMES[priority]
+        if self.in_flight < self.max_in_flight and not self._queue:
+            self.in_flight += 1
+            self.admitted[name] += 1
+            return
+
+        if sheddable and self._sheddable_depth() >= self.max_queue:
+            victim = self._least_urgent_sheddable()
+            if victim is None or victim.priority <= priority:
+                self._record_shed("queue_full", name)
+                raise AdmissionRejected(429, "Admission queue is full", self.retry_after())
+            self._queue.remove(victim)
+            heapq.heapify(self._queue)
+            self._record_shed("displaced", PRIORITY_NAMES[victim.priority])
+            victim.future.set_exception(
+                AdmissionRejected(503, "Displaced by a higher-priority message", self.retry_after())
+            )
+
+        waiter = _Waiter(priority, next(self._seq), sheddable)
+        heapq.heappush(self._queue, waiter)
+        try:
+            if sheddable:
+                await asyncio.wait_for(asyncio.shield(waiter.future), self.queue_timeout)
+            else:
+                await waiter.future
+        except asyncio.TimeoutError:
+            # A slot may have been handed over in the same tick the deadline fired
+            if not _granted(waiter):
+                self._abandon(waiter)
+                self._record_shed("deadline", name)
+                raise AdmissionRejected(503, "Queue deadline exceeded", self.retry_after()) from None
+        except asyncio.CancelledError:
+            if _granted(waiter):
+                # The caller went away after being handed a slot: pass it on
+                self._release()
+            else:
+                self._abandon(waiter)
+            raise
+        self.admitted[name] += 1
+        self.total_wait_seconds += time.monotonic() - waiter.enqueued_at
+
+    def _abandon(self, waiter: _Waiter) -> None:
+        if waiter in self._queue:
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+        if not waiter.future.done():
+            waiter.future.cancel()
+
+    def _release(self) -> None:
+        # Hand the slot straight to the most urgent waiter, if any
+        while self._queue:
+            waiter = heapq.heappop(self._queue)
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _sheddable_depth(self) -> int:
+        return sum(1 for w in self._queue if w.sheddable)
+
+    def _least_urgent_sheddable(self) -> Optional[_Waiter]:
+        candidates = [w for w in self._queue if w.sheddable]
+        return max(candidates) if candidates else None
+
+    def _record_shed(self, reason: str, priority_name: str) -> None:
+        self.shed[reason] += 1
+        self.shed_by_class[priority_name] += 1
+        print(f"[ADMISSION] Shed {priority_name} message ({reason}), queue depth {len(self._queue)}")
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue is expected to drain (at least 1)."""
+        waves = (len(self._queue) + 1) / max(self.max_in_flight, 1)
+        return max(1, math.ceil(waves * self._avg_service_seconds))
+
+    def get_stats(self) -> dict:
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for waiter in self._queue:
+            depth[PRIORITY_NAMES[waiter.priority]] += 1
+        admitted = sum(self.admitted.values())
+        return {
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "queue_timeout_s": self.queue_timeout,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._queue),
+            "queue_depth_by_class": depth,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "shed_by_class": self.shed_by_class,
+            "avg_service_s": round(self._avg_service_seconds, 3),
+            "avg_wait_s": round(self.total_wait_seconds / admitted, 3) if admitted else 0.0,
+        }
+
+
+# Singleton instance
+admission = AdmissionController()
@@ -1,8 +1,20 @@
 """Career Response Agent — generates professional email responses using Gemini API."""
 
+from collections import OrderedDict
+from typing import Optional
+
 import google.generativeai as genai
 from config import settings
-from prompts.career_prompt import get_career_system_prompt, get_career_revision_prompt
+from data.profile import DEFAULT_PROFILE_ID, PROFILE_DATA, profiles
+from prompts.career_prompt import (
+    get_career_system_prompt,
+    get_career_revision_prompt,
+    get_career_session_revision_prompt,
+)
+from agents.usage import usage_tracker
+from agents.llm_client import llm_client, LLMSession
+
+MODEL_NAME = "gemini-2.0-flash"
 
 # Configure Gemini
 genai.configure(api_key=settings.GEMINI_API_KEY)
@@ -11,20 +23,34 @@ genai.configure(api_key=settings.GEMINI_API_KEY)
 class CareerAgent:
     """Primary agent that generates professional email responses on behalf of the candidate."""
 
-    def __init__(self):
+    def __init__(self, profile: Optional[dict] = None):
+        self.profile = profile if profile is not None else PROFILE_DATA
         self.model = genai.GenerativeModel(
-            model_name="gemini-2.0-flash",
-            system_instruction=get_career_system_prompt(),
+            model_name=MODEL_NAME,
+            system_instruction=get_career_system_prompt(profile),
         )
 
+    def start_session(self) -> LLMSession:
+        """Start a per-request chat session for the draft–revise loop."""
+        return llm_client.session("career", self.model)
+
+    async def _generate(self, prompt: str, session: Optional[LLMSession]):
+        if session is not None:
+            return await session.send(prompt)
+        return await llm_client.generate("career", self.model, prompt)
+
     async def generate_response(
-        self, employer_message: str, conversation_context: str = ""
+        self,
+        employer_message: str,
+        conversation_context: str = "",
+        session: Optional[LLMSession] = None,
     ) -> str:
         """Generate an initial response to an employer message.
 
         Args:
             employer_message: The message from the potential employer.
             conversation_context: Optional conversation history context.
+            session: Chat session to draft in, so later revisions can build on it.
 
         Returns:
             The generated professional email response text.
@@ -37,11 +63,16 @@ class CareerAgent:
             f"Please compose a professional email response to the following employer message:\n\n{employer_message}"
         )
 
-        response = self.model.generate_content("".join(prompt_parts))
+        response = await self._generate("".join(prompt_parts), session)
+        usage_tracker.record("drafting", MODEL_NAME, response)
         return response.text.strip()
 
     async def revise_response(
-        self, employer_message: str, original_response: str, feedback: str
+        self,
+        employer_message: str,
+        original_response: str,
+        feedback: str,
+        session: Optional[LLMSession] = None,
     ) -> str:
         """Revise a response based on evaluator feedback.
 
@@ -49,13 +80,70 @@ class CareerAgent:
             employer_message: Original employer message for context.
             original_response: The response that needs revision.
             feedback: Feedback from the evaluator agent.
+            session: The session the draft was written in; when given, only the
+                feedback is sent (the message and draft are already in its history).
 
         Returns:
             The revised email response text.
         """
-        revision_prompt = get_career_revision_prompt(original_response, feedback)
-        full_prompt = (
-            f"Original employer message:\n{employer_message}\n\n{revision_prompt}"
-        )
-        response = self.model.generate_content(full_prompt)
+        if session is not None:
+            full_prompt = get_career_session_revision_prompt(feedback)
+        else:
+            revision_prompt = get_career_revision_prompt(original_response, feedback)
+            full_prompt = (
+                f"Original employer message:\n{employer_message}\n\n{revision_prompt}"
+            )
+        response = await self._generate(full_prompt, session)
+        usage_tracker.record("revision", MODEL_NAME, response)
         return response.text.strip()
+
+
+class CareerAgentCache:
+    """LRU cache of per-profile CareerAgent instances.
+
+    Building an agent renders the profile into a system prompt and creates a
+    model object; cached agents are reused until evicted (least recently used
+    beyond ``max_size``) or until their profile file changes.
+    """
+
+    def __init__(self, max_size: int = settings.PROFILE_CACHE_SIZE):
+        self.max_size = max_size
+        self._agents: OrderedDict[str, tuple[float, CareerAgent]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, profile_id: str = DEFAULT_PROFILE_ID) -> CareerAgent:
+        """Return the agent for ``profile_id``, constructing it on a miss.
+
+        Raises:
+            ProfileNotFoundError: The profile does not exist.
+        """
+        version = profiles.version(profile_id)
+        cached = self._agents.get(profile_id)
+        if cached is not None and cached[0] == version:
+            self._agents.move_to_end(profile_id)
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        agent = CareerAgent(profiles.get(profile_id))
+        self._agents[profile_id] = (version, agent)
+        self._agents.move_to_end(profile_id)
+        while len(self._agents) > self.max_size:
+            self._agents.popitem(last=False)
+            self.evictions += 1
+        return agent
+
+    def get_stats(self) -> dict:
+        return {
+            "max_size": self.max_size,
+            "cached_profiles": list(self._agents),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# Singleton instance
+career_agents = CareerAgentCache()
@@ -3,7 +3,17 @@
 import json
 import google.generativeai as genai
 from config import settings
-from prompts.evaluator_prompt import get_evaluator_system_prompt, get_evaluator_user_prompt
+from typing import Optional
+
+from prompts.evaluator_prompt import (
+    get_evaluator_system_prompt,
+    get_evaluator_user_prompt,
+    get_evaluator_followup_prompt,
+)
+from agents.usage import usage_tracker
+from agents.llm_client import llm_client, LLMSession
+
+MODEL_NAME = "gemini-2.0-flash"
 
 # Configure Gemini
 genai.configure(api_key=settings.GEMINI_API_KEY)
@@ -40,27 +50,57 @@ class EvaluatorAgent:
 
     def __init__(self):
         self.model = genai.GenerativeModel(
-            model_name="gemini-2.0-flash",
+            model_name=MODEL_NAME,
+            system_instruction=get_evaluator_system_prompt(),
+        )
+        # Cheaper model used when the budget controller degrades evaluation
+        self.fallback_model = genai.GenerativeModel(
+            model_name=settings.EVALUATOR_FALLBACK_MODEL,
             system_instruction=get_evaluator_system_prompt(),
         )
 
+    def start_session(self, use_fallback_model: bool = False) -> LLMSession:
+        """Start a per-request chat session for evaluating successive drafts."""
+        model = self.fallback_model if use_fallback_model else self.model
+        return llm_client.session("evaluator", model)
+
     async def evaluate(
-        self, employer_message: str, agent_response: str
+        self,
+        employer_message: str,
+        agent_response: str,
+        use_fallback_model: bool = False,
+        session: Optional[LLMSession] = None,
     ) -> EvaluationResult:
         """Evaluate a career agent response.
 
         Args:
             employer_message: The original employer message.
             agent_response: The career agent's generated response.
+            use_fallback_model: Evaluate with the cheaper EVALUATOR_FALLBACK_MODEL
+                (must match the model the session was started with).
+            session: Evaluation session; after its first round only the revised
+                response is sent.
 
         Returns:
             EvaluationResult with scores and feedback.
         """
-        user_prompt = get_evaluator_user_prompt(
-            employer_message, agent_response, settings.EVALUATOR_THRESHOLD
-        )
-
-        response = self.model.generate_content(user_prompt)
+        if session is not None and session.history:
+            user_prompt = get_evaluator_followup_prompt(
+                agent_response, settings.EVALUATOR_THRESHOLD
+            )
+        else:
+            user_prompt = get_evaluator_user_prompt(
+                employer_message, agent_response, settings.EVALUATOR_THRESHOLD
+            )
+
+        model_name = settings.EVALUATOR_FALLBACK_MODEL if use_fallback_model else MODEL_NAME
+        if session is not None:
+            response = await session.send(user_prompt)
+        elif use_fallback_model:
+            response = await llm_client.generate("evaluator", self.fallback_model, user_prompt)
+        else:
+            response = await llm_client.generate("evaluator", self.model, user_prompt)
+        usage_tracker.record("evaluation", model_name, response)
         raw_text = response.text.strip()
 
         # Parse JSON from response (handle potential markdown code blocks)
@@ -0,0 +1,217 @@
+"""Shared Gemini call path with request hedging to cut tail latency."""
+
+import asyncio
+import time
+from collections import deque
+
+from config import settings
+from circuit_breaker import is_transient_error, llm_breaker
+from cassette import cassettes
+
+
+class LLMUnavailableError(Exception):
+    """Raised when Gemini is unreachable, overloaded or times out, or its circuit is open."""
+
+
+class LLMRequestError(Exception):
+    """Raised when Gemini rejects or cannot answer a request (bad request, safety
+    block, unusable response); retrying the same request would not help."""
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies for one agent role."""
+
+    def __init__(self, window: int = 256):
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> float:
+        """Latency at quantile ``q`` (0–1) of the current window."""
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+    def summary(self) -> dict:
+        return {
+            "samples": len(self._samples),
+            "p50_ms": round(self.percentile(0.50) * 1000, 1),
+            "p90_ms": round(self.percentile(0.90) * 1000, 1),
+            "p99_ms": round(self.percentile(0.99) * 1000, 1),
+        }
+
+
+class HedgedLLMClient:
+    """Issues Gemini calls, hedging slow ones with a duplicate request.
+
+    If a call has not returned after the role's ``HEDGE_PERCENTILE`` latency,
+    a second identical request is sent and whichever finishes first wins; the
+    other is cancelled. Hedges are capped at ``HEDGE_BUDGET_RATIO`` of all
+    calls so duplicate spend stays bounded. Until a role has
+    ``HEDGE_MIN_SAMPLES`` latencies recorded, its calls are not hedged.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = settings.HEDGE_ENABLED,
+        percentile: float = settings.HEDGE_PERCENTILE,
+        budget_ratio: float = settings.HEDGE_BUDGET_RATIO,
+        min_samples: int = settings.HEDGE_MIN_SAMPLES,
+        min_delay: float = settings.HEDGE_MIN_DELAY_SECONDS,
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.latencies: dict[str, LatencyTracker] = {}
+        self.calls = 0
+        self.hedges_issued = 0
+        self.hedges_won = 0
+
+    def _tracker(self, role: str) -> LatencyTracker:
+        return self.latencies.setdefault(role, LatencyTracker())
+
+    def hedge_delay(self, role: str) -> float | None:
+        """Seconds to wait before hedging a call for ``role`` (None = don't hedge)."""
+        tracker = self._tracker(role)
+        if not self.enabled or len(tracker) < self.min_samples:
+            return None
+        if self.hedges_issued + 1 > self.budget_ratio * max(self.calls, 1):
+            return None
+        return max(self.min_delay, tracker.percentile(self.percentile))
+
+    def session(self, role: str, model) -> "LLMSession":
+        """Start a multi-turn session with ``model`` whose calls go through this client."""
+        return LLMSession(self, role, model)
+
+    async def generate(self, role: str, model, prompt):
+        """Call ``model.generate_content_async(prompt)``, hedging if it runs long.
+
+        Args:
+            role: Agent role used for latency tracking ('career', 'evaluator', 'detector').
+            model: A ``genai.GenerativeModel`` instance.
+            prompt: Prompt contents (a string, or a list of chat turns).
+
+        Returns:
+            The first successful generate_content response (its ``.text`` readable).
+
+        Raises:
+            LLMUnavailableError: A transport error, 5xx, 429 or timeout, or the
+                LLM circuit breaker is open (fails fast without calling Gemini).
+            LLMRequestError: Gemini answered but rejected this request; it
+                does not count against the circuit. This includes a safety-blocked
+                or empty candidate.
+        """
+        if not llm_breaker.allow():
+            raise LLMUnavailableError("LLM circuit open — provider marked unavailable")
+        outcome_recorded = False
+        try:
+            response = await asyncio.wait_for(
+                self._generate_hedged(role, model, prompt), settings.LLM_TIMEOUT_SECONDS
+            )
+            outcome_recorded = True
+            llm_breaker.record_success()
+            return response
+        except Exception as e:
+            outcome_recorded = True
+            if is_transient_error(e):
+                llm_breaker.record_failure(f"{type(e).__name__}: {e}")
+                raise LLMUnavailableError(f"LLM call failed: {type(e).__name__}: {e}") from e
+            # The provider responded, so it is available; only this request failed
+            llm_breaker.record_success()
+            raise LLMRequestError(f"LLM request rejected: {type(e).__name__}: {e}") from e
+        finally:
+            if not outcome_recorded:
+                # Cancelled (client gone, caller timed out): free a half-open probe slot
+                llm_breaker.release()
+
+    async def _generate_hedged(self, role: str, model, prompt: str):
+        self.calls += 1
+        delay = self.hedge_delay(role)
+        primary = asyncio.create_task(self._timed_call(role, model, prompt))
+        if delay is None:
+            return await primary
+
+        pending = {primary}
+        error = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.hedges_issued += 1
+            hedge = asyncio.create_task(self._timed_call(role, model, prompt))
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedges_won += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            # Cancel the loser (or both, if we were cancelled / timed out)
+            for task in pending:
+                task.cancel()
+
+    async def _timed_call(self, role: str, model, prompt: str):
+        started = time.perf_counter()
+        try:
+            # Recorded or replayed when CASSETTE_MODE is set
+            response = await cassettes.generate(model, prompt)
+            # A safety-blocked or empty candidate raises ValueError on .text; surface
+            # it here so it is classified (LLMRequestError) rather than in the caller
+            response.text
+            return response
+        finally:
+            # Failed and cancelled calls count too: a cancelled hedge loser's
+            # elapsed time is a lower bound, and dropping it would hide slow calls
+            self._tracker(role).add(time.perf_counter() - started)
+
+    def get_stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "percentile": self.percentile,
+            "budget_ratio": self.budget_ratio,
+            "calls": self.calls,
+            "hedges_issued": self.hedges_issued,
+            "hedges_won": self.hedges_won,
+            "latency_by_role": {role: t.summary() for role, t in self.latencies.items()},
+        }
+
+
+class LLMSession:
+    """Per-request multi-turn conversation with one model.
+
+    Callers send only the new turn (fresh feedback, a new draft); earlier turns
+    are replayed from ``history``, since the Gemini API itself keeps no state
+    between calls. The replayed prefix is byte-identical from round to round,
+    so provider-side context caching can serve it (reported as
+    ``cached_tokens`` in usage).
+    """
+
+    def __init__(self, client: HedgedLLMClient, role: str, model):
+        self.client = client
+        self.role = role
+        self.model = model
+        self.history: list[dict] = []
+
+    async def send(self, text: str):
+        """Send one user turn; the exchange is kept only if the call succeeds."""
+        contents = [*self.history, {"role": "user", "parts": [text]}]
+        response = await self.client.generate(self.role, self.model, contents)
+        self.history = [*contents, {"role": "model", "parts": [response.text]}]
+        return response
+
+
+# Singleton instance
+llm_client = HedgedLLMClient()
@@ -0,0 +1,239 @@
+"""Input preprocessing — trims employer messages before they reach the agents.
+
+Every downstream call (detection, drafting, each evaluation and revision
+round) re-sends the employer message, so the message is cleaned once up
+front: quoted reply chains and signatures are stripped, and a message still
+over ``INPUT_TOKEN_BUDGET`` is condensed into a structured digest that all
+later calls use instead of the full text.
+"""
+
+import asyncio
+import json
+import math
+import re
+from typing import Optional
+
+import google.generativeai as genai
+from config import settings
+from connectors.mime import strip_quoted_reply
+from prompts.digest_prompt import DIGEST_SYSTEM_PROMPT, get_digest_user_prompt
+from agents.usage import usage_tracker
+from agents.llm_client import llm_client
+
+# Configure Gemini
+genai.configure(api_key=settings.GEMINI_API_KEY)
+
+# Rough characters per token for Gemini tokenizers on English/Turkish prose
+CHARS_PER_TOKEN = 4
+
+DIGEST_FIELDS = (
+    ("requirements", "Requirements"),
+    ("questions", "Questions asked"),
+    ("dates", "Dates proposed"),
+    ("other", "Other details"),
+)
+
+_SIGNATURE_DELIMITER = re.compile(r"^--\s*$")
+_MOBILE_FOOTER = re.compile(
+    r"^(sent from my \w+|get outlook for \w+|iphone'umdan gönderildi)", re.I
+)
+_VALEDICTION = re.compile(
+    r"^(best|best regards|kind regards|warm regards|regards|thanks|thank you|many thanks|"
+    r"cheers|sincerely|all the best|saygılarımla|saygılarımızla|iyi çalışmalar)[,.!]?$",
+    re.I,
+)
+# A signature block after the valediction: a few short lines (name, title, phone)
+MAX_SIGNATURE_LINES = 8
+MAX_SIGNATURE_LINE_CHARS = 80
+MAX_SIGNATURE_LINE_WORDS = 6
+_CONTACT_DETAIL = re.compile(r"(@|https?://|www\.|linkedin|\+?\d[\d\s().-]{6,}\d)", re.I)
+# Lowercase words that still fit a name or job title ("Head of Talent", "Jan van Dijk")
+_TITLE_CONNECTORS = frozenset(("of", "at", "and", "for", "the", "de", "da", "van", "von", "bin"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Local token estimate (no API call), close enough for budgeting."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _is_name_or_title(line: str) -> bool:
+    """A short capitalized fragment such as "Jane Doe" or "Senior Recruiter | Acme Inc."."""
+    words = line.split()
+    if not words or len(words) > MAX_SIGNATURE_LINE_WORDS:
+        return False
+    # Only an abbreviation ("Inc.", "Jr.") may end the line with a period
+    if line.endswith(("!", ":", ",", ";")) or (line.endswith(".") and len(words[-1]) > 4):
+        return False
+    return all(
+        not word[0].isalpha() or word[0].isupper() or word in _TITLE_CONNECTORS
+        for word in words
+    )
+
+
+def _is_contact_line(line: str) -> bool:
+    """A signature line: a contact detail, or a name/title fragment (not message text)."""
+    line = line.strip()
+    if len(line) > MAX_SIGNATURE_LINE_CHARS or "?" in line:
+        return False
+    return bool(_CONTACT_DETAIL.search(line)) or _is_name_or_title(line)
+
+
+def strip_signature(text: str) -> str:
+    """Drop an email signature, keeping the valediction and the sender's name.
+
+    Cuts at a ``--`` delimiter line and removes mobile-client footers. After a
+    closing line such as "Best regards," near the end, only the next line (the
+    name) is kept — and only when every line after it is a contact detail
+    (email, phone, link) or a capitalized name/title line. Anything else
+    after the closing line is message text, and the whole text is kept.
+    """
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if _SIGNATURE_DELIMITER.match(line):
+            lines = lines[:i]
+            break
+    lines = [line for line in lines if not _MOBILE_FOOTER.match(line.strip())]
+
+    for i in range(len(lines) - 1, max(-1, len(lines) - MAX_SIGNATURE_LINES - 3), -1):
+        if _VALEDICTION.match(lines[i].strip()):
+            block = [line for line in lines[i + 1 :] if line.strip()]
+            if len(block) <= MAX_SIGNATURE_LINES and all(_is_contact_line(line) for line in block):
+                lines = lines[: i + 1] + block[:1]
+            break
+    return "\n".join(lines).strip()
+
+
+def split_chunks(text: str, max_tokens: int) -> list[str]:
+    """Split text at paragraph boundaries into chunks of at most ``max_tokens``."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks: list[str] = []
+    current = ""
+    for paragraph in text.split("\n\n"):
+        # A single paragraph larger than a chunk is cut at character boundaries
+        while len(paragraph) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars:]
+        if current and len(current) + 2 + len(paragraph) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _merge_items(parts: list[dict], field: str) -> list[str]:
+    """Concatenate one digest field across chunks in order, dropping repeats."""
+    merged: dict[str, str] = {}
+    for part in parts:
+        for item in part.get(field) or []:
+            item = str(item).strip()
+            if item:
+                merged.setdefault(item.lower(), item)
+    return list(merged.values())
+
+
+class PreparedMessage:
+    """An employer message as sent to the agents, plus how it was reduced."""
+
+    def __init__(self, original: str, cleaned: str, digest: Optional[str] = None):
+        self.original = original
+        self.cleaned = cleaned
+        self.digest = digest
+
+    @property
+    def text(self) -> str:
+        """The text every downstream LLM call uses."""
+        return self.digest or self.cleaned
+
+    def to_dict(self) -> dict:
+        return {
+            "original_tokens": estimate_tokens(self.original),
+            "cleaned_tokens": estimate_tokens(self.cleaned),
+            "sent_tokens": estimate_tokens(self.text),
+            "digested": self.digest is not None,
+        }
+
+
+class MessagePreprocessor:
+    """Cleans employer messages and digests the ones over the token budget."""
+
+    def __init__(
+        self,
+        token_budget: int = settings.INPUT_TOKEN_BUDGET,
+        chunk_tokens: int = settings.INPUT_DIGEST_CHUNK_TOKENS,
+        model_name: str = settings.INPUT_DIGEST_MODEL,
+    ):
+        self.token_budget = token_budget
+        self.chunk_tokens = chunk_tokens
+        self.model_name = model_name
+        self.model = genai.GenerativeModel(
+            model_name=model_name,
+            system_instruction=DIGEST_SYSTEM_PROMPT,
+        )
+
+    async def prepare(self, employer_message: str) -> PreparedMessage:
+        """Strip quotes and signatures; digest the result if it is over budget.
+
+        Raises:
+            LLMUnavailableError: A digest was needed and the LLM call failed.
+        """
+        # A message that is nothing but a quote is kept as-is
+        cleaned = strip_signature(strip_quoted_reply(employer_message))
+        cleaned = cleaned or employer_message.strip()
+        tokens = estimate_tokens(cleaned)
+        if not self.token_budget or tokens <= self.token_budget:
+            return PreparedMessage(employer_message, cleaned)
+        return PreparedMessage(employer_message, cleaned, await self.digest(cleaned, tokens))
+
+    async def digest(self, text: str, tokens: int) -> str:
+        """Condense ``text`` into a structured digest, one LLM call per chunk."""
+        chunks = split_chunks(text, self.chunk_tokens)
+        parts = await asyncio.gather(
+            *(self._digest_chunk(chunk, i + 1, len(chunks)) for i, chunk in enumerate(chunks))
+        )
+
+        summaries = dict.fromkeys(
+            str(part["summary"]).strip() for part in parts if part.get("summary")
+        )
+        lines = [
+            f"[Digest of a long employer message (~{tokens} tokens); it lists everything "
+            "the message asks for or proposes.]",
+            "",
+            "Summary: " + " ".join(summaries),
+        ]
+        for field, title in DIGEST_FIELDS:
+            items = _merge_items(parts, field)
+            if items:
+                lines.append(f"\n{title}:")
+                lines.extend(f"- {item}" for item in items)
+        return "\n".join(lines)
+
+    async def _digest_chunk(self, chunk: str, part: int, parts: int) -> dict:
+        response = await llm_client.generate(
+            "digest", self.model, get_digest_user_prompt(chunk, part, parts)
+        )
+        usage_tracker.record("digest", self.model_name, response)
+        raw_text = response.text.strip()
+
+        # Parse JSON (handle markdown code blocks)
+        if raw_text.startswith("```"):
+            raw_text = raw_text.split("\n", 1)[1]
+            raw_text = raw_text.rsplit("```", 1)[0]
+            raw_text = raw_text.strip()
+
+        try:
+            parsed = json.loads(raw_text)
+        except json.JSONDecodeError:
+            parsed = None
+        if not isinstance(parsed, dict):
+            # Fall back to the opening of the chunk rather than losing it entirely
+            return {"summary": "", "other": [chunk[: 100 * CHARS_PER_TOKEN]]}
+        return parsed
+
+
+# Singleton instance
+preprocessor = MessagePreprocessor()
@@ -0,0 +1,172 @@
+"""Adaptive revision policy — learns from evaluation score trajectories when revising pays off."""
+
+import random
+from typing import Iterable, Optional
+
+from config import settings
+
+# Pseudo-count weight of the prior when smoothing sparse estimates
+PRIOR_WEIGHT = 2.0
+BASE_PRIOR = 0.5
+ALL_CATEGORIES = "*"
+
+
+def _bucket(score: float) -> int:
+    """Integer score bucket 0–10."""
+    return max(0, min(10, int(score)))
+
+
+class RevisionPolicy:
+    """Decides whether to accept, revise or escalate a draft after each evaluation.
+
+    Learns, per detection category, revision round and score bucket, how often
+    a draft in that state got approved on the very next round and how often it
+    got approved eventually. Estimates are smoothed toward the all-category
+    estimate for the same state, so sparse categories still get sensible values.
+
+    Escalated trajectories are cut short and never observed, so a state that
+    escalates would stop being measured. A share ``explore_rate`` of would-be
+    escalations is revised anyway to keep those estimates current.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = settings.REVISION_POLICY_ENABLED,
+        min_samples: int = settings.REVISION_POLICY_MIN_SAMPLES,
+        escalate_below: float = settings.REVISION_POLICY_ESCALATE_BELOW,
+        explore_rate: float = settings.REVISION_POLICY_EXPLORE_RATE,
+    ):
+        self.enabled = enabled
+        self.min_samples = min_samples
+        self.escalate_below = escalate_below
+        self.explore_rate = explore_rate
+        # (category, round, bucket) -> [trials, approved_next, approved_eventually]
+        self._stats: dict[tuple[str, int, int], list[int]] = {}
+        self.decisions = {"accept": 0, "revise": 0, "escalate": 0}
+        self.explorations = 0
+        self.llm_calls_saved = 0
+
+    def observe(self, category: str, score_history: list[float], approved: bool) -> None:
+        """Learn from one finished evaluation trajectory.
+
+        Args:
+            category: Unknown-detector category of the message.
+            score_history: Overall score after each evaluation round, in order.
+            approved: Whether the final round was approved.
+        """
+        last = len(score_history) - 1
+        for round_index, score in enumerate(score_history[:last]):
+            approved_next = approved and round_index + 1 == last
+            for cat in (category, ALL_CATEGORIES):
+                stats = self._stats.setdefault((cat, round_index, _bucket(score)), [0, 0, 0])
+                stats[0] += 1
+                stats[1] += int(approved_next)
+                stats[2] += int(approved)
+
+    def rebuild(self, logs: Iterable[dict]) -> int:
+        """Relearn all estimates from stored evaluation logs (at startup, after a restore).
+
+        Returns:
+            Number of trajectories learned from.
+        """
+        self._stats.clear()
+        learned = 0
+        for log in logs:
+            score_history = log.get("score_history") or []
+            # Escalated runs were never observed live, so they are skipped here too
+            if log.get("status") == "escalated" or not score_history:
+                continue
+            category = (log.get("confidence") or {}).get("category", "safe")
+            approved = bool((log.get("evaluation") or {}).get("approved"))
+            self.observe(category, score_history, approved)
+            learned += 1
+        return learned
+
+    def estimate(self, category: str, round_index: int, score: float) -> dict:
+        """Estimate approval probabilities for a draft in the given state.
+
+        Returns:
+            dict with samples, p_approve_next, p_approve_eventually and
+            expected_llm_calls (revision + evaluation calls per approval).
+        """
+        key = (category, round_index, _bucket(score))
+        global_key = (ALL_CATEGORIES, round_index, _bucket(score))
+        global_stats = self._stats.get(global_key, [0, 0, 0])
+        stats = self._stats.get(key, [0, 0, 0])
+
+        def smoothed(index: int) -> float:
+            prior = (global_stats[index] + BASE_PRIOR * PRIOR_WEIGHT) / (
+                global_stats[0] + PRIOR_WEIGHT
+            )
+            return (stats[index] + prior * PRIOR_WEIGHT) / (stats[0] + PRIOR_WEIGHT)
+
+        p_next = smoothed(1)
+        return {
+            "samples": stats[0],
+            "p_approve_next": round(p_next, 4),
+            "p_approve_eventually": round(smoothed(2), 4),
+            "expected_llm_calls": round(2 / p_next, 2) if p_next > 0 else None,
+        }
+
+    def decide(
+        self,
+        category: str,
+        round_index: int,
+        score: float,
+        approved: bool,
+        remaining_revisions: int,
+    ) -> tuple[str, dict]:
+        """Choose the next step after an evaluation round.
+
+        Returns:
+            ('accept' | 'revise' | 'escalate', estimate dict)
+        """
+        estimate = self.estimate(category, round_index, score)
+        unlikely = (
+            self.enabled
+            and estimate["samples"] >= self.min_samples
+            and estimate["p_approve_eventually"] < self.escalate_below
+        )
+        if approved or remaining_revisions <= 0:
+            decision = "accept"
+        elif unlikely and random.random() >= self.explore_rate:
+            decision = "escalate"
+            # Each skipped revision round saves a revise call and an evaluate call
+            self.llm_calls_saved += 2 * remaining_revisions
+        else:
+            decision = "revise"
+            if unlikely:
+                self.explorations += 1
+        self.decisions[decision] += 1
+        return decision, estimate
+
+    def get_table(self, category: Optional[str] = None) -> list[dict]:
+        """Return learned estimates for every observed state (optionally one category)."""
+        rows = []
+        for (cat, round_index, bucket), stats in sorted(self._stats.items()):
+            if category is not None and cat != category:
+                continue
+            rows.append(
+                {
+                    "category": cat,
+                    "round": round_index,
+                    "score_bucket": bucket,
+                    **self.estimate(cat, round_index, bucket),
+                }
+            )
+        return rows
+
+    def get_status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "min_samples": self.min_samples,
+            "escalate_below": self.escalate_below,
+            "explore_rate": self.explore_rate,
+            "decisions": self.decisions,
+            "explorations": self.explorations,
+            "llm_calls_saved": self.llm_calls_saved,
+        }
+
+
+# Singleton instance
+revision_policy = RevisionPolicy()
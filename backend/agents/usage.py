@@ -0,0 +1,175 @@
+"""Token and cost accounting for Gemini calls, with a budget controller."""
+
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+from config import settings
+
+# USD per 1M tokens: (prompt, completion)
+MODEL_PRICING_PER_MTOK = {
+    "gemini-2.0-flash": (0.10, 0.40),
+    "gemini-2.0-flash-lite": (0.075, 0.30),
+}
+DEFAULT_PRICING_PER_MTOK = (0.10, 0.40)
+
+# Per-request stage usage, set by the pipeline and filled in by agent calls
+_request_usage: ContextVar[Optional[dict]] = ContextVar("request_usage", default=None)
+
+
+def extract_usage(response) -> dict:
+    """Read prompt/completion token counts from a generate_content response."""
+    metadata = getattr(response, "usage_metadata", None)
+    prompt = getattr(metadata, "prompt_token_count", 0) or 0
+    completion = getattr(metadata, "candidates_token_count", 0) or 0
+    total = getattr(metadata, "total_token_count", 0) or (prompt + completion)
+    # Part of the prompt served from the provider's context cache
+    cached = getattr(metadata, "cached_content_token_count", 0) or 0
+    return {
+        "prompt_tokens": prompt,
+        "completion_tokens": completion,
+        "total_tokens": total,
+        "cached_tokens": cached,
+    }
+
+
+def estimate_cost(model_name: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICING_PER_MTOK.get(
+        model_name, DEFAULT_PRICING_PER_MTOK
+    )
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def _empty_totals() -> dict:
+    return {
+        "calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "cached_tokens": 0,
+        "cost_usd": 0.0,
+    }
+
+
+def _accumulate(totals: dict, usage: dict, cost: float) -> None:
+    totals["calls"] += 1
+    totals["prompt_tokens"] += usage["prompt_tokens"]
+    totals["completion_tokens"] += usage["completion_tokens"]
+    totals["total_tokens"] += usage["total_tokens"]
+    totals["cached_tokens"] += usage["cached_tokens"]
+    totals["cost_usd"] = round(totals["cost_usd"] + cost, 8)
+
+
+class UsageTracker:
+    """Aggregates token usage and cost per stage, per sender and per day."""
+
+    def __init__(self):
+        self.by_stage: dict[str, dict] = {}
+        self.by_sender: dict[str, dict] = {}
+        self.by_day: dict[str, dict] = {}
+
+    def start_request(self, sender_email: str) -> dict:
+        """Begin collecting stage usage for the current request (async-task local)."""
+        request_usage = {"sender_email": sender_email, "stages": {}, "total": _empty_totals()}
+        _request_usage.set(request_usage)
+        return request_usage
+
+    def record(self, stage: str, model_name: str, response) -> dict:
+        """Record the usage of one generate_content call.
+
+        Args:
+            stage: Pipeline stage ('detection', 'drafting', 'revision', 'evaluation').
+            model_name: Gemini model that served the call (for pricing).
+            response: The generate_content response object.
+
+        Returns:
+            dict with token counts and estimated cost of this call.
+        """
+        usage = extract_usage(response)
+        cost = estimate_cost(model_name, usage["prompt_tokens"], usage["completion_tokens"])
+        day = datetime.now().strftime("%Y-%m-%d")
+
+        _accumulate(self.by_stage.setdefault(stage, _empty_totals()), usage, cost)
+        _accumulate(self.by_day.setdefault(day, _empty_totals()), usage, cost)
+
+        request_usage = _request_usage.get()
+        if request_usage is not None:
+            _accumulate(request_usage["stages"].setdefault(stage, _empty_totals()), usage, cost)
+            _accumulate(request_usage["total"], usage, cost)
+            sender = request_usage["sender_email"]
+            _accumulate(self.by_sender.setdefault(sender, _empty_totals()), usage, cost)
+
+        return {**usage, "cost_usd": cost, "model": model_name}
+
+    def cost_today(self) -> float:
+        return self.by_day.get(datetime.now().strftime("%Y-%m-%d"), {}).get("cost_usd", 0.0)
+
+    def cost_this_month(self) -> float:
+        month = datetime.now().strftime("%Y-%m")
+        return sum(t["cost_usd"] for day, t in self.by_day.items() if day.startswith(month))
+
+    def get_summary(self) -> dict:
+        return {
+            "by_stage": self.by_stage,
+            "by_sender": self.by_sender,
+            "by_day": self.by_day,
+        }
+
+
+class BudgetController:
+    """Degrades the pipeline as configured daily/monthly spend limits are approached.
+
+    Below ``BUDGET_DEGRADE_RATIO`` of either limit the pipeline runs normally.
+    Past it, revisions are capped at ``BUDGET_DEGRADED_MAX_REVISIONS`` and
+    evaluation switches to ``EVALUATOR_FALLBACK_MODEL``. Once a limit is
+    exceeded, revisions are disabled entirely.
+    """
+
+    def __init__(self, tracker: UsageTracker):
+        self.tracker = tracker
+
+    def utilization(self) -> float:
+        """Highest fraction of any configured budget spent (0 when no budget set)."""
+        ratios = [0.0]
+        if settings.DAILY_BUDGET_USD > 0:
+            ratios.append(self.tracker.cost_today() / settings.DAILY_BUDGET_USD)
+        if settings.MONTHLY_BUDGET_USD > 0:
+            ratios.append(self.tracker.cost_this_month() / settings.MONTHLY_BUDGET_USD)
+        return max(ratios)
+
+    def mode(self) -> str:
+        """'normal', 'degraded' (near a limit) or 'exhausted' (over a limit)."""
+        used = self.utilization()
+        if used >= 1.0:
+            return "exhausted"
+        if used >= settings.BUDGET_DEGRADE_RATIO:
+            return "degraded"
+        return "normal"
+
+    def max_revision_attempts(self) -> int:
+        mode = self.mode()
+        if mode == "exhausted":
+            return 0
+        if mode == "degraded":
+            return min(settings.BUDGET_DEGRADED_MAX_REVISIONS, settings.MAX_REVISION_ATTEMPTS)
+        return settings.MAX_REVISION_ATTEMPTS
+
+    def use_cheap_evaluator(self) -> bool:
+        return self.mode() != "normal"
+
+    def get_status(self) -> dict:
+        return {
+            "mode": self.mode(),
+            "utilization": round(self.utilization(), 4),
+            "cost_today_usd": round(self.tracker.cost_today(), 6),
+            "cost_this_month_usd": round(self.tracker.cost_this_month(), 6),
+            "daily_budget_usd": settings.DAILY_BUDGET_USD,
+            "monthly_budget_usd": settings.MONTHLY_BUDGET_USD,
+            "max_revision_attempts": self.max_revision_attempts(),
+            "evaluator_fallback": self.use_cheap_evaluator(),
+        }
+
+
+# Singleton instances
+usage_tracker = UsageTracker()
+budget = BudgetController(usage_tracker)
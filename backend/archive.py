@@ -0,0 +1,318 @@
+"""Streaming export and bulk import of conversations and evaluation logs.
+
+Exports are written batch by batch straight into the response — gzip'd
+NDJSON, or Parquet / Arrow IPC when pyarrow is installed — so memory stays
+bounded by one batch however large the stores are. Each export covers
+``since < timestamp <= watermark`` and returns the watermark in a header; passing
+it back as ``since`` next time exports only what was added in between, so
+data can be archived incrementally before it is cleared. Import accepts the
+same files and restores them into the per-profile stores.
+"""
+
+import asyncio
+import zlib
+from datetime import datetime
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, Iterator, Optional
+
+import orjson
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # pyarrow is optional; NDJSON.gz is always available
+    pyarrow = None
+
+from agents.revision_policy import revision_policy
+from config import settings
+from data.logs import evaluation_logs
+from data.memory import memories
+from data.profile import DEFAULT_PROFILE_ID
+from models.schemas import EvaluationLog
+from responses import ORJSONResponse
+
+# format -> (media type, file extension)
+FORMATS = {
+    "ndjson": ("application/gzip", ".ndjson.gz"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", ".arrows"),
+}
+
+CONVERSATION_COLUMNS = (
+    "profile_id",
+    "sender_email",
+    "subject",
+    "message_id",
+    "employer_message",
+    "agent_response",
+    "status",
+    "timestamp",
+)
+LOG_COLUMNS = tuple(EvaluationLog.model_fields)
+INT_COLUMNS = frozenset(("log_id", "message_id", "revision_count"))
+# Nested log fields (dicts, lists) are stored as JSON text columns
+JSON_COLUMNS = frozenset(
+    name
+    for name, field in EvaluationLog.model_fields.items()
+    if field.annotation is not str and name not in INT_COLUMNS
+)
+
+
+def _columns(kind: str) -> tuple[str, ...]:
+    return LOG_COLUMNS if kind == "logs" else CONVERSATION_COLUMNS
+
+
+def _arrow_schema(kind: str):
+    return pyarrow.schema(
+        [
+            (name, pyarrow.int64() if name in INT_COLUMNS else pyarrow.string())
+            for name in _columns(kind)
+        ]
+    )
+
+
+def _to_table(kind: str, batch: list[dict], schema):
+    columns = {}
+    for name in _columns(kind):
+        values = [record.get(name) for record in batch]
+        if name in JSON_COLUMNS:
+            values = [None if v is None else orjson.dumps(v).decode() for v in values]
+        columns[name] = values
+    return pyarrow.Table.from_pydict(columns, schema=schema)
+
+
+def _from_rows(rows: list[dict]) -> list[dict]:
+    for row in rows:
+        for name in JSON_COLUMNS.intersection(row):
+            if row[name] is not None:
+                row[name] = orjson.loads(row[name])
+    return rows
+
+
+class _ChunkSink:
+    """Write-only file object that collects output until the next chunk is taken."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _NdjsonEncoder:
+    """One JSON object per line, gzip-compressed as it is produced."""
+
+    def __init__(self, kind: str):
+        self._gzip = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def write(self, batch: list[dict]) -> bytes:
+        return self._gzip.compress(b"".join(orjson.dumps(r) + b"\n" for r in batch))
+
+    def finish(self) -> bytes:
+        return self._gzip.flush()
+
+
+class _ArrowEncoder:
+    """Parquet (one row group per batch) or Arrow IPC stream (one record batch per batch)."""
+
+    def __init__(self, kind: str, parquet: bool):
+        self.kind = kind
+        self.schema = _arrow_schema(kind)
+        self._sink = _ChunkSink()
+        if parquet:
+            self._writer = pyarrow.parquet.ParquetWriter(
+                self._sink, self.schema, compression="zstd"
+            )
+        else:
+            self._writer = pyarrow.ipc.new_stream(
+                self._sink,
+                self.schema,
+                options=pyarrow.ipc.IpcWriteOptions(compression="zstd"),
+            )
+
+    def write(self, batch: list[dict]) -> bytes:
+        self._writer.write_table(_to_table(self.kind, batch, self.schema))
+        return self._sink.take()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.take()
+
+
+def _stores(kind: str, profile_id: Optional[str]) -> list:
+    registry = evaluation_logs if kind == "logs" else memories
+    if profile_id is None:
+        return registry.all()
+    store = registry.find(profile_id)
+    return [store] if store is not None else []
+
+
+def _require_format(fmt: str) -> None:
+    if fmt != "ndjson" and pyarrow is None:
+        raise HTTPException(
+            status_code=501, detail=f"Format '{fmt}' requires pyarrow to be installed"
+        )
+
+
+def _batches(kind: str, profile_id: Optional[str], since: Optional[str], until: str) -> Iterator[list[dict]]:
+    for store in _stores(kind, profile_id):
+        yield from store.iter_batches(since, until, settings.ARCHIVE_BATCH_SIZE)
+
+
+async def _stream_export(kind: str, fmt: str, batches: Iterator[list[dict]]) -> AsyncIterator[bytes]:
+    encoder = _NdjsonEncoder(kind) if fmt == "ndjson" else _ArrowEncoder(kind, fmt == "parquet")
+    for batch in batches:
+        chunk = encoder.write(batch)
+        if chunk:
+            yield chunk
+    yield encoder.finish()
+
+
+def _restore(kind: str, records: list[dict]) -> tuple[int, int]:
+    """Restore a batch of records into the partitions named by their profile_id."""
+    by_profile: dict[str, list[dict]] = {}
+    for record in records:
+        by_profile.setdefault(record.get("profile_id") or DEFAULT_PROFILE_ID, []).append(record)
+    registry = evaluation_logs if kind == "logs" else memories
+    restored = skipped = 0
+    for profile_id, group in by_profile.items():
+        r, s = registry.get(profile_id).restore(group)
+        restored += r
+        skipped += s
+    return restored, skipped
+
+
+async def _ndjson_batches(request: Request) -> AsyncIterator[list[dict]]:
+    """Decompress and parse an uploaded NDJSON.gz body incrementally."""
+    gunzip = zlib.decompressobj(31)
+    pending = b""
+    batch: list[dict] = []
+    async for data in request.stream():
+        while data:
+            pending += gunzip.decompress(data)
+            # Concatenated archives (e.g. several incremental exports) are several gzip members
+            data = gunzip.unused_data if gunzip.eof else b""
+            if gunzip.eof:
+                gunzip = zlib.decompressobj(31)
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                batch.append(orjson.loads(line))
+            if len(batch) >= settings.ARCHIVE_BATCH_SIZE:
+                yield batch
+                batch = []
+    if pending.strip():
+        batch.append(orjson.loads(pending))
+    if batch:
+        yield batch
+
+
+async def _columnar_batches(request: Request, fmt: str) -> AsyncIterator[list[dict]]:
+    """Spool an uploaded Parquet/Arrow file (to disk past the limit) and read it back in batches."""
+    with SpooledTemporaryFile(max_size=settings.ARCHIVE_SPOOL_MAX_BYTES) as spool:
+        async for data in request.stream():
+            spool.write(data)
+        spool.seek(0)
+        if fmt == "parquet":
+            record_batches = pyarrow.parquet.ParquetFile(spool).iter_batches(
+                batch_size=settings.ARCHIVE_BATCH_SIZE
+            )
+        else:
+            record_batches = pyarrow.ipc.open_stream(spool)
+        for record_batch in record_batches:
+            yield _from_rows(record_batch.to_pylist())
+
+
+router = APIRouter(prefix="/api/archive", tags=["Archive"], default_response_class=ORJSONResponse)
+
+
+@router.get("/export")
+async def export_archive(
+    kind: str = Query(..., pattern="^(logs|conversations)$"),
+    format: str = Query("ndjson", pattern="^(ndjson|parquet|arrow)$"),
+    since: Optional[str] = Query(
+        None, description="Watermark of the previous export; only newer records are included"
+    ),
+    profile_id: Optional[str] = None,
+):
+    """Stream logs or conversation entries as NDJSON.gz, Parquet or Arrow IPC.
+
+    The ``X-Export-Watermark`` response header holds the upper bound of this
+    export; pass it as ``since`` to continue from here next time.
+    """
+    _require_format(format)
+    if since is not None:
+        try:
+            datetime.fromisoformat(since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="'since' must be an ISO timestamp")
+    until = datetime.now().isoformat()
+    media_type, extension = FORMATS[format]
+    filename = f"{kind}-{until.replace(':', '')}{extension}"
+    return StreamingResponse(
+        _stream_export(kind, format, _batches(kind, profile_id, since, until)),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Export-Watermark": until,
+        },
+    )
+
+
+@router.post("/import")
+async def import_archive(
+    request: Request,
+    kind: str = Query(..., pattern="^(logs|conversations)$"),
+    format: str = Query("ndjson", pattern="^(ndjson|parquet|arrow)$"),
+):
+    """Restore an exported file into the per-profile stores.
+
+    Records older than what a store (or employer history) already holds are
+    skipped, so archives should be imported oldest first and re-importing one
+    is harmless.
+    """
+    _require_format(format)
+    batches = _ndjson_batches(request) if format == "ndjson" else _columnar_batches(request, format)
+    restored = skipped = 0
+    try:
+        async for batch in batches:
+            r, s = _restore(kind, batch)
+            restored += r
+            skipped += s
+            # Let other requests run between batches of a large import
+            await asyncio.sleep(0)
+    except (ValueError, zlib.error, orjson.JSONDecodeError) as e:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid {format} archive after {restored + skipped} records: {e}",
+        )
+    finally:
+        if kind == "logs" and restored:
+            # Restored logs carry score histories the policy has not learned from
+            revision_policy.rebuild(evaluation_logs.newest_first())
+    return {"kind": kind, "restored": restored, "skipped": skipped}
@@ -0,0 +1,116 @@
+"""Command-line client for /api/archive — incremental exports and bulk restores.
+
+Exports are streamed to disk, one file per run, and the watermark of each
+run is kept in ``<out>/.watermarks.json``, so the next run only fetches
+what was added since. Imports upload files in name order (export file names
+start with their watermark, so that is oldest first).
+
+Usage (from backend/, with the server running):
+    python archive_cli.py export logs --out archive/ [--format ndjson|parquet|arrow]
+    python archive_cli.py export conversations --out archive/ [--profile-id ID]
+    python archive_cli.py import logs archive/logs-*.ndjson.gz
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+import httpx
+
+DEFAULT_URL = "http://localhost:8000"
+WATERMARKS_FILE = ".watermarks.json"
+CHUNK_SIZE = 64 * 1024
+EXTENSION_FORMATS = {".gz": "ndjson", ".parquet": "parquet", ".arrows": "arrow"}
+
+
+def _load_watermarks(out: Path) -> dict:
+    path = out / WATERMARKS_FILE
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def export(args) -> None:
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    watermarks = _load_watermarks(out)
+    key = f"{args.kind}:{args.profile_id or '*'}"
+    since = args.since or watermarks.get(key)
+
+    params = {"kind": args.kind, "format": args.format}
+    if since:
+        params["since"] = since
+    if args.profile_id:
+        params["profile_id"] = args.profile_id
+
+    with httpx.stream("GET", f"{args.url}/api/archive/export", params=params, timeout=None) as r:
+        if r.status_code != 200:
+            r.read()
+            sys.exit(f"Export failed ({r.status_code}): {r.text}")
+        watermark = r.headers["X-Export-Watermark"]
+        match = re.search(r'filename="([^"]+)"', r.headers.get("Content-Disposition", ""))
+        name = match.group(1) if match else f"{args.kind}-{watermark.replace(':', '')}"
+        if args.profile_id:
+            name = f"{args.profile_id}-{name}"
+        target = out / name
+        partial = target.with_name(target.name + ".part")
+        with open(partial, "wb") as f:
+            for chunk in r.iter_bytes(CHUNK_SIZE):
+                f.write(chunk)
+    os.replace(partial, target)
+
+    # Only advance the watermark once the file is complete
+    watermarks[key] = watermark
+    (out / WATERMARKS_FILE).write_text(json.dumps(watermarks, indent=2))
+    print(f"{target} ({target.stat().st_size:,} bytes, since {since or 'the beginning'})")
+
+
+def _read_chunks(path: Path):
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            yield chunk
+
+
+def restore(args) -> None:
+    for path in sorted(Path(p) for p in args.files):
+        fmt = args.format or EXTENSION_FORMATS.get(path.suffix)
+        if fmt is None:
+            sys.exit(f"Cannot tell the format of {path}; pass --format")
+        r = httpx.post(
+            f"{args.url}/api/archive/import",
+            params={"kind": args.kind, "format": fmt},
+            content=_read_chunks(path),
+            timeout=None,
+        )
+        if r.status_code != 200:
+            sys.exit(f"Import of {path} failed ({r.status_code}): {r.text}")
+        result = r.json()
+        print(f"{path}: restored {result['restored']}, skipped {result['skipped']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--url", default=DEFAULT_URL, help="API base URL")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    p = commands.add_parser("export", help="Export records added since the last run")
+    p.add_argument("kind", choices=("logs", "conversations"))
+    p.add_argument("--out", required=True, help="Archive directory")
+    p.add_argument("--format", default="ndjson", choices=("ndjson", "parquet", "arrow"))
+    p.add_argument("--profile-id", help="Only this profile (default: all)")
+    p.add_argument("--since", help="Override the stored watermark (ISO timestamp)")
+    p.set_defaults(func=export)
+
+    p = commands.add_parser("import", help="Restore exported files, oldest first")
+    p.add_argument("kind", choices=("logs", "conversations"))
+    p.add_argument("files", nargs="+")
+    p.add_argument("--format", choices=("ndjson", "parquet", "arrow"))
+    p.set_defaults(func=restore)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""Static asset pipeline — minified, content-hashed, precompressed frontend files."""
+
+import gzip
+import hashlib
+import re
+from pathlib import Path
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
+
+# Hashed filenames never change content, so they can be cached forever.
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+# index.html must always be revalidated so it picks up new asset hashes.
+REVALIDATE_CACHE = "no-cache"
+
+CONTENT_TYPES = {
+    ".js": "application/javascript; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".html": "text/html; charset=utf-8",
+}
+
+
+def minify_css(source: str) -> str:
+    """Strip comments and collapse whitespace in a stylesheet."""
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.S)
+    source = re.sub(r"\s+", " ", source)
+    source = re.sub(r"\s*([{};,>])\s*", r"\1", source)
+    source = re.sub(r":\s+", ":", source)
+    return source.replace(";}", "}").strip()
+
+
+# After one of these characters or keywords a "/" starts a regex literal, not a division
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORD = re.compile(r"(?:^|[^\w$])(?:return|typeof|case|do|else|in|of|void|yield)$")
+
+
+def _skip_string(source: str, i: int) -> int:
+    """Index just past the quoted string starting at ``source[i]``."""
+    quote = source[i]
+    i += 1
+    while i < len(source) and source[i] != quote:
+        i += 2 if source[i] == "\\" else 1
+    return i + 1
+
+
+def _skip_template(source: str, i: int) -> int:
+    """Index just past the template literal starting at ``source[i]``, ``${}`` included."""
+    i += 1
+    while i < len(source) and source[i] != "`":
+        if source[i] == "\\":
+            i += 2
+        elif source.startswith("${", i):
+            i = _skip_expression(source, i + 2)
+        else:
+            i += 1
+    return i + 1
+
+
+def _skip_expression(source: str, i: int) -> int:
+    """Index just past the ``}`` closing a template ``${`` expression."""
+    depth = 1
+    while i < len(source):
+        char = source[i]
+        if char in "'\"":
+            i = _skip_string(source, i)
+            continue
+        if char == "`":
+            i = _skip_template(source, i)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _skip_regex(source: str, i: int) -> int:
+    """Index just past the regex literal (flags excluded) starting at ``source[i]``."""
+    i += 1
+    in_class = False
+    while i < len(source) and source[i] != "\n":
+        char = source[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "[":
+            in_class = True
+        elif char == "]":
+            in_class = False
+        elif char == "/" and not in_class:
+            return i + 1
+        i += 1
+    return i
+
+
+def _starts_regex(preceding: str) -> bool:
+    """Whether a "/" after ``preceding`` (the tokens just before it) opens a regex literal."""
+    return not preceding or preceding[-1] in _REGEX_PRECEDERS or bool(
+        _REGEX_KEYWORD.search(preceding)
+    )
+
+
+def minify_js(source: str) -> str:
+    """Conservatively minify JavaScript.
+
+    Removes comments, indentation, trailing whitespace and blank lines. A
+    small scanner skips over string, template (including ``${}``) and regex
+    literals, so their contents are copied through byte for byte.
+    """
+    out: list[str] = []
+    code: list[str] = []  # code since the last literal, whitespace still raw
+    # Last few non-blank characters of code (whitespace runs as one space), to
+    # tell a regex literal from a division; '"' stands for a literal
+    tail = ""
+
+    def flush_code() -> None:
+        if code:
+            out.append(re.sub(r"[ \t]*\n\s*", "\n", "".join(code)))
+            code.clear()
+
+    i = 0
+    while i < len(source):
+        char = source[i]
+        if source.startswith("//", i):
+            end = source.find("\n", i)
+            i = len(source) if end == -1 else end
+        elif source.startswith("/*", i):
+            end = source.find("*/", i + 2)
+            comment = source[i : len(source) if end == -1 else end + 2]
+            # Keep tokens on either side of the comment apart
+            code.append("\n" if "\n" in comment else " ")
+            i += len(comment)
+        elif char in "'\"`" or (char == "/" and _starts_regex(tail)):
+            if char == "`":
+                end = _skip_template(source, i)
+            elif char == "/":
+                end = _skip_regex(source, i)
+            else:
+                end = _skip_string(source, i)
+            flush_code()
+            out.append(source[i:end])
+            tail = '"'
+            i = end
+        else:
+            code.append(char)
+            if not char.isspace():
+                gap = " " if code[-2:-1] and code[-2].isspace() else ""
+                tail = (tail + gap + char)[-16:]
+            i += 1
+    flush_code()
+    return "".join(out).strip()
+
+
+class Asset:
+    """A single built asset with all of its precompressed encodings."""
+
+    def __init__(self, content: bytes, content_type: str):
+        self.content_type = content_type
+        self.hash = hashlib.sha256(content).hexdigest()[:16]
+        self.bodies: dict[str, bytes] = {"identity": content}
+        self.bodies["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(content, quality=11)
+
+    def etag(self, encoding: str) -> str:
+        """Strong ETag, distinct for each encoded representation."""
+        if encoding == "identity":
+            return f'"{self.hash}"'
+        return f'"{self.hash}-{encoding}"'
+
+
+def negotiate_encoding(accept_encoding: str, available: dict[str, bytes]) -> str:
+    """Pick the available encoding with the highest q-value the client gives it.
+
+    Ties go to br > gzip > identity. Codings with ``q=0`` are never chosen.
+    Identity is acceptable unless refused (``identity;q=0`` or ``*;q=0``),
+    ranks last when not listed, and is the fallback when nothing else is.
+    """
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, *params = part.split(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        accepted[token] = q
+
+    def quality(encoding: str) -> float:
+        if encoding in accepted:
+            return accepted[encoding]
+        if "*" in accepted:
+            return accepted["*"]
+        # Unlisted identity is acceptable, but only as the last resort
+        return 0.001 if encoding == "identity" else 0.0
+
+    preference = ("br", "gzip", "identity")
+    choices = [e for e in preference if e == "identity" or e in available]
+    best = max(choices, key=lambda e: (quality(e), -preference.index(e)))
+    return best if quality(best) > 0 else "identity"
+
+
+class AssetPipeline:
+    """Builds the frontend bundle once at startup and serves it from memory."""
+
+    def __init__(self, frontend_dir: Path = FRONTEND_DIR):
+        self.frontend_dir = frontend_dir
+        self.assets: dict[str, Asset] = {}
+        self.index: Optional[Asset] = None
+
+    def build(self) -> None:
+        """Minify, hash and precompress app.js/style.css and rewrite index.html."""
+        minifiers = {".js": minify_js, ".css": minify_css}
+        rewrites = {}
+
+        for name in ("app.js", "style.css"):
+            path = self.frontend_dir / name
+            minified = minifiers[path.suffix](path.read_text(encoding="utf-8"))
+            asset = Asset(minified.encode("utf-8"), CONTENT_TYPES[path.suffix])
+            hashed_name = f"{path.stem}.{asset.hash}{path.suffix}"
+            self.assets[hashed_name] = asset
+            rewrites[f"/static/{name}"] = f"/assets/{hashed_name}"
+
+        html = (self.frontend_dir / "index.html").read_text(encoding="utf-8")
+        for original, hashed in rewrites.items():
+            html = html.replace(f'"{original}"', f'"{hashed}"')
+        self.index = Asset(html.encode("utf-8"), CONTENT_TYPES[".html"])
+
+        print(f"[ASSETS] Built {len(self.assets)} assets: {', '.join(self.assets)}")
+
+    def respond(self, asset: Asset, request: Request, cache_control: str) -> Response:
+        """Serve an asset with content negotiation, ETag and 304 support."""
+        encoding = negotiate_encoding(
+            request.headers.get("accept-encoding", ""), asset.bodies
+        )
+        etag = asset.etag(encoding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match == "*":
+            return Response(status_code=304, headers=headers)
+
+        return Response(
+            content=asset.bodies[encoding],
+            media_type=asset.content_type,
+            headers=headers,
+        )
+
+
+# Singleton instance
+pipeline = AssetPipeline()
+
+router = APIRouter(tags=["Static Assets"])
+
+
+@router.get("/assets/{name}", include_in_schema=False)
+async def serve_asset(name: str, request: Request):
+    """Serve a content-hashed, precompressed frontend asset."""
+    asset = pipeline.assets.get(name)
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return pipeline.respond(asset, request, IMMUTABLE_CACHE)
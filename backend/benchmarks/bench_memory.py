@@ -0,0 +1,70 @@
+"""Memory benchmark: conversation entry storage at 1M entries.
+
+Compares the previous representation (per-instance ``__dict__``, ISO timestamp
+string, non-interned status) against the compact ``ConversationEntry``
+(``__slots__``, epoch float, interned status). Message bodies are shared
+between both variants so only per-entry overhead is measured.
+
+Usage (from backend/):
+    python -m benchmarks.bench_memory [num_entries]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from data.memory import ConversationEntry
+
+MESSAGE = "We would like to invite you to an interview for the backend role."
+RESPONSE = "Thank you for reaching out — I would be happy to schedule a call."
+
+
+class LegacyConversationEntry:
+    """The pre-compaction entry layout, kept here only for comparison."""
+
+    def __init__(self, employer_message, agent_response, status, timestamp=None):
+        self.employer_message = employer_message
+        self.agent_response = agent_response
+        self.status = status
+        self.timestamp = timestamp or datetime.now().isoformat()
+
+
+def measure(build) -> tuple[int, float]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    entries = build()
+    elapsed = time.perf_counter() - start
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries
+    return current, elapsed
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    def legacy():
+        # "approved" built at runtime, as it would arrive from request data
+        return [
+            LegacyConversationEntry(MESSAGE, RESPONSE, "".join(["appr", "oved"]))
+            for _ in range(n)
+        ]
+
+    def compact():
+        return [
+            ConversationEntry(MESSAGE, RESPONSE, "".join(["appr", "oved"]), entry_id=i)
+            for i in range(n)
+        ]
+
+    print(f"Storing {n:,} conversation entries (message bodies shared)\n")
+    print(f"{'variant':<28}{'MiB':>10}{'bytes/entry':>14}{'build (s)':>12}")
+    for name, build in (("legacy (__dict__, ISO str)", legacy), ("compact (__slots__)", compact)):
+        used, elapsed = measure(build)
+        print(f"{name:<28}{used / 2**20:>10.1f}{used / n:>14.1f}{elapsed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
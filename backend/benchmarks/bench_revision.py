@@ -0,0 +1,190 @@
+"""Benchmark: stateless vs session revision mode, per draft/evaluate/revise round.
+
+Runs the real CareerAgent/EvaluatorAgent prompt construction through a fixed
+number of revision rounds in both modes and reports, for every LLM call,
+prompt tokens, the part of them served from the provider's context cache,
+and latency.
+
+By default the Gemini models are replaced by a simulator: prompt tokens are
+estimated locally (~4 chars/token) and implicit prefix caching is emulated —
+a request whose prefix repeats the previous request to the same model is
+reported as cached for that shared prefix, once it reaches
+``MIN_CACHE_TOKENS``. Latency is then only local overhead. Pass ``--live``
+(with a real GEMINI_API_KEY) to call Gemini and measure actual usage and
+latency instead.
+
+Usage (from backend/):
+    python -m benchmarks.bench_revision [rounds] [--live]
+"""
+
+import asyncio
+import json
+import sys
+import time
+
+from agents.career_agent import CareerAgent
+from agents.evaluator_agent import EvaluatorAgent
+from agents.preprocessor import CHARS_PER_TOKEN, estimate_tokens
+from agents.usage import usage_tracker
+from prompts.career_prompt import get_career_system_prompt
+from prompts.evaluator_prompt import get_evaluator_system_prompt
+
+# Implicit caching only applies to prompts at least this long
+MIN_CACHE_TOKENS = 1024
+
+EMPLOYER_MESSAGE = (
+    "Hello Deniz,\n\nI'm a technical recruiter at Acme Cloud. We are hiring a backend "
+    "engineer to work on our FastAPI services, PostgreSQL data layer and AWS "
+    "infrastructure. " * 6
+    + "\n\nCould you tell me about your experience with Docker and CI/CD, and are you "
+    "available for a 45-minute call next Tuesday or Wednesday afternoon?\n\nBest,\nJane"
+)
+
+
+class _Usage:
+    def __init__(self, prompt: int, completion: int, cached: int):
+        self.prompt_token_count = prompt
+        self.candidates_token_count = completion
+        self.total_token_count = prompt + completion
+        self.cached_content_token_count = cached
+
+
+class _Response:
+    def __init__(self, text: str, usage: _Usage):
+        self.text = text
+        self.usage_metadata = usage
+
+
+def _flatten(contents) -> str:
+    if isinstance(contents, str):
+        return contents
+    return "".join(f"<{turn['role']}>" + "".join(turn["parts"]) for turn in contents)
+
+
+class SimulatedModel:
+    """Stands in for a GenerativeModel: deterministic replies, estimated usage."""
+
+    def __init__(self, system_instruction: str, reply):
+        self.system_instruction = system_instruction
+        self.reply = reply
+        self.calls = 0
+        self._last_prompt = ""
+
+    async def generate_content_async(self, contents):
+        prompt = self.system_instruction + _flatten(contents)
+        shared = 0
+        for a, b in zip(prompt, self._last_prompt):
+            if a != b:
+                break
+            shared += 1
+        cached = shared // CHARS_PER_TOKEN
+        self._last_prompt = prompt
+        text = self.reply(self.calls)
+        self.calls += 1
+        return _Response(
+            text,
+            _Usage(
+                estimate_tokens(prompt),
+                estimate_tokens(text),
+                cached if cached >= MIN_CACHE_TOKENS else 0,
+            ),
+        )
+
+
+def _draft(call: int) -> str:
+    return (
+        f"Dear Jane,\n\nThank you for reaching out (draft {call + 1}). "
+        + "I have built FastAPI services with Docker-based CI/CD pipelines on AWS. " * 12
+        + "\n\nI am available next Tuesday afternoon.\n\nBest regards,\nDeniz"
+    )
+
+
+def _verdict(call: int) -> str:
+    return json.dumps(
+        {
+            "tone_score": 6, "clarity_score": 6, "completeness_score": 5,
+            "safety_score": 9, "relevance_score": 7, "overall_score": 6.6,
+            "feedback": f"Round {call + 1}: answer the Wednesday option explicitly and "
+            "shorten the middle paragraph.",
+            "approved": False,
+        }
+    )
+
+
+def build_agents(live: bool) -> tuple[CareerAgent, EvaluatorAgent]:
+    career, evaluator = CareerAgent(), EvaluatorAgent()
+    if not live:
+        career.model = SimulatedModel(get_career_system_prompt(), _draft)
+        evaluator.model = SimulatedModel(get_evaluator_system_prompt(), _verdict)
+    return career, evaluator
+
+
+async def _measured(label: str, rows: list, call):
+    request_usage = usage_tracker.start_request("bench@example.com")
+    started = time.perf_counter()
+    result = await call
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    total = request_usage["total"]
+    rows.append((label, total["prompt_tokens"], total["cached_tokens"], elapsed_ms))
+    return result
+
+
+async def run(mode: str, rounds: int, live: bool) -> list:
+    career, evaluator = build_agents(live)
+    career_session = career.start_session() if mode == "session" else None
+    evaluator_session = evaluator.start_session() if mode == "session" else None
+    rows: list = []
+
+    draft = await _measured(
+        "draft", rows, career.generate_response(EMPLOYER_MESSAGE, session=career_session)
+    )
+    for r in range(rounds + 1):
+        result = await _measured(
+            f"evaluate {r}",
+            rows,
+            evaluator.evaluate(EMPLOYER_MESSAGE, draft, session=evaluator_session),
+        )
+        if r == rounds:
+            break
+        draft = await _measured(
+            f"revise {r + 1}",
+            rows,
+            career.revise_response(
+                EMPLOYER_MESSAGE, draft, result.feedback, session=career_session
+            ),
+        )
+    return rows
+
+
+def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    live = "--live" in sys.argv
+    rounds = int(args[0]) if args else 3
+
+    print(f"{rounds} revision rounds, {'live Gemini' if live else 'simulated models'}\n")
+    results = {mode: asyncio.run(run(mode, rounds, live)) for mode in ("stateless", "session")}
+
+    header = f"{'call':<14}" + "".join(
+        f"{mode + ' prompt':>18}{'cached':>9}{'ms':>9}" for mode in results
+    )
+    print(header)
+    for i, (label, *_) in enumerate(results["stateless"]):
+        line = f"{label:<14}"
+        for rows in results.values():
+            _, prompt, cached, ms = rows[i]
+            line += f"{prompt:>18,}{cached:>9,}{ms:>9.1f}"
+        print(line)
+
+    print()
+    for mode, rows in results.items():
+        prompt = sum(r[1] for r in rows)
+        cached = sum(r[2] for r in rows)
+        ms = sum(r[3] for r in rows)
+        print(
+            f"{mode:<10} prompt tokens {prompt:>8,}  uncached {prompt - cached:>8,}  "
+            f"total {ms:>9.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Search benchmark: index build time, memory and query latency.
+
+Fills a ConversationMemory with synthetic recruiter exchanges (which also
+maintains the full-text index incrementally) and times representative
+queries: a rare term, a common term, a multi-term query and a filtered one.
+
+Usage (from backend/):
+    python -m benchmarks.bench_search [num_entries]
+"""
+
+import random
+import sys
+import time
+import tracemalloc
+
+from data.memory import ConversationMemory
+from data.search import conversation_index, tokenize
+
+SKILLS = [
+    "python", "fastapi", "aws", "kubernetes", "react", "typescript", "postgres",
+    "terraform", "kafka", "golang", "rust", "django", "gcp", "azure", "spark",
+]
+ROLES = ["backend", "frontend", "platform", "data", "ml", "devops", "fullstack"]
+COMPANIES = [f"company{i}" for i in range(500)]
+TEMPLATES = [
+    "Hi, {company} is hiring a {role} engineer with {skill} and {skill2} experience.",
+    "Would you be open to an interview for our {role} team? We use {skill} heavily.",
+    "Following up on the {role} position at {company} — are you still interested?",
+    "We saw your {skill} projects and think you'd fit our {role} platform team.",
+]
+RESPONSE = "Thank you for reaching out — I would be happy to learn more about the role."
+
+
+def fill(n: int, memory: ConversationMemory) -> float:
+    rng = random.Random(42)
+    start = time.perf_counter()
+    for i in range(n):
+        message = rng.choice(TEMPLATES).format(
+            company=rng.choice(COMPANIES),
+            role=rng.choice(ROLES),
+            skill=rng.choice(SKILLS),
+            skill2=rng.choice(SKILLS),
+        )
+        memory.add_entry(
+            f"recruiter{i % 5000}@example.com", message, RESPONSE, "approved", "Opportunity"
+        )
+    return time.perf_counter() - start
+
+
+def time_query(query: str, repeat: int = 20, **filters) -> tuple[float, int]:
+    terms = tokenize(query)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        total, _hits = conversation_index.search(terms, top_k=20, **filters)
+    return (time.perf_counter() - start) / repeat * 1000, total
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    memory = ConversationMemory(max_entries_per_sender=0)
+
+    tracemalloc.start()
+    elapsed = fill(n, memory)
+    used, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = conversation_index.get_stats()
+    print(f"Indexed {n:,} entries in {elapsed:.2f}s ({stats['terms']:,} terms)")
+    print(f"Memory incl. entries: {used / 2**20:.1f} MiB\n")
+
+    print(f"{'query':<40}{'matches':>10}{'ms':>10}")
+    for label, query, filters in (
+        ("rare term", "company123", {}),
+        ("common term", "python", {}),
+        ("multi-term", "kubernetes platform interview", {}),
+        ("common term + sender filter", "python", {"sender_email": "recruiter7@example.com"}),
+    ):
+        ms, total = time_query(query, **filters)
+        print(f"{label + ': ' + query:<40}{total:>10,}{ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
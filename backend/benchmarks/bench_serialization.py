@@ -0,0 +1,99 @@
+"""Benchmark: GET /api/logs end to end — latency and bytes on the wire.
+
+Fills the default profile's log store with synthetic evaluation logs, then
+requests the real route through the ASGI app (TestClient), uncompressed and
+with gzip/brotli negotiation. The same payload is also encoded the baseline
+way, without the orjson fast path (pydantic ``model_dump`` per request, or
+FastAPI's ``jsonable_encoder``, then stdlib json), next to the bare
+``orjson.dumps`` floor the route should stay close to.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization [num_logs]
+"""
+
+import json
+import sys
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from data.logs import evaluation_logs
+from models.schemas import EvaluationDetail, EvaluationLog, ConfidenceDetail
+from main import app
+
+# Starlette's JSONResponse encoding, i.e. what the routes did before orjson
+JSON_ARGS = {"ensure_ascii": False, "allow_nan": False, "separators": (",", ":")}
+
+
+def fill_logs(n: int) -> None:
+    store = evaluation_logs.get()
+    for i in range(n):
+        store.append(
+            EvaluationLog(
+                sender_name=f"Recruiter {i % 50}",
+                sender_email=f"recruiter{i % 50}@company.com",
+                subject=f"Interview Invitation — Software Engineer #{i}",
+                response_text="Thank you for reaching out, I would be happy to meet. " * 10,
+                evaluation=EvaluationDetail(
+                    tone_score=8, clarity_score=9, completeness_score=8,
+                    safety_score=10, relevance_score=9, overall_score=8.8,
+                    feedback="Professional and clear.", approved=True,
+                ),
+                revision_count=i % 3,
+                status="approved",
+                confidence=ConfidenceDetail(confidence=0.92, category="safe"),
+            ),
+            employer_message="We would like to invite you to an interview. " * 12,
+        )
+
+
+def timed(fn, repeat: int = 5) -> tuple[float, object]:
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    fill_logs(n)
+    client = TestClient(app)
+
+    print(f"GET /api/logs with {n:,} evaluation logs (best of 5)\n")
+    print(f"{'variant':<32}{'time (ms)':>12}{'bytes':>14}")
+
+    payload = {"total": evaluation_logs.total(), "logs": evaluation_logs.newest_first()}
+    models = [EvaluationLog.model_validate(log) for log in payload["logs"]]
+
+    def pydantic_json() -> bytes:
+        logs = [model.model_dump() for model in models]
+        return json.dumps({"total": len(logs), "logs": logs}, **JSON_ARGS).encode("utf-8")
+
+    def encoder_json() -> bytes:
+        return json.dumps(jsonable_encoder(payload), **JSON_ARGS).encode("utf-8")
+
+    for name, fn in (
+        ("baseline: model_dump + json", pydantic_json),
+        ("baseline: jsonable_encoder", encoder_json),
+        ("orjson.dumps only (floor)", lambda: orjson.dumps(payload)),
+    ):
+        elapsed, body = timed(fn)
+        print(f"{name:<32}{elapsed * 1000:>12.1f}{len(body):>14,}")
+
+    for name, encoding in (("route, identity", "identity"), ("route, gzip", "gzip"), ("route, brotli", "br")):
+        elapsed, response = timed(
+            lambda: client.get("/api/logs", headers={"Accept-Encoding": encoding})
+        )
+        response.raise_for_status()
+        served = response.headers.get("content-encoding", "identity")
+        size = int(response.headers.get("content-length", len(response.content)))
+        print(f"{name + ' (' + served + ')':<32}{elapsed * 1000:>12.1f}{size:>14,}")
+
+
+if __name__ == "__main__":
+    main()
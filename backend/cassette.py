@@ -0,0 +1,274 @@
+"""Record/replay cassettes for Gemini and outbound HTTP calls.
+
+With ``CASSETTE_MODE=record`` every LLM call made through ``llm_client`` and
+every HTTP request sent by ``tools/`` (Resend, ntfy) is captured — request,
+response, token usage and observed latency — into a gzip'd JSON file named
+by the SHA-256 of the request. With ``CASSETTE_MODE=replay`` the same calls
+are answered from those files without touching the network, optionally
+after sleeping for the recorded latency, so pipeline runs with different
+prompts or modes can be compared on identical inputs.
+
+Identical requests made several times in one run are recorded in order and
+replayed in the same order. ISO timestamps (e.g. in conversation history)
+are masked when computing keys, so a replay run matches its recording even
+though the history it builds carries new timestamps.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+import httpx
+import orjson
+from fastapi import APIRouter
+
+from config import settings
+from agents.usage import extract_usage
+from circuit_breaker import is_transient_error
+from responses import ORJSONResponse
+
+MODES = ("off", "record", "replay")
+
+_ISO_TIMESTAMP = re.compile(rb"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?")
+
+# Request headers left out of HTTP recordings (credentials, and ones httpx fills in)
+IGNORED_HEADERS = frozenset(
+    ("authorization", "user-agent", "accept", "accept-encoding", "connection", "host", "content-length")
+)
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+class ReplayedError(Exception):
+    """A call that failed while recording, failing the same way on replay.
+
+    ``transient`` keeps the recorded classification (outage vs bad request),
+    so replayed failures trip breakers and defer messages as the original did.
+    """
+
+    def __init__(self, message: str, transient: bool):
+        super().__init__(message)
+        self.transient = transient
+
+
+def request_key(request: dict) -> str:
+    """Content address of a request: SHA-256 of its canonical JSON, timestamps masked."""
+    canonical = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(_ISO_TIMESTAMP.sub(b"<ts>", canonical)).hexdigest()
+
+
+def llm_request(model, prompt) -> dict:
+    """Everything that determines a Gemini response: model, system prompt, config, contents."""
+    system = getattr(model, "_system_instruction", None)
+    return {
+        "model": getattr(model, "model_name", type(model).__name__),
+        "system_instruction": "".join(part.text for part in system.parts) if system else "",
+        "generation_config": dict(getattr(model, "_generation_config", None) or {}),
+        "contents": prompt,
+    }
+
+
+def http_request(request: httpx.Request) -> dict:
+    return {
+        "method": request.method,
+        "url": str(request.url),
+        "headers": {
+            name: value
+            for name, value in sorted(request.headers.items())
+            if name.lower() not in IGNORED_HEADERS
+        },
+        "body": request.content.decode("utf-8", "replace"),
+    }
+
+
+class ReplayedUsage:
+    """usage_metadata look-alike rebuilt from recorded token counts."""
+
+    def __init__(self, usage: dict):
+        self.prompt_token_count = usage.get("prompt_tokens", 0)
+        self.candidates_token_count = usage.get("completion_tokens", 0)
+        self.total_token_count = usage.get("total_tokens", 0)
+        self.cached_content_token_count = usage.get("cached_tokens", 0)
+
+
+class ReplayedResponse:
+    """generate_content response look-alike: ``text`` and ``usage_metadata``."""
+
+    def __init__(self, interaction: dict):
+        self.text = interaction["text"]
+        self.usage_metadata = ReplayedUsage(interaction.get("usage") or {})
+
+
+class CassetteStore:
+    """Cassette files under ``directory``, one per distinct request.
+
+    Each file holds the request once and the list of interactions recorded
+    for it. Recording starts a request's list afresh the first time the
+    request is seen in a process, so re-recording replaces old outputs.
+    """
+
+    def __init__(
+        self,
+        mode: str = settings.CASSETTE_MODE,
+        directory: str = settings.CASSETTE_DIR,
+        replay_latency: bool = settings.CASSETTE_REPLAY_LATENCY,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"CASSETTE_MODE must be one of {MODES}, got '{mode}'")
+        self.mode = mode
+        self.directory = Path(directory)
+        self.replay_latency = replay_latency
+        self._cassettes: dict[str, Optional[dict]] = {}
+        self._replay_positions: dict[str, int] = {}
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+
+    def _path(self, kind: str, key: str) -> Path:
+        return self.directory / kind / f"{key}.json.gz"
+
+    def _load(self, kind: str, key: str) -> Optional[dict]:
+        if key not in self._cassettes:
+            path = self._path(kind, key)
+            self._cassettes[key] = (
+                orjson.loads(gzip.decompress(path.read_bytes())) if path.exists() else None
+            )
+        return self._cassettes[key]
+
+    def record(self, kind: str, request: dict, interaction: dict) -> None:
+        key = request_key(request)
+        cassette = self._cassettes.get(key)
+        if cassette is None:
+            cassette = self._cassettes[key] = {"kind": kind, "request": request, "interactions": []}
+        cassette["interactions"].append(interaction)
+        path = self._path(kind, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # mtime=0 keeps identical recordings byte-identical
+        path.write_bytes(gzip.compress(orjson.dumps(cassette), mtime=0))
+        self.recorded += 1
+
+    async def replay(self, kind: str, request: dict) -> dict:
+        """Next recorded interaction for ``request``, after its latency if enabled."""
+        key = request_key(request)
+        cassette = self._load(kind, key)
+        if cassette is None or not cassette["interactions"]:
+            self.misses += 1
+            print(f"[CASSETTE] No {kind} recording for request {key[:12]}")
+            raise CassetteMissError(f"No {kind} recording for request {key[:12]}")
+        position = self._replay_positions.get(key, 0)
+        self._replay_positions[key] = position + 1
+        interactions = cassette["interactions"]
+        interaction = interactions[position % len(interactions)]
+        self.replayed += 1
+        if self.replay_latency:
+            await asyncio.sleep(interaction["latency_ms"] / 1000)
+        return interaction
+
+    async def generate(self, model, prompt):
+        """``model.generate_content_async(prompt)``, recorded or replayed per the mode."""
+        if self.mode == "off":
+            return await model.generate_content_async(prompt)
+        request = llm_request(model, prompt)
+        if self.mode == "replay":
+            interaction = await self.replay("llm", request)
+            if "error" in interaction:
+                raise ReplayedError(interaction["error"], interaction.get("transient", False))
+            return ReplayedResponse(interaction)
+
+        started = time.perf_counter()
+        try:
+            response = await model.generate_content_async(prompt)
+            # Blocked responses raise here; record that as the outcome too
+            text = response.text
+        except Exception as e:
+            self.record(
+                "llm",
+                request,
+                {
+                    "error": f"{type(e).__name__}: {e}",
+                    "transient": is_transient_error(e),
+                    "latency_ms": _elapsed_ms(started),
+                },
+            )
+            raise
+        self.record(
+            "llm",
+            request,
+            {"text": text, "usage": extract_usage(response), "latency_ms": _elapsed_ms(started)},
+        )
+        return response
+
+    def http_transport(self) -> Optional[httpx.AsyncBaseTransport]:
+        """Transport for tool HTTP clients (None = httpx's default when cassettes are off)."""
+        return CassetteTransport(self) if self.mode != "off" else None
+
+    def get_stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "directory": str(self.directory),
+            "replay_latency": self.replay_latency,
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "misses": self.misses,
+        }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """httpx transport that records responses from, or replays them instead of, the network."""
+
+    def __init__(self, store: CassetteStore):
+        self.store = store
+        self._transport = httpx.AsyncHTTPTransport() if store.mode == "record" else None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        recorded_request = http_request(request)
+        if self._transport is None:
+            interaction = await self.store.replay("http", recorded_request)
+            return httpx.Response(
+                interaction["status_code"],
+                headers=interaction["headers"],
+                content=interaction["body"].encode("utf-8"),
+                request=request,
+            )
+
+        started = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        body = await response.aread()
+        self.store.record(
+            "http",
+            recorded_request,
+            {
+                "status_code": response.status_code,
+                "headers": {"content-type": response.headers.get("content-type", "")},
+                "body": body.decode("utf-8", "replace"),
+                "latency_ms": _elapsed_ms(started),
+            },
+        )
+        return response
+
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            await self._transport.aclose()
+
+
+# Singleton instance
+cassettes = CassetteStore()
+
+router = APIRouter(prefix="/api", tags=["Cassettes"], default_response_class=ORJSONResponse)
+
+
+@router.get("/cassettes/stats")
+async def get_cassette_stats():
+    """Return the cassette mode and record/replay/miss counters."""
+    return cassettes.get_stats()
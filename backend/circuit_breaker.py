@@ -0,0 +1,170 @@
+"""Circuit breakers for the LLM provider and outbound delivery tools."""
+
+import asyncio
+import time
+from collections import deque
+from typing import Optional
+
+import httpx
+from google.api_core import exceptions as google_exceptions
+
+from config import settings
+
+# Provider-side errors worth retrying later: 5xx (incl. deadline exceeded) and throttling
+_TRANSIENT_GOOGLE_ERRORS = (
+    google_exceptions.ServerError,
+    google_exceptions.TooManyRequests,
+    google_exceptions.RetryError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because its circuit is open."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Circuit '{name}' is open")
+        self.name = name
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether an error means the dependency is unavailable, rather than that
+    this particular request is bad.
+
+    Transport failures, timeouts, 5xx and 429 responses are transient: they
+    count against the circuit and are worth retrying later. Anything else (a
+    400, a safety block, a response that cannot be parsed) would fail the
+    same way on retry.
+    """
+    transient = getattr(error, "transient", None)
+    if transient is not None:
+        return bool(transient)
+    if isinstance(
+        error,
+        (TimeoutError, asyncio.TimeoutError, ConnectionError, httpx.TransportError, CircuitOpenError),
+    ):
+        return True
+    if isinstance(error, _TRANSIENT_GOOGLE_ERRORS):
+        return True
+    status = getattr(error, "status_code", None)
+    return isinstance(status, int) and (status >= 500 or status == 429)
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with half-open probing.
+
+    - closed: calls pass; outcomes are kept for ``window_seconds``. Once at
+      least ``min_calls`` outcomes are in the window and the failure rate
+      reaches ``failure_rate_threshold``, the circuit opens.
+    - open: calls are rejected immediately for ``open_seconds``.
+    - half_open: up to ``half_open_probes`` trial calls are let through; a
+      success closes the circuit, a failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = settings.BREAKER_WINDOW_SECONDS,
+        min_calls: int = settings.BREAKER_MIN_CALLS,
+        failure_rate_threshold: float = settings.BREAKER_FAILURE_RATE,
+        open_seconds: float = settings.BREAKER_OPEN_SECONDS,
+        half_open_probes: int = 1,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = "closed"
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.rejected = 0
+        self.transitions: deque[dict] = deque(maxlen=20)
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed (reserves a probe slot when half-open)."""
+        if self.state == "open":
+            if time.time() - self._opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self._transition("half_open")
+
+        if self.state == "half_open":
+            if self._probes_in_flight >= self.half_open_probes:
+                self.rejected += 1
+                return False
+            self._probes_in_flight += 1
+        return True
+
+    def is_available(self) -> bool:
+        """Non-reserving check: would a call be let through right now?"""
+        if self.state == "open":
+            return time.time() - self._opened_at >= self.open_seconds
+        if self.state == "half_open":
+            return self._probes_in_flight < self.half_open_probes
+        return True
+
+    def release(self) -> None:
+        """Free a half-open probe slot whose call ended without an outcome (e.g. cancelled)."""
+        if self.state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+
+    def record_success(self) -> None:
+        if self.state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._outcomes.clear()
+            self._transition("closed")
+            return
+        self._record(True)
+
+    def record_failure(self, error: Optional[str] = None) -> None:
+        if self.state == "half_open":
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            self._open(error)
+            return
+        self._record(False)
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        if (
+            self.state == "closed"
+            and len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_rate_threshold
+        ):
+            self._open(error)
+
+    def _record(self, success: bool) -> None:
+        now = time.time()
+        self._outcomes.append((now, success))
+        while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+            self._outcomes.popleft()
+
+    def _open(self, error: Optional[str]) -> None:
+        self._opened_at = time.time()
+        self._transition("open", error)
+
+    def _transition(self, state: str, error: Optional[str] = None) -> None:
+        print(f"[BREAKER] {self.name}: {self.state} -> {state}" + (f" ({error})" if error else ""))
+        self.transitions.append(
+            {"from": self.state, "to": state, "at": time.time(), "error": error}
+        )
+        self.state = state
+
+    def get_status(self) -> dict:
+        failures = sum(1 for _, ok in self._outcomes if not ok)
+        return {
+            "state": self.state,
+            "window_calls": len(self._outcomes),
+            "window_failure_rate": round(failures / len(self._outcomes), 3)
+            if self._outcomes
+            else 0.0,
+            "rejected": self.rejected,
+            "transitions": list(self.transitions),
+        }
+
+
+# One breaker per external dependency
+llm_breaker = CircuitBreaker("llm")
+email_breaker = CircuitBreaker("resend")
+notification_breaker = CircuitBreaker("ntfy")
+
+breakers = {b.name: b for b in (llm_breaker, email_breaker, notification_breaker)}
@@ -15,6 +15,116 @@ class Settings(BaseSettings):
     EVALUATOR_THRESHOLD: int = 7
     MAX_REVISION_ATTEMPTS: int = 3
 
+    # Token budget (USD, 0 = unlimited) and degradation when nearing it
+    DAILY_BUDGET_USD: float = 0
+    MONTHLY_BUDGET_USD: float = 0
+    BUDGET_DEGRADE_RATIO: float = 0.8
+    BUDGET_DEGRADED_MAX_REVISIONS: int = 1
+    EVALUATOR_FALLBACK_MODEL: str = "gemini-2.0-flash-lite"
+
+    # Hedged LLM requests — duplicate calls slower than the role's latency percentile
+    HEDGE_ENABLED: bool = True
+    HEDGE_PERCENTILE: float = 0.95
+    HEDGE_BUDGET_RATIO: float = 0.1
+    HEDGE_MIN_SAMPLES: int = 20
+    HEDGE_MIN_DELAY_SECONDS: float = 0.5
+
+    # Circuit breakers for Gemini, Resend and ntfy
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    BREAKER_WINDOW_SECONDS: float = 60.0
+    BREAKER_MIN_CALLS: int = 5
+    BREAKER_FAILURE_RATE: float = 0.5
+    BREAKER_OPEN_SECONDS: float = 30.0
+    DEFERRED_RETRY_SECONDS: float = 30.0  # delay before a deferred message's job first runs
+
+    # Admission control for /api/message (bounded in-flight pipelines + priority wait queue)
+    ADMISSION_MAX_IN_FLIGHT: int = 4
+    ADMISSION_MAX_QUEUE: int = 32
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 30.0
+
+    # Input preprocessing — quoted replies/signatures are stripped; messages still over
+    # the token budget are replaced by a structured digest (0 = never digest)
+    INPUT_TOKEN_BUDGET: int = 1500
+    INPUT_DIGEST_CHUNK_TOKENS: int = 6000
+    INPUT_DIGEST_MODEL: str = "gemini-2.0-flash-lite"
+
+    # Draft–evaluate–revise loop: "stateless" re-sends the full context each round,
+    # "session" keeps a per-request chat per agent and sends only the new turn
+    REVISION_MODE: str = "stateless"
+
+    # Record/replay of Gemini and tool HTTP calls: "off", "record" (capture to
+    # CASSETTE_DIR) or "replay" (serve recordings offline, optionally at recorded latency)
+    CASSETTE_MODE: str = "off"
+    CASSETTE_DIR: str = str(Path(__file__).resolve().parent / "cassettes")
+    CASSETTE_REPLAY_LATENCY: bool = False
+
+    # Adaptive revision policy — escalate drafts unlikely to ever be approved
+    REVISION_POLICY_ENABLED: bool = True
+    REVISION_POLICY_MIN_SAMPLES: int = 20
+    REVISION_POLICY_ESCALATE_BELOW: float = 0.15
+    # Share of would-be escalations revised anyway, so escalating states keep being re-measured
+    REVISION_POLICY_EXPLORE_RATE: float = 0.1
+
+    # Multi-profile serving: <profile_id>.json files, plus the built-in 'default' profile
+    PROFILES_DIR: str = str(Path(__file__).resolve().parent / "profiles")
+    PROFILE_CACHE_SIZE: int = 32  # per-profile agents kept constructed (LRU)
+
+    # Background job workers for /api/jobs (job state persisted in SQLite)
+    JOBS_DB_PATH: str = str(Path(__file__).resolve().parent / "data" / "jobs.sqlite3")
+    JOB_WORKERS: int = 2
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_SECONDS: float = 30.0
+    JOB_RETENTION_DAYS: float = 7
+    # Comma-separated hosts a job's callback_url may point at (empty = callbacks disabled)
+    JOB_CALLBACK_ALLOWED_HOSTS: str = ""
+
+    # Live dashboard events over WebSocket (/api/events); a subscriber more than
+    # EVENTS_MAX_PENDING events behind is told to resync instead of buffering
+    EVENTS_MAX_SUBSCRIBERS: int = 1000
+    EVENTS_MAX_PENDING: int = 256
+
+    # Streaming export/import (/api/archive): records per batch / row group, and how much
+    # of an uploaded Parquet/Arrow file is buffered in memory before spilling to disk
+    ARCHIVE_BATCH_SIZE: int = 500
+    ARCHIVE_SPOOL_MAX_BYTES: int = 16 * 1024 * 1024
+
+    # ntfy digest mode — batches low-priority pushes into periodic summaries
+    NTFY_DIGEST_ENABLED: bool = True
+    NTFY_DIGEST_WINDOW_SECONDS: float = 60.0
+    NTFY_DIGEST_MAX_BATCH: int = 20
+
+    # Retention for in-memory conversations and evaluation logs (0 = unlimited)
+    MEMORY_MAX_ENTRIES_PER_SENDER: int = 500
+    MEMORY_MAX_AGE_DAYS: float = 0
+    LOG_MAX_ENTRIES: int = 10000
+    LOG_MAX_AGE_DAYS: float = 0
+
+    # Analytics rollups kept for /api/stats (oldest buckets dropped beyond these)
+    ANALYTICS_HOURLY_BUCKETS: int = 24 * 14
+    ANALYTICS_DAILY_BUCKETS: int = 365
+
+    # Inbound IMAP connector (disabled unless IMAP_HOST is set)
+    IMAP_HOST: str = ""
+    IMAP_PORT: int = 993
+    IMAP_USE_SSL: bool = True
+    IMAP_USERNAME: str = ""
+    IMAP_PASSWORD: str = ""
+    IMAP_MAILBOX: str = "INBOX"
+    IMAP_IDLE_TIMEOUT_SECONDS: float = 1500.0  # re-issue IDLE before the 29 min server cutoff
+    IMAP_FETCH_TIMEOUT_SECONDS: float = 120.0  # whole-message fetch; reconnects when exceeded
+    INBOUND_MAX_CONCURRENCY: int = 2
+    INBOUND_MAX_BODY_BYTES: int = 200_000
+
+    # Profiling (admin endpoints are off unless PROFILING_ENABLED; ADMIN_TOKEN guards them when set)
+    PROFILING_ENABLED: bool = False
+    ADMIN_TOKEN: str = ""
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of /api/message requests to wall-clock profile
+    PROFILE_SAMPLE_INTERVAL_SECONDS: float = 0.005
+    PROFILE_MAX_STORED: int = 20
+    PROFILE_MAX_SESSION_SECONDS: float = 300.0
+    LOOP_LAG_THRESHOLD_SECONDS: float = 0.1
+
     model_config = {
         "env_file": str(Path(__file__).resolve().parent.parent / ".env"),
         "env_file_encoding": "utf-8",
@@ -0,0 +1,225 @@
+"""Minimal asyncio IMAP4rev1 client with IDLE and streamed FETCH literals.
+
+The stdlib ``imaplib`` is blocking and (before Python 3.14) has no IDLE
+support, so this implements only the handful of commands the inbound
+connector needs: LOGIN, SELECT, UID SEARCH, UID FETCH, UID STORE, IDLE and
+LOGOUT.
+"""
+
+import asyncio
+import re
+import ssl
+from typing import Callable, Optional
+
+LITERAL_RE = re.compile(rb"\{(\d+)\}\r\n$")
+EXISTS_RE = re.compile(rb"^\* \d+ (EXISTS|RECENT)", re.I)
+UIDVALIDITY_RE = re.compile(rb"\[UIDVALIDITY (\d+)\]", re.I)
+
+# Size of each read while streaming a message literal
+STREAM_CHUNK_SIZE = 64 * 1024
+# Upper bound for a single response line (e.g. a long UID SEARCH result)
+STREAM_READER_LIMIT = 1024 * 1024
+
+
+class IMAPError(Exception):
+    """Raised when the server answers NO/BAD or the connection breaks."""
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class AsyncIMAPClient:
+    """Single IMAP connection driven with asyncio streams."""
+
+    def __init__(self, host: str, port: int, use_ssl: bool = True, timeout: float = 30.0):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._tag_counter = 0
+
+    async def connect(self) -> None:
+        ssl_context = ssl.create_default_context() if self.use_ssl else None
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                self.host, self.port, ssl=ssl_context, limit=STREAM_READER_LIMIT
+            ),
+            self.timeout,
+        )
+        greeting = await self._readline()
+        if not greeting.startswith(b"* OK"):
+            raise IMAPError(f"Unexpected greeting: {greeting!r}")
+
+    async def close(self) -> None:
+        if self._writer is None:
+            return
+        try:
+            await asyncio.wait_for(self._command("LOGOUT"), 5)
+        except (IMAPError, OSError, asyncio.TimeoutError):
+            pass
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+        self._reader = self._writer = None
+
+    async def login(self, username: str, password: str) -> None:
+        await self._command(f"LOGIN {_quote(username)} {_quote(password)}")
+
+    async def select(self, mailbox: str = "INBOX") -> Optional[int]:
+        """Select ``mailbox`` and return its UIDVALIDITY (None if not reported)."""
+        for line in await self._command(f"SELECT {_quote(mailbox)}"):
+            match = UIDVALIDITY_RE.search(line)
+            if match:
+                return int(match.group(1))
+        return None
+
+    async def search_unseen(self) -> list[int]:
+        """Return UIDs of all unseen messages in the selected mailbox."""
+        untagged = await self._command("UID SEARCH UNSEEN")
+        uids = []
+        for line in untagged:
+            if line.upper().startswith(b"* SEARCH"):
+                uids.extend(int(x) for x in line.split()[2:])
+        return uids
+
+    async def fetch_streamed(
+        self, uid: int, on_chunk: Callable[[bytes], None]
+    ) -> int:
+        """Fetch a full message by UID, passing the body to ``on_chunk`` piecewise.
+
+        Uses ``BODY.PEEK[]`` so fetching leaves the message unseen; call
+        :meth:`mark_seen` once it has been handled. The literal is never held
+        in memory as a whole. Every read waits at most ``timeout`` seconds.
+
+        Returns:
+            Number of message bytes streamed.
+        """
+        tag = self._next_tag()
+        await self._send(f"{tag} UID FETCH {uid} (UID BODY.PEEK[])")
+        streamed = 0
+        while True:
+            line = await asyncio.wait_for(self._readline(), self.timeout)
+            literal = LITERAL_RE.search(line)
+            if literal and line.startswith(b"*"):
+                remaining = int(literal.group(1))
+                while remaining > 0:
+                    chunk = await asyncio.wait_for(
+                        self._reader.read(min(STREAM_CHUNK_SIZE, remaining)), self.timeout
+                    )
+                    if not chunk:
+                        raise IMAPError("Connection closed while streaming message")
+                    remaining -= len(chunk)
+                    streamed += len(chunk)
+                    on_chunk(chunk)
+                continue
+            if line.startswith(tag.encode()):
+                self._check_status(line)
+                return streamed
+
+    async def mark_seen(self, uids: list[int]) -> None:
+        """Set the \\Seen flag on the given UIDs."""
+        if uids:
+            uid_set = ",".join(str(uid) for uid in uids)
+            await self._command(f"UID STORE {uid_set} +FLAGS.SILENT (\\Seen)")
+
+    async def idle(self, timeout: float, wakeup: Optional[asyncio.Event] = None) -> bool:
+        """Enter IDLE until new mail arrives, ``wakeup`` is set or ``timeout`` seconds pass.
+
+        Returns:
+            True if the server announced new messages, False otherwise.
+        """
+        tag = self._next_tag()
+        await self._send(f"{tag} IDLE")
+        # Untagged updates may arrive before the continuation request
+        has_new_mail = False
+        while True:
+            line = await asyncio.wait_for(self._readline(), self.timeout)
+            if line.startswith(b"+"):
+                break
+            if line.startswith(tag.encode()):
+                self._check_status(line)
+                raise IMAPError(f"IDLE not accepted: {line!r}")
+            if EXISTS_RE.match(line):
+                has_new_mail = True
+
+        if not has_new_mail:
+            has_new_mail = await self._wait_for_exists(timeout, wakeup)
+
+        await self._send("DONE")
+        while True:
+            line = await asyncio.wait_for(self._readline(), self.timeout)
+            if line.startswith(tag.encode()):
+                self._check_status(line)
+                return has_new_mail
+
+    async def _wait_for_exists(self, timeout: float, wakeup: Optional[asyncio.Event]) -> bool:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        wakeup_task = asyncio.ensure_future(wakeup.wait()) if wakeup is not None else None
+        read_task: Optional[asyncio.Future] = None
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return False
+                # readline() keeps partial data buffered when cancelled, so racing it is safe
+                read_task = asyncio.ensure_future(self._readline())
+                waiters = {read_task, wakeup_task} if wakeup_task else {read_task}
+                done, _ = await asyncio.wait(
+                    waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                if read_task not in done:
+                    return False
+                if EXISTS_RE.match(read_task.result()):
+                    return True
+        finally:
+            for task in (read_task, wakeup_task):
+                if task is not None and not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+
+    # ---- protocol plumbing ----
+
+    def _next_tag(self) -> str:
+        self._tag_counter += 1
+        return f"A{self._tag_counter:04d}"
+
+    async def _send(self, line: str) -> None:
+        if self._writer is None:
+            raise IMAPError("Not connected")
+        self._writer.write(line.encode("utf-8") + b"\r\n")
+        await self._writer.drain()
+
+    async def _readline(self) -> bytes:
+        if self._reader is None:
+            raise IMAPError("Not connected")
+        line = await self._reader.readline()
+        if not line:
+            raise IMAPError("Connection closed by server")
+        return line
+
+    async def _command(self, command: str) -> list[bytes]:
+        tag = self._next_tag()
+        await self._send(f"{tag} {command}")
+        untagged = []
+        while True:
+            line = await asyncio.wait_for(self._readline(), self.timeout)
+            if line.startswith(tag.encode()):
+                self._check_status(line)
+                return untagged
+            literal = LITERAL_RE.search(line)
+            if literal:
+                # Small literals in command responses are read whole
+                line += await self._reader.readexactly(int(literal.group(1)))
+            untagged.append(line.rstrip(b"\r\n"))
+
+    @staticmethod
+    def _check_status(line: bytes) -> None:
+        parts = line.split(b" ", 2)
+        if len(parts) < 2 or parts[1].upper() != b"OK":
+            raise IMAPError(line.decode("utf-8", errors="replace").strip())
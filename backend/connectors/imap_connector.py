@@ -0,0 +1,220 @@
+"""Inbound mailbox connector — pushes new recruiter emails into the agent pipeline.
+
+Keeps one persistent IMAP connection in IDLE so new mail is picked up as soon
+as the server announces it, instead of polling on a timer.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from fastapi import APIRouter
+
+from config import settings
+from connectors.imap_client import AsyncIMAPClient, IMAPError
+from connectors.mime import StreamingMimeParser, strip_quoted_reply
+from models.schemas import EmployerMessage
+
+# Reconnect backoff bounds after a dropped connection
+RECONNECT_MIN_SECONDS = 1.0
+RECONNECT_MAX_SECONDS = 60.0
+
+
+class InboundConnector:
+    """Watches an IMAP mailbox and feeds new messages to a handler.
+
+    The handler (normally the ``/api/message`` pipeline) runs with at most
+    ``max_concurrency`` messages in flight; fetching pauses while the limit is
+    reached, so a large backlog never floods the LLM.
+
+    Messages are fetched with PEEK and flagged \\Seen only once the handler has
+    accepted them (answered or queued for retry, not an error response), so
+    anything that failed stays unseen in the mailbox and is picked up again
+    after a restart. Within a run, only UIDs above the highest one fetched so
+    far are considered; that mark resets when the mailbox's UIDVALIDITY
+    changes.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[EmployerMessage], Awaitable],
+        host: str = settings.IMAP_HOST,
+        port: int = settings.IMAP_PORT,
+        username: str = settings.IMAP_USERNAME,
+        password: str = settings.IMAP_PASSWORD,
+        mailbox: str = settings.IMAP_MAILBOX,
+        use_ssl: bool = settings.IMAP_USE_SSL,
+        idle_timeout: float = settings.IMAP_IDLE_TIMEOUT_SECONDS,
+        fetch_timeout: float = settings.IMAP_FETCH_TIMEOUT_SECONDS,
+        max_concurrency: int = settings.INBOUND_MAX_CONCURRENCY,
+        max_body_bytes: int = settings.INBOUND_MAX_BODY_BYTES,
+    ):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.mailbox = mailbox
+        self.use_ssl = use_ssl
+        self.idle_timeout = idle_timeout
+        self.fetch_timeout = fetch_timeout
+        self.max_body_bytes = max_body_bytes
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.max_concurrency = max_concurrency
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: set[asyncio.Task] = set()
+        self._uid_validity: Optional[int] = None
+        self._last_uid = 0
+        # UIDs accepted by the handler, flagged \\Seen before the next IDLE
+        self._accepted_uids: list[int] = []
+        self._accepted = asyncio.Event()
+        self.connected = False
+        self.messages_ingested = 0
+        self.messages_failed = 0
+        self.bytes_streamed = 0
+        self.last_error: Optional[str] = None
+        self.last_ingest_latency_ms: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.host)
+
+    def start(self) -> None:
+        """Start the background IDLE loop (no-op when IMAP is not configured)."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print(f"[INBOUND] Watching {self.username}@{self.host}/{self.mailbox}")
+
+    async def stop(self) -> None:
+        """Stop watching and wait for in-flight messages to finish."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+
+    async def _run(self) -> None:
+        backoff = RECONNECT_MIN_SECONDS
+        while True:
+            client = AsyncIMAPClient(self.host, self.port, use_ssl=self.use_ssl)
+            try:
+                await client.connect()
+                await client.login(self.username, self.password)
+                uid_validity = await client.select(self.mailbox)
+                if uid_validity != self._uid_validity:
+                    # UIDs from a different UIDVALIDITY refer to other messages
+                    self._uid_validity = uid_validity
+                    self._last_uid = 0
+                    self._accepted_uids = []
+                self.connected = True
+                backoff = RECONNECT_MIN_SECONDS
+
+                while True:
+                    await self._mark_accepted(client)
+                    await self._ingest_unseen(client)
+                    await client.idle(self.idle_timeout, wakeup=self._accepted)
+            except asyncio.CancelledError:
+                await client.close()
+                raise
+            except (IMAPError, OSError, asyncio.TimeoutError) as e:
+                self.last_error = str(e)
+                print(f"[INBOUND] Connection error: {e} — reconnecting in {backoff:.0f}s")
+            finally:
+                self.connected = False
+            await client.close()
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RECONNECT_MAX_SECONDS)
+
+    async def _mark_accepted(self, client: AsyncIMAPClient) -> None:
+        uids, self._accepted_uids = self._accepted_uids, []
+        self._accepted.clear()
+        try:
+            await client.mark_seen(uids)
+        except BaseException:
+            self._accepted_uids = uids + self._accepted_uids
+            raise
+
+    async def _ingest_unseen(self, client: AsyncIMAPClient) -> None:
+        for uid in sorted(await client.search_unseen()):
+            if uid <= self._last_uid:
+                continue
+            # Backpressure: wait for a free slot before pulling the next message
+            await self._semaphore.acquire()
+            started = time.perf_counter()
+            try:
+                parser = StreamingMimeParser(max_body_bytes=self.max_body_bytes)
+                self.bytes_streamed += await asyncio.wait_for(
+                    client.fetch_streamed(uid, parser.feed), self.fetch_timeout
+                )
+                parsed = parser.close()
+            except BaseException:
+                self._semaphore.release()
+                raise
+            self._last_uid = uid
+
+            body = strip_quoted_reply(parsed.body)
+            if not parsed.sender_email or not body:
+                self._semaphore.release()
+                continue
+
+            message = EmployerMessage(
+                sender_name=parsed.sender_name,
+                sender_email=parsed.sender_email,
+                subject=parsed.subject or "(no subject)",
+                message=body,
+            )
+            task = asyncio.create_task(self._handle(uid, message, started))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _handle(self, uid: int, message: EmployerMessage, started: float) -> None:
+        try:
+            self.last_ingest_latency_ms = round((time.perf_counter() - started) * 1000, 1)
+            response = await self.handler(message)
+            # An error response (rejected, or deferral impossible) is a failure too
+            status_code = getattr(response, "status_code", 200)
+            if status_code >= 400:
+                raise RuntimeError(f"pipeline returned HTTP {status_code}")
+            self.messages_ingested += 1
+            self._accepted_uids.append(uid)
+            self._accepted.set()
+        except Exception as e:
+            self.messages_failed += 1
+            self.last_error = str(e)
+            print(f"[INBOUND] Failed to process message from {message.sender_email}: {e}")
+        finally:
+            self._semaphore.release()
+
+    def get_status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "connected": self.connected,
+            "mailbox": self.mailbox,
+            "uid_validity": self._uid_validity,
+            "last_uid": self._last_uid,
+            "in_flight": len(self._in_flight),
+            "max_concurrency": self.max_concurrency,
+            "messages_ingested": self.messages_ingested,
+            "messages_failed": self.messages_failed,
+            "bytes_streamed": self.bytes_streamed,
+            "last_ingest_latency_ms": self.last_ingest_latency_ms,
+            "last_error": self.last_error,
+        }
+
+
+# Created by main.py once the pipeline handler is importable
+connector: Optional[InboundConnector] = None
+
+router = APIRouter(prefix="/api", tags=["Inbound"])
+
+
+@router.get("/inbound/status")
+async def inbound_status():
+    """Return the inbound mailbox connector status and counters."""
+    if connector is None:
+        return {"enabled": False}
+    return connector.get_status()
@@ -0,0 +1,151 @@
+"""Local IMAP stand-in for exercising the inbound connector without a real mailbox.
+
+Implements just enough of IMAP4rev1 for ``AsyncIMAPClient``: LOGIN, SELECT,
+UID SEARCH UNSEEN, UID FETCH (BODY[] / BODY.PEEK[]), UID STORE +FLAGS (\\Seen),
+IDLE/DONE, NOOP and LOGOUT. Messages delivered with
+:meth:`StubIMAPServer.deliver` are announced to idling clients immediately.
+
+Usage (from backend/):
+    python -m connectors.imap_stub --port 1143
+    # then set IMAP_HOST=127.0.0.1 IMAP_PORT=1143 IMAP_USE_SSL=false
+"""
+
+import argparse
+import asyncio
+import re
+from email.message import EmailMessage
+from typing import Optional
+
+
+class StubIMAPServer:
+    """In-memory single-mailbox IMAP server."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, uid_validity: int = 1):
+        self.host = host
+        self.port = port
+        self.uid_validity = uid_validity
+        self.messages: dict[int, bytes] = {}
+        self.seen: set[int] = set()
+        self._next_uid = 1
+        self._idlers: set[asyncio.Queue] = set()
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self) -> int:
+        """Start listening; returns the bound port."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def deliver(self, raw_message: bytes) -> int:
+        """Add a message to the mailbox and wake up idling clients."""
+        uid = self._next_uid
+        self._next_uid += 1
+        self.messages[uid] = raw_message.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n")
+        for queue in self._idlers:
+            queue.put_nowait(len(self.messages))
+        return uid
+
+    def deliver_text(self, sender: str, subject: str, body: str) -> int:
+        """Convenience wrapper that builds a plain-text email."""
+        msg = EmailMessage()
+        msg["From"] = sender
+        msg["To"] = "candidate@example.com"
+        msg["Subject"] = subject
+        msg.set_content(body)
+        return self.deliver(msg.as_bytes())
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        writer.write(b"* OK IMAP stub ready\r\n")
+        await writer.drain()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.decode("utf-8").strip().split(" ", 2)
+                tag, command = parts[0], parts[1].upper() if len(parts) > 1 else ""
+                args = parts[2] if len(parts) > 2 else ""
+
+                if command == "LOGOUT":
+                    writer.write(b"* BYE\r\n" + f"{tag} OK LOGOUT completed\r\n".encode())
+                    await writer.drain()
+                    break
+                elif command in ("LOGIN", "NOOP"):
+                    writer.write(f"{tag} OK {command} completed\r\n".encode())
+                elif command == "SELECT":
+                    writer.write(f"* {len(self.messages)} EXISTS\r\n".encode())
+                    writer.write(f"* OK [UIDVALIDITY {self.uid_validity}] UIDs valid\r\n".encode())
+                    writer.write(f"{tag} OK [READ-WRITE] SELECT completed\r\n".encode())
+                elif command == "UID" and args.upper().startswith("SEARCH"):
+                    unseen = " ".join(str(u) for u in self.messages if u not in self.seen)
+                    writer.write(f"* SEARCH {unseen}".rstrip().encode() + b"\r\n")
+                    writer.write(f"{tag} OK SEARCH completed\r\n".encode())
+                elif command == "UID" and args.upper().startswith("FETCH"):
+                    uid = int(re.match(r"FETCH (\d+)", args, re.I).group(1))
+                    raw = self.messages.get(uid)
+                    if raw is not None:
+                        if "BODY.PEEK[]" not in args.upper():
+                            self.seen.add(uid)
+                        writer.write(f"* {uid} FETCH (UID {uid} BODY[] {{{len(raw)}}}\r\n".encode())
+                        writer.write(raw)
+                        writer.write(b")\r\n")
+                    writer.write(f"{tag} OK FETCH completed\r\n".encode())
+                elif command == "UID" and args.upper().startswith("STORE"):
+                    uid_set = re.match(r"STORE ([\d,]+) \+FLAGS", args, re.I).group(1)
+                    if "\\SEEN" in args.upper():
+                        self.seen.update(int(uid) for uid in uid_set.split(","))
+                    writer.write(f"{tag} OK STORE completed\r\n".encode())
+                elif command == "IDLE":
+                    await self._idle(tag, reader, writer)
+                else:
+                    writer.write(f"{tag} BAD Unsupported command\r\n".encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _idle(self, tag: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        queue: asyncio.Queue = asyncio.Queue()
+        self._idlers.add(queue)
+        writer.write(b"+ idling\r\n")
+        await writer.drain()
+        done = asyncio.create_task(reader.readline())
+        try:
+            while True:
+                waiter = asyncio.create_task(queue.get())
+                finished, _ = await asyncio.wait(
+                    {done, waiter}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if waiter in finished:
+                    writer.write(f"* {waiter.result()} EXISTS\r\n".encode())
+                    await writer.drain()
+                else:
+                    waiter.cancel()
+                    break
+        finally:
+            self._idlers.discard(queue)
+        writer.write(f"{tag} OK IDLE terminated\r\n".encode())
+
+
+async def _serve(port: int) -> None:
+    server = StubIMAPServer(port=port)
+    bound = await server.start()
+    print(f"[IMAP STUB] Listening on 127.0.0.1:{bound}")
+    server.deliver_text(
+        "Jane Recruiter <jane@example.com>",
+        "Interview Invitation",
+        "Hi Deniz,\n\nAre you available for a call on Thursday?\n\nBest,\nJane",
+    )
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a local IMAP stand-in server.")
+    parser.add_argument("--port", type=int, default=1143)
+    asyncio.run(_serve(parser.parse_args().port))
@@ -0,0 +1,271 @@
+"""Streaming MIME parsing and reply-chain stripping for inbound email."""
+
+import base64
+import binascii
+import quopri
+import re
+from email.header import decode_header, make_header
+from email.parser import BytesHeaderParser
+from email.utils import parseaddr
+from typing import Optional
+
+# Lines longer than this that are not being captured are dropped while
+# buffering — a MIME boundary line is always short, so nothing is lost.
+MAX_SKIPPED_LINE_BYTES = 64 * 1024
+MAX_HEADER_BYTES = 64 * 1024
+
+
+class ParsedEmail:
+    """Minimal view of an inbound email: sender, subject and plain-text body."""
+
+    def __init__(self, sender_name: str, sender_email: str, subject: str, body: str):
+        self.sender_name = sender_name
+        self.sender_email = sender_email
+        self.subject = subject
+        self.body = body
+
+    def to_dict(self) -> dict:
+        return {
+            "sender_name": self.sender_name,
+            "sender_email": self.sender_email,
+            "subject": self.subject,
+            "body": self.body,
+        }
+
+
+class _Part:
+    """State for the MIME part currently being read."""
+
+    def __init__(self, headers):
+        self.content_type = headers.get_content_type()
+        self.charset = headers.get_content_charset() or "utf-8"
+        self.encoding = (headers.get("Content-Transfer-Encoding") or "7bit").strip().lower()
+        self.boundary = headers.get_boundary()
+        disposition = (headers.get("Content-Disposition") or "").lower()
+        self.is_attachment = disposition.startswith("attachment")
+
+
+class StreamingMimeParser:
+    """Incremental MIME parser that keeps only the text body in memory.
+
+    Bytes are fed in arbitrary chunks (e.g. straight off an IMAP literal).
+    Only the first ``text/plain`` part (or ``text/html`` as a fallback) is
+    buffered, up to ``max_body_bytes``; attachments and other parts are
+    scanned line by line for boundaries and then discarded.
+    """
+
+    def __init__(self, max_body_bytes: int = 200_000):
+        self.max_body_bytes = max_body_bytes
+        self._pending = b""
+        self._state = "headers"
+        self._header_lines: list[bytes] = []
+        self._boundaries: list[bytes] = []
+        self._top_headers = None
+        self._part: Optional[_Part] = None
+        self._capturing: Optional[str] = None
+        self._captured: dict[str, list[bytes]] = {"text/plain": [], "text/html": []}
+        self._captured_size = 0
+        self.bytes_seen = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Consume the next chunk of the raw message."""
+        self.bytes_seen += len(chunk)
+        data = self._pending + chunk
+        lines = data.split(b"\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self._handle_line(line + b"\n")
+        if len(self._pending) > MAX_SKIPPED_LINE_BYTES:
+            # Overlong line (binary data): capture what fits, never buffer the rest
+            if self._state == "body" and self._capturing:
+                self._handle_line(self._pending)
+            self._pending = b""
+
+    def close(self) -> ParsedEmail:
+        """Flush buffered input and return the parsed message."""
+        if self._pending:
+            self._handle_line(self._pending)
+            self._pending = b""
+        if self._state == "headers" and self._header_lines:
+            self._start_part()
+        self._finish_part()
+
+        headers = self._top_headers
+        name, address = parseaddr(_decode_header(headers.get("From", "")) if headers else "")
+        subject = _decode_header(headers.get("Subject", "")) if headers else ""
+
+        body = "".join(
+            chunk.decode("utf-8", errors="replace") for chunk in self._captured["text/plain"]
+        )
+        if not body.strip() and self._captured["text/html"]:
+            html = "".join(
+                chunk.decode("utf-8", errors="replace") for chunk in self._captured["text/html"]
+            )
+            body = _html_to_text(html)
+
+        return ParsedEmail(
+            sender_name=name or address,
+            sender_email=address,
+            subject=subject,
+            body=body.strip(),
+        )
+
+    # ---- line state machine ----
+
+    def _handle_line(self, line: bytes) -> None:
+        if self._state == "headers":
+            if line.strip() == b"":
+                self._start_part()
+            elif sum(len(h) for h in self._header_lines) < MAX_HEADER_BYTES:
+                self._header_lines.append(line)
+            return
+
+        boundary_hit = self._match_boundary(line)
+        if boundary_hit is not None:
+            boundary, closing = boundary_hit
+            self._finish_part()
+            # Unwind to the matched multipart (handles sloppy nesting)
+            while self._boundaries and self._boundaries[-1] != boundary:
+                self._boundaries.pop()
+            if closing:
+                if self._boundaries:
+                    self._boundaries.pop()
+                self._state = "skip"
+            else:
+                self._state = "headers"
+                self._header_lines = []
+            return
+
+        if self._state == "body" and self._capturing:
+            if self._captured_size < self.max_body_bytes:
+                self._captured[self._capturing].append(line)
+                self._captured_size += len(line)
+
+    def _match_boundary(self, line: bytes) -> Optional[tuple[bytes, bool]]:
+        if not self._boundaries or not line.startswith(b"--"):
+            return None
+        stripped = line.rstrip(b"\r\n \t")
+        for boundary in reversed(self._boundaries):
+            if stripped == b"--" + boundary:
+                return boundary, False
+            if stripped == b"--" + boundary + b"--":
+                return boundary, True
+        return None
+
+    def _start_part(self) -> None:
+        headers = BytesHeaderParser().parsebytes(b"".join(self._header_lines) + b"\n")
+        self._header_lines = []
+        if self._top_headers is None:
+            self._top_headers = headers
+
+        part = _Part(headers)
+        if part.content_type.startswith("multipart/") and part.boundary:
+            self._boundaries.append(part.boundary.encode("latin-1"))
+            self._part = None
+            self._capturing = None
+            self._state = "skip"  # preamble until the first boundary
+            return
+
+        self._part = part
+        self._state = "body"
+        self._capturing = None
+        if not part.is_attachment and part.content_type in self._captured:
+            # Keep only the first part of each text flavour
+            if not self._captured[part.content_type]:
+                self._capturing = part.content_type
+
+    def _finish_part(self) -> None:
+        if self._part is not None and self._capturing:
+            raw = b"".join(self._captured[self._capturing])
+            text = _decode_body(raw, self._part.encoding, self._part.charset)
+            self._captured[self._capturing] = [text.encode("utf-8")]
+        self._part = None
+        self._capturing = None
+
+
+def _decode_body(raw: bytes, encoding: str, charset: str) -> str:
+    if encoding == "base64":
+        data = b"".join(raw.split())
+        # The capture cap may cut mid-quantum; decode only whole 4-byte groups
+        data = data[: len(data) - len(data) % 4]
+        try:
+            raw = base64.b64decode(data, validate=False)
+        except (binascii.Error, ValueError):
+            pass
+    elif encoding == "quoted-printable":
+        raw = quopri.decodestring(raw)
+    try:
+        return raw.decode(charset, errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
+
+
+def _decode_header(value: str) -> str:
+    try:
+        return str(make_header(decode_header(value)))
+    except (ValueError, LookupError):
+        return value
+
+
+def _html_to_text(html: str) -> str:
+    html = re.sub(r"(?is)<(script|style).*?</\1>", "", html)
+    html = re.sub(r"(?i)<br\s*/?>|</p>|</div>", "\n", html)
+    text = re.sub(r"<[^>]+>", "", html)
+    return re.sub(r"\n{3,}", "\n\n", text)
+
+
+# ---- reply-chain stripping ----
+
+_REPLY_HEADER_PATTERNS = [
+    re.compile(r"^On .{0,200}wrote:\s*$", re.I),
+    re.compile(r"^.{0,200}tarihinde .{0,200}yazdı:\s*$", re.I),
+    re.compile(r"^-{2,}\s*Original Message\s*-{2,}\s*$", re.I),
+    re.compile(r"^(From|Kimden):\s.+$", re.I),
+]
+
+# Forwarded content (e.g. a job description) is part of the sender's message,
+# so a forward marker and the header block after it are kept, not cut
+_FORWARD_MARKER = re.compile(
+    r"^(-{2,}\s*(Forwarded message|İletilen ileti)\s*-{2,}|Begin forwarded message:)\s*$", re.I
+)
+_SEPARATOR_RULE = re.compile(r"^(_{10,}|-{10,})?$")
+_FORWARD_HEADER = re.compile(r"^(From|To|Cc|Date|Sent|Subject|Kimden|Kime|Tarih|Konu):\s", re.I)
+
+
+def strip_quoted_reply(text: str) -> str:
+    """Remove quoted reply chains from an email body.
+
+    Cuts everything from the first reply header ("On ... wrote:",
+    "-----Original Message-----", an Outlook "From:" block, ...) and drops
+    ``>``-quoted lines, so only the sender's new text is kept. Forwarded
+    messages are not quotes: they are kept along with their headers.
+    """
+    kept = []
+    lines = text.splitlines()
+    in_forward_headers = False
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if _FORWARD_MARKER.match(stripped):
+            in_forward_headers = True
+            kept.append(line)
+            continue
+        if in_forward_headers:
+            if _FORWARD_HEADER.match(stripped):
+                kept.append(line)
+                continue
+            in_forward_headers = False
+        if any(p.match(stripped) for p in _REPLY_HEADER_PATTERNS):
+            # An Outlook "From:" line only starts a quote when followed by headers
+            if stripped.lower().startswith(("from:", "kimden:")):
+                following = " ".join(lines[i + 1 : i + 4]).lower()
+                if not any(h in following for h in ("sent:", "to:", "subject:", "date:")):
+                    kept.append(line)
+                    continue
+            break
+        if stripped.startswith(">"):
+            continue
+        kept.append(line)
+    # An Outlook underscore rule that introduced the cut reply block
+    while kept and _SEPARATOR_RULE.match(kept[-1].strip()):
+        kept.pop()
+    return "\n".join(kept).strip()
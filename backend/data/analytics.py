@@ -0,0 +1,245 @@
+"""Incrementally maintained analytics rollups over evaluation logs.
+
+Every appended log updates one hourly and one daily bucket: counters, score
+sums and fixed-bucket histograms. Reading stats is O(buckets) and never
+touches the logs themselves.
+"""
+
+import time
+from bisect import bisect_right, insort
+from datetime import datetime
+from typing import Callable, Iterable, Optional
+
+from config import settings
+
+CRITERIA = ("tone", "clarity", "completeness", "safety", "relevance", "overall")
+
+# Histogram bucket bounds: bucket i counts values below bounds[i], the last
+# bucket everything at or above bounds[-1]
+SCORE_BUCKETS = tuple(range(1, 11))
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 4000, 8000, 16000)
+REVISION_LABELS = ("0", "1", "2", "3+")
+
+GRANULARITIES = {
+    "hour": ("%Y-%m-%dT%H", settings.ANALYTICS_HOURLY_BUCKETS),
+    "day": ("%Y-%m-%d", settings.ANALYTICS_DAILY_BUCKETS),
+}
+
+
+def histogram_labels(bounds: tuple, unit: str = "") -> list[str]:
+    labels = [f"<{bounds[0]}{unit}"]
+    labels += [f"{lo}–{hi}{unit}" for lo, hi in zip(bounds, bounds[1:])]
+    labels.append(f"≥{bounds[-1]}{unit}")
+    return labels
+
+
+class StageTimer:
+    """Measures wall time per pipeline stage; starting a stage ends the previous one."""
+
+    def __init__(self, on_stage: Optional[Callable[[str], None]] = None):
+        self.on_stage = on_stage
+        self.latency_ms: dict[str, float] = {}
+        self._stage: Optional[str] = None
+        self._started = 0.0
+
+    def start(self, stage: str) -> None:
+        self._close()
+        if self.on_stage is not None:
+            self.on_stage(stage)
+        self._stage = stage
+        self._started = time.perf_counter()
+
+    def stop(self) -> dict[str, float]:
+        """End the current stage and return latency per stage in milliseconds."""
+        self._close()
+        return self.latency_ms
+
+    def _close(self) -> None:
+        if self._stage is not None:
+            elapsed = (time.perf_counter() - self._started) * 1000
+            previous = self.latency_ms.get(self._stage, 0.0)
+            self.latency_ms[self._stage] = round(previous + elapsed, 1)
+            self._stage = None
+
+
+class Rollup:
+    """Aggregates for one time bucket."""
+
+    __slots__ = (
+        "count",
+        "statuses",
+        "evaluated",
+        "score_sums",
+        "score_histogram",
+        "revision_histogram",
+        "flagged_categories",
+        "stage_latency",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.statuses: dict[str, int] = {}
+        self.evaluated = 0
+        self.score_sums = dict.fromkeys(CRITERIA, 0.0)
+        self.score_histogram = [0] * (len(SCORE_BUCKETS) + 1)
+        self.revision_histogram = [0] * len(REVISION_LABELS)
+        self.flagged_categories: dict[str, int] = {}
+        # stage -> [count, sum_ms, histogram]
+        self.stage_latency: dict[str, list] = {}
+
+    def add(self, log: dict) -> None:
+        self.count += 1
+        status = log.get("status", "")
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+
+        evaluation = log.get("evaluation")
+        if evaluation:
+            self.evaluated += 1
+            for criterion in CRITERIA:
+                self.score_sums[criterion] += evaluation.get(f"{criterion}_score", 0)
+            self.score_histogram[bisect_right(SCORE_BUCKETS, evaluation["overall_score"])] += 1
+            self.revision_histogram[
+                min(log.get("revision_count", 0), len(REVISION_LABELS) - 1)
+            ] += 1
+
+        confidence = log.get("confidence")
+        if status != "approved" and confidence:
+            category = confidence.get("category", "unknown")
+            self.flagged_categories[category] = self.flagged_categories.get(category, 0) + 1
+
+        for stage, ms in (log.get("stage_latency_ms") or {}).items():
+            stats = self.stage_latency.get(stage)
+            if stats is None:
+                stats = self.stage_latency[stage] = [0, 0.0, [0] * (len(LATENCY_BUCKETS_MS) + 1)]
+            stats[0] += 1
+            stats[1] += ms
+            stats[2][bisect_right(LATENCY_BUCKETS_MS, ms)] += 1
+
+    def merge(self, other: "Rollup") -> None:
+        self.count += other.count
+        self.evaluated += other.evaluated
+        for status, n in other.statuses.items():
+            self.statuses[status] = self.statuses.get(status, 0) + n
+        for criterion in CRITERIA:
+            self.score_sums[criterion] += other.score_sums[criterion]
+        self.score_histogram = [a + b for a, b in zip(self.score_histogram, other.score_histogram)]
+        self.revision_histogram = [
+            a + b for a, b in zip(self.revision_histogram, other.revision_histogram)
+        ]
+        for category, n in other.flagged_categories.items():
+            self.flagged_categories[category] = self.flagged_categories.get(category, 0) + n
+        for stage, (n, total_ms, histogram) in other.stage_latency.items():
+            stats = self.stage_latency.setdefault(
+                stage, [0, 0.0, [0] * (len(LATENCY_BUCKETS_MS) + 1)]
+            )
+            stats[0] += n
+            stats[1] += total_ms
+            stats[2] = [a + b for a, b in zip(stats[2], histogram)]
+
+    def to_dict(self) -> dict:
+        evaluated = self.evaluated or 1
+        return {
+            "count": self.count,
+            "statuses": self.statuses,
+            "approval_rate": round(self.statuses.get("approved", 0) / self.count, 4)
+            if self.count
+            else None,
+            "evaluated": self.evaluated,
+            "avg_scores": {
+                c: round(total / evaluated, 2) if self.evaluated else None
+                for c, total in self.score_sums.items()
+            },
+            "score_histogram": self.score_histogram,
+            "revision_histogram": self.revision_histogram,
+            "flagged_categories": self.flagged_categories,
+            "stage_latency": {
+                stage: {"count": n, "avg_ms": round(total_ms / n, 1), "histogram": histogram}
+                for stage, (n, total_ms, histogram) in self.stage_latency.items()
+            },
+        }
+
+
+class Analytics:
+    """Hourly and daily rollups, each capped to a fixed number of recent buckets.
+
+    Logs may arrive out of time order (archive restores, several profiles
+    appending), so bucket keys are kept sorted and the oldest bucket is the
+    one evicted, wherever the newest log falls.
+    """
+
+    def __init__(self):
+        self._rollups: dict[str, dict[str, Rollup]] = {
+            granularity: {} for granularity in GRANULARITIES
+        }
+        # Sorted bucket keys per granularity; key formats sort chronologically
+        self._keys: dict[str, list[str]] = {granularity: [] for granularity in GRANULARITIES}
+
+    def record(self, log: dict) -> None:
+        """Fold one evaluation log (cached dict form) into its hour and day buckets."""
+        timestamp = datetime.fromisoformat(log["timestamp"])
+        for granularity, (key_format, max_buckets) in GRANULARITIES.items():
+            buckets = self._rollups[granularity]
+            keys = self._keys[granularity]
+            key = timestamp.strftime(key_format)
+            rollup = buckets.get(key)
+            if rollup is None:
+                if len(keys) >= max_buckets and key < keys[0]:
+                    # Older than every retained bucket: it would be evicted at once
+                    continue
+                rollup = buckets[key] = Rollup()
+                insort(keys, key)
+                while len(keys) > max_buckets:
+                    del buckets[keys.pop(0)]
+            rollup.add(log)
+
+    def get_stats(
+        self,
+        granularity: str = "hour",
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> dict:
+        """Return per-bucket rollups plus their combined totals.
+
+        ``since``/``until`` may be any ISO timestamp or prefix of one
+        (e.g. '2025-06-01' or '2025-06-01T09').
+        """
+        totals = Rollup()
+        buckets = []
+        rollups = self._rollups[granularity]
+        for key in self._keys[granularity]:
+            rollup = rollups[key]
+            # Compare at the coarser of the two precisions, so a bucket is kept
+            # whenever it overlaps the requested range
+            if since and key[: len(since)] < since[: len(key)]:
+                continue
+            if until and key[: len(until)] > until[: len(key)]:
+                continue
+            totals.merge(rollup)
+            buckets.append({"bucket": key, **rollup.to_dict()})
+        return {
+            "granularity": granularity,
+            "criteria": CRITERIA,
+            "histogram_labels": {
+                "score": histogram_labels(SCORE_BUCKETS),
+                "revisions": REVISION_LABELS,
+                "latency": histogram_labels(LATENCY_BUCKETS_MS, " ms"),
+            },
+            "totals": totals.to_dict(),
+            "buckets": buckets,
+        }
+
+    def rebuild(self, logs: Iterable[dict]) -> None:
+        """Recompute every rollup from ``logs``, e.g. after some logs were removed."""
+        self.clear()
+        for log in logs:
+            self.record(log)
+
+    def clear(self) -> None:
+        for buckets in self._rollups.values():
+            buckets.clear()
+        for keys in self._keys.values():
+            keys.clear()
+
+
+# Singleton instance
+analytics = Analytics()
@@ -0,0 +1,185 @@
+"""In-memory evaluation log store, partitioned per candidate profile."""
+
+import heapq
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime, timedelta
+from itertools import count, islice
+from typing import Iterable, Iterator, Optional
+
+from config import settings
+from data.analytics import analytics
+from data.profile import DEFAULT_PROFILE_ID
+from data.search import log_index
+from events import event_hub
+from models.schemas import EvaluationLog
+
+# Sequential log ids, unique across profiles and also used as search doc ids
+_log_ids = count(1)
+
+
+class EvaluationLogStore:
+    """Evaluation logs of one profile, kept in their dumped dict form.
+
+    The oldest entries are dropped beyond ``LOG_MAX_ENTRIES``; every change
+    is mirrored into the full-text search index and published to live
+    dashboards.
+    """
+
+    def __init__(self, profile_id: str = DEFAULT_PROFILE_ID, max_entries: int = settings.LOG_MAX_ENTRIES):
+        self.profile_id = profile_id
+        # Logs are dumped once on append; /api/logs, search, analytics and
+        # archive exports all read these dicts, so no model copy is kept
+        self.logs: deque[dict] = deque(maxlen=max_entries or None)
+
+    def __len__(self) -> int:
+        return len(self.logs)
+
+    def append(self, log_entry: EvaluationLog, employer_message: str = "") -> dict:
+        """Store an evaluation log as a dict, and index it.
+
+        The log model itself only keeps ``message_id``; the employer message is
+        attached to the stored dict by reference, so the text is held once.
+        """
+        log_dict = self._add(log_entry, employer_message)
+        event_hub.publish("log", log_dict, self.profile_id)
+        return log_dict
+
+    def _add(self, log_entry: EvaluationLog, employer_message: str) -> dict:
+        log_entry.log_id = next(_log_ids)
+        log_entry.profile_id = self.profile_id
+        if len(self.logs) == self.logs.maxlen:
+            # The deque is about to drop its oldest entry
+            log_index.remove(self.logs[0]["log_id"])
+        log_dict = log_entry.model_dump()
+        log_dict["employer_message"] = employer_message
+        self.logs.append(log_dict)
+        analytics.record(log_dict)
+        log_index.add(
+            log_entry.log_id,
+            log_dict,
+            created_at=datetime.fromisoformat(log_entry.timestamp).timestamp(),
+            sender_email=log_entry.sender_email,
+            status=log_entry.status,
+            profile_id=self.profile_id,
+        )
+        return log_dict
+
+    def iter_batches(
+        self, since: Optional[str], until: str, batch_size: int
+    ) -> Iterator[list[dict]]:
+        """Yield stored log dicts with ``since < timestamp <= until`` in batches.
+
+        Each batch is located afresh from the last exported log id, so the
+        store may be appended to or compacted between batches.
+        """
+        start = (
+            bisect_right(self.logs, since, key=lambda log: log["timestamp"]) if since else 0
+        )
+        while True:
+            batch = [
+                log
+                for log in islice(self.logs, start, start + batch_size)
+                if log["timestamp"] <= until
+            ]
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            start = bisect_right(self.logs, batch[-1]["log_id"], key=lambda log: log["log_id"])
+
+    def restore(self, records: Iterable[dict]) -> tuple[int, int]:
+        """Bulk-load exported log dicts, e.g. after a restart.
+
+        Records are expected oldest first; one not newer than the latest stored
+        log is skipped, which keeps the store in time order and makes
+        re-importing the same archive a no-op. Restored logs get fresh log ids
+        and drop ``message_id`` (conversation entry ids do not survive a
+        restart); dashboards receive a single reset instead of one event per log.
+
+        Returns:
+            (restored, skipped) counts.
+        """
+        restored = skipped = 0
+        for record in records:
+            if self.logs and record.get("timestamp", "") <= self.logs[-1]["timestamp"]:
+                skipped += 1
+                continue
+            fields = {
+                key: value
+                for key, value in record.items()
+                if key not in ("log_id", "profile_id", "message_id", "employer_message")
+            }
+            self._add(EvaluationLog(**fields), record.get("employer_message") or "")
+            restored += 1
+        if restored:
+            event_hub.publish("reset", {"scope": "logs"}, self.profile_id)
+        return restored, skipped
+
+    def compact(self, now: Optional[datetime] = None) -> int:
+        """Drop logs older than LOG_MAX_AGE_DAYS; returns how many were removed."""
+        if not settings.LOG_MAX_AGE_DAYS:
+            return 0
+        cutoff = ((now or datetime.now()) - timedelta(days=settings.LOG_MAX_AGE_DAYS)).isoformat()
+        removed = 0
+        while self.logs and self.logs[0]["timestamp"] < cutoff:
+            log_index.remove(self.logs.popleft()["log_id"])
+            removed += 1
+        if removed:
+            event_hub.publish("reset", {"scope": "logs"}, self.profile_id)
+        return removed
+
+    def clear(self) -> None:
+        for log_dict in self.logs:
+            log_index.remove(log_dict["log_id"])
+        self.logs.clear()
+        event_hub.publish("reset", {"scope": "logs"}, self.profile_id)
+
+
+class LogRegistry:
+    """One EvaluationLogStore per candidate profile, created on first use."""
+
+    def __init__(self):
+        self._stores: dict[str, EvaluationLogStore] = {}
+
+    def get(self, profile_id: str = DEFAULT_PROFILE_ID) -> EvaluationLogStore:
+        store = self._stores.get(profile_id)
+        if store is None:
+            store = self._stores[profile_id] = EvaluationLogStore(profile_id)
+        return store
+
+    def find(self, profile_id: str) -> Optional[EvaluationLogStore]:
+        """The profile's log store if it has one, without creating it (for read paths)."""
+        return self._stores.get(profile_id)
+
+    def all(self) -> list[EvaluationLogStore]:
+        return list(self._stores.values())
+
+    def newest_first(self, profile_id: Optional[str] = None) -> list[dict]:
+        """Stored log dicts, newest first, for one profile or merged across all."""
+        if profile_id is not None:
+            store = self._stores.get(profile_id)
+            return list(reversed(store.logs)) if store else []
+        # Log ids are global and increasing, so merging by id keeps time order
+        return list(
+            heapq.merge(
+                *(reversed(store.logs) for store in self._stores.values()),
+                key=lambda log: log["log_id"],
+                reverse=True,
+            )
+        )
+
+    def rebuild_analytics(self) -> None:
+        """Recompute the (cross-profile) analytics rollups from the logs still stored."""
+        analytics.rebuild(log for store in self._stores.values() for log in store.logs)
+
+    def total(self, profile_id: Optional[str] = None) -> int:
+        if profile_id is not None:
+            store = self._stores.get(profile_id)
+            return len(store) if store else 0
+        return sum(len(store) for store in self._stores.values())
+
+
+# Singleton instance
+evaluation_logs = LogRegistry()
@@ -1,26 +1,65 @@
 """In-memory conversation history store — tracks messages per employer (by email)."""
 
+import sys
+import time
+from bisect import bisect_left, bisect_right
 from datetime import datetime
-from typing import Optional
+from itertools import count
+from typing import Iterable, Iterator, Optional
+
+from config import settings
+from data.profile import DEFAULT_PROFILE_ID
+from data.search import conversation_index
+from events import event_hub
+
+# Run age-based compaction once every this many add_entry calls
+COMPACTION_INTERVAL = 1000
+
+# Entry ids are unique across every profile's memory (they double as search doc ids)
+_entry_ids = count(1)
 
 
 class ConversationEntry:
-    """Single message-response pair in a conversation."""
+    """Single message-response pair in a conversation.
+
+    Uses ``__slots__`` and an epoch timestamp to keep per-entry overhead low;
+    status values are interned so every entry shares the same few strings.
+    """
+
+    __slots__ = (
+        "entry_id",
+        "employer_message",
+        "agent_response",
+        "status",
+        "created_at",
+        "subject",
+    )
 
     def __init__(
         self,
         employer_message: str,
         agent_response: str,
         status: str,
-        timestamp: Optional[str] = None,
+        created_at: Optional[float] = None,
+        entry_id: int = 0,
+        subject: str = "",
     ):
+        self.entry_id = entry_id
         self.employer_message = employer_message
         self.agent_response = agent_response
-        self.status = status
-        self.timestamp = timestamp or datetime.now().isoformat()
+        self.status = sys.intern(status)
+        self.created_at = created_at if created_at is not None else time.time()
+        self.subject = subject
+
+    @property
+    def timestamp(self) -> str:
+        """ISO-8601 timestamp (local time), rendered on demand."""
+        return datetime.fromtimestamp(self.created_at).isoformat()
 
     def to_dict(self) -> dict:
         return {
+            "message_id": self.entry_id,
+            "subject": self.subject,
             "employer_message": self.employer_message,
             "agent_response": self.agent_response,
             "status": self.status,
@@ -28,15 +67,37 @@ class ConversationEntry:
         }
 
 
+def _to_epoch(iso_timestamp: str) -> float:
+    return datetime.fromisoformat(iso_timestamp).timestamp()
+
+
+def _drop_oldest(entries: list[ConversationEntry], n: int) -> None:
+    """Remove the first ``n`` entries, keeping the search index in sync."""
+    for entry in entries[:n]:
+        conversation_index.remove(entry.entry_id)
+    del entries[:n]
+
+
 class ConversationMemory:
     """In-memory conversation history store, keyed by sender email.
 
     Tracks all previous interactions with each employer so the Career Agent
-    can maintain context continuity across messages.
+    can maintain context continuity across messages. A retention policy caps
+    entries per sender and (optionally) drops entries older than a maximum age.
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_entries_per_sender: int = settings.MEMORY_MAX_ENTRIES_PER_SENDER,
+        max_age_days: float = settings.MEMORY_MAX_AGE_DAYS,
+        profile_id: str = DEFAULT_PROFILE_ID,
+    ):
+        self.profile_id = profile_id
         self._store: dict[str, list[ConversationEntry]] = {}
+        # Per-employer summaries, maintained incrementally on add_entry
+        self._summaries: dict[str, dict] = {}
+        self.max_entries_per_sender = max_entries_per_sender
+        self.max_age_days = max_age_days
 
     def add_entry(
         self,
@@ -44,24 +105,189 @@ class ConversationMemory:
         employer_message: str,
         agent_response: str,
         status: str,
-    ) -> None:
-        """Record a new message-response pair for an employer."""
-        if sender_email not in self._store:
-            self._store[sender_email] = []
-
-        self._store[sender_email].append(
-            ConversationEntry(
-                employer_message=employer_message,
-                agent_response=agent_response,
-                status=status,
+        subject: str = "",
+    ) -> ConversationEntry:
+        """Record a new message-response pair for an employer.
+
+        Returns the stored entry; its ``entry_id`` can be used to reference the
+        message (e.g. from evaluation logs) instead of copying it.
+        """
+        entry = ConversationEntry(
+            employer_message=employer_message,
+            agent_response=agent_response,
+            status=status,
+            entry_id=next(_entry_ids),
+            subject=subject,
+        )
+        summary = self._insert(sender_email, entry)
+        event_hub.publish(
+            "conversation",
+            {"summary": dict(summary), "entry": entry.to_dict()},
+            self.profile_id,
+        )
+
+        # Age-based retention runs periodically rather than on every insert
+        if self.max_age_days and entry.entry_id % COMPACTION_INTERVAL == 0:
+            self.compact()
+
+        return entry
+
+    def _insert(self, sender_email: str, entry: ConversationEntry) -> dict:
+        """Append, index and cap an entry; returns the sender's updated summary."""
+        entries = self._store.setdefault(sender_email, [])
+        entries.append(entry)
+        conversation_index.add(
+            entry.entry_id,
+            (sender_email, entry),
+            created_at=entry.created_at,
+            sender_email=sender_email,
+            status=entry.status,
+            profile_id=self.profile_id,
+        )
+
+        # Per-sender cap: drop the oldest entries beyond the limit
+        if self.max_entries_per_sender and len(entries) > self.max_entries_per_sender:
+            _drop_oldest(entries, len(entries) - self.max_entries_per_sender)
+
+        summary = self._summaries.setdefault(
+            sender_email, {"email": sender_email, "message_count": 0}
+        )
+        summary["message_count"] = len(entries)
+        summary["last_timestamp"] = entry.timestamp
+        summary["last_status"] = entry.status
+        if entry.subject:
+            summary["last_subject"] = entry.subject
+        else:
+            summary.setdefault("last_subject", "")
+        return summary
+
+    def iter_batches(
+        self, since: Optional[str], until: str, batch_size: int
+    ) -> Iterator[list[dict]]:
+        """Yield flat entry records with ``since < timestamp <= until`` in batches.
+
+        Senders are exported one after another, each oldest first. Positions
+        are re-found from the last exported entry id for every batch, so
+        entries may be added or compacted between batches.
+        """
+        since_epoch = _to_epoch(since) if since else None
+        until_epoch = _to_epoch(until)
+        batch: list[dict] = []
+        for sender_email in list(self._store):
+            last_id = None
+            while True:
+                entries = self._store.get(sender_email, [])
+                if last_id is not None:
+                    start = bisect_right(entries, last_id, key=lambda e: e.entry_id)
+                elif since_epoch is not None:
+                    start = bisect_right(entries, since_epoch, key=lambda e: e.created_at)
+                else:
+                    start = 0
+                room = batch_size - len(batch)
+                chunk = [e for e in entries[start : start + room] if e.created_at <= until_epoch]
+                for entry in chunk:
+                    batch.append(
+                        {"profile_id": self.profile_id, "sender_email": sender_email, **entry.to_dict()}
+                    )
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+                if len(chunk) < room:
+                    # This sender is exhausted (or the rest is past ``until``)
+                    break
+                last_id = chunk[-1].entry_id
+        if batch:
+            yield batch
+
+    def restore(self, records: Iterable[dict]) -> tuple[int, int]:
+        """Bulk-load exported entry records, keeping their original timestamps.
+
+        A record not newer than its sender's latest stored entry is skipped, so
+        each history stays in time order and re-importing the same archive is
+        a no-op. Restored entries get fresh entry ids; dashboards receive a
+        single reset rather than one event per entry.
+
+        Returns:
+            (restored, skipped) counts.
+        """
+        restored = skipped = 0
+        for record in records:
+            sender_email = record["sender_email"]
+            created_at = _to_epoch(record["timestamp"])
+            entries = self._store.get(sender_email)
+            if entries and created_at <= entries[-1].created_at:
+                skipped += 1
+                continue
+            entry = ConversationEntry(
+                employer_message=record.get("employer_message") or "",
+                agent_response=record.get("agent_response") or "",
+                status=record.get("status") or "",
+                created_at=created_at,
+                entry_id=next(_entry_ids),
+                subject=record.get("subject") or "",
             )
+            self._insert(sender_email, entry)
+            restored += 1
+        if restored:
+            event_hub.publish("reset", {"scope": "conversations"}, self.profile_id)
+        return restored, skipped
+
+    def get_entry(self, sender_email: str, entry_id: int) -> Optional[ConversationEntry]:
+        """Look up a stored entry by id (None if it was compacted away)."""
+        entries = self._store.get(sender_email, [])
+        # ids are assigned monotonically, so each sender's list is sorted by id
+        i = bisect_left(entries, entry_id, key=lambda e: e.entry_id)
+        if i < len(entries) and entries[i].entry_id == entry_id:
+            return entries[i]
+        return None
+
+    def get_history(
+        self,
+        sender_email: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+    ) -> list[dict]:
+        """Get the conversation history for an employer.
+
+        Args:
+            sender_email: Employer email address.
+            offset: Number of (filtered) entries to skip from the start.
+            limit: Maximum number of entries to return (None = all).
+            since: Only include entries with timestamp >= this ISO timestamp.
+            until: Only include entries with timestamp <= this ISO timestamp.
+        """
+        entries = self._store.get(sender_email, [])
+        if since or until:
+            entries = self._slice_by_time(entries, since, until)
+        end = None if limit is None else offset + limit
+        return [entry.to_dict() for entry in entries[offset:end]]
+
+    @staticmethod
+    def _slice_by_time(
+        entries: list[ConversationEntry], since: Optional[str], until: Optional[str]
+    ) -> list[ConversationEntry]:
+        # Entries are appended in time order, so created_at is sorted
+        start = bisect_left(entries, _to_epoch(since), key=lambda e: e.created_at) if since else 0
+        end = (
+            bisect_right(entries, _to_epoch(until), key=lambda e: e.created_at)
+            if until
+            else len(entries)
         )
+        return entries[start:end]
 
-    def get_history(self, sender_email: str) -> list[dict]:
-        """Get the full conversation history for an employer."""
-        if sender_email not in self._store:
-            return []
-        return [entry.to_dict() for entry in self._store[sender_email]]
+    def count(self, sender_email: str) -> int:
+        """Number of stored exchanges with an employer."""
+        return len(self._store.get(sender_email, []))
+
+    def get_index(self) -> list[dict]:
+        """Get per-employer summaries, most recently active first."""
+        return sorted(
+            (dict(summary) for summary in self._summaries.values()),
+            key=lambda s: s["last_timestamp"],
+            reverse=True,
+        )
 
     def get_context_prompt(self, sender_email: str) -> str:
         """Build a context string from conversation history for the Career Agent.
@@ -93,10 +319,70 @@ class ConversationMemory:
             result[email] = [e.to_dict() for e in entries]
         return result
 
+    def compact(self, now: Optional[float] = None) -> dict:
+        """Apply the retention policy to every sender.
+
+        Drops entries older than ``max_age_days`` (when set) and trims each
+        sender to ``max_entries_per_sender``. Senders left without entries are
+        removed along with their summaries.
+
+        Returns:
+            dict with the number of entries and senders removed.
+        """
+        now = now if now is not None else time.time()
+        cutoff = now - self.max_age_days * 86400 if self.max_age_days else None
+        removed_entries = 0
+        removed_senders = 0
+
+        for email in list(self._store):
+            entries = self._store[email]
+            before = len(entries)
+            if cutoff is not None:
+                _drop_oldest(entries, bisect_left(entries, cutoff, key=lambda e: e.created_at))
+            if self.max_entries_per_sender and len(entries) > self.max_entries_per_sender:
+                _drop_oldest(entries, len(entries) - self.max_entries_per_sender)
+            removed_entries += before - len(entries)
+
+            if not entries:
+                del self._store[email]
+                self._summaries.pop(email, None)
+                removed_senders += 1
+            else:
+                self._summaries[email]["message_count"] = len(entries)
+
+        if removed_entries:
+            event_hub.publish("reset", {"scope": "conversations"}, self.profile_id)
+        return {"removed_entries": removed_entries, "removed_senders": removed_senders}
+
     def clear(self) -> None:
         """Clear all conversation history."""
+        for entries in self._store.values():
+            _drop_oldest(entries, len(entries))
         self._store.clear()
+        self._summaries.clear()
+        event_hub.publish("reset", {"scope": "conversations"}, self.profile_id)
+
+
+class MemoryRegistry:
+    """One ConversationMemory per candidate profile, created on first use."""
+
+    def __init__(self):
+        self._memories: dict[str, ConversationMemory] = {}
+
+    def get(self, profile_id: str = DEFAULT_PROFILE_ID) -> ConversationMemory:
+        store = self._memories.get(profile_id)
+        if store is None:
+            store = self._memories[profile_id] = ConversationMemory(profile_id=profile_id)
+        return store
+
+    def find(self, profile_id: str) -> Optional[ConversationMemory]:
+        """The profile's memory if it has one, without creating it (for read paths)."""
+        return self._memories.get(profile_id)
+
+    def all(self) -> list[ConversationMemory]:
+        return list(self._memories.values())
 
 
-# Singleton instance
-memory = ConversationMemory()
+# Singleton instances; ``memory`` is the default profile's partition
+memories = MemoryRegistry()
+memory = memories.get(DEFAULT_PROFILE_ID)
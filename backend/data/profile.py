@@ -1,4 +1,14 @@
-"""Static CV/Profile data for Deniz Büyükşahin — used as context for the Career Agent."""
+"""Candidate profiles — the built-in CV of Deniz Büyükşahin plus profiles loaded from PROFILES_DIR."""
+
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+from config import settings
+
+DEFAULT_PROFILE_ID = "default"
+PROFILE_ID_PATTERN = re.compile(r"[a-z0-9][a-z0-9_-]{0,63}")
 
 PROFILE_DATA = {
     "name": "Deniz Büyükşahin",
@@ -141,51 +151,140 @@ PROFILE_DATA = {
 }
 
 
-def get_profile_as_text() -> str:
-    """Format the profile data as a readable text string for prompt injection."""
-    p = PROFILE_DATA
-    lines = [
-        f"# {p['name']}",
-        f"Email: {p['email']} | Phone: {p['phone']} | Location: {p['location']}",
-        f"GitHub: {p['github']} | LinkedIn: {p['linkedin']}",
-        "",
-        "## Profile Summary",
-        p["profile_summary"],
-        "",
-        "## Work Experience",
-    ]
-
-    for exp in p["work_experience"]:
-        lines.append(f"\n### {exp['role']} at {exp['company']} ({exp['period']})")
-        for h in exp["highlights"]:
-            lines.append(f"  - {h}")
-
-    lines.append("\n## Education")
-    for edu in p["education"]:
-        gpa_str = f" — GPA: {edu['gpa']}" if "gpa" in edu else ""
-        lines.append(f"  - {edu['degree']}, {edu['institution']} ({edu['period']}){gpa_str}")
-
-    lines.append("\n## Technical Skills")
-    for category, skills in p["technical_skills"].items():
-        lines.append(f"  - {category.replace('_', ' ').title()}: {skills}")
-
-    lines.append("\n## Certifications")
-    for cert in p["certifications"]:
-        lines.append(f"  - {cert}")
-
-    lines.append("\n## Projects")
-    for proj in p["projects"]:
-        lines.append(f"\n### {proj['name']}")
-        lines.append(f"  {proj['description']}")
-
-    lines.append("\n## Languages")
-    for lang, level in p["languages"].items():
-        lines.append(f"  - {lang}: {level}")
-
-    lines.append("\n## Organizations & Volunteering")
-    for org in p["organizations"]:
-        lines.append(f"  - {org}")
-    for vol in p["volunteering"]:
-        lines.append(f"  - {vol['role']} at {vol['organization']} ({vol['period']}): {vol['description']}")
+def get_profile_as_text(profile: Optional[dict] = None) -> str:
+    """Format profile data as a readable text string for prompt injection.
+
+    Only ``name`` is required; sections missing from a profile are skipped.
+    Defaults to the built-in PROFILE_DATA.
+    """
+    p = profile if profile is not None else PROFILE_DATA
+    contact = " | ".join(
+        f"{label}: {p[key]}"
+        for label, key in (("Email", "email"), ("Phone", "phone"), ("Location", "location"))
+        if p.get(key)
+    )
+    links = " | ".join(
+        f"{label}: {p[key]}"
+        for label, key in (("GitHub", "github"), ("LinkedIn", "linkedin"))
+        if p.get(key)
+    )
+    lines = [f"# {p['name']}"] + [line for line in (contact, links) if line]
+
+    if p.get("profile_summary"):
+        lines += ["", "## Profile Summary", p["profile_summary"]]
+
+    if p.get("work_experience"):
+        lines += ["", "## Work Experience"]
+        for exp in p["work_experience"]:
+            lines.append(f"\n### {exp['role']} at {exp['company']} ({exp['period']})")
+            for h in exp.get("highlights", []):
+                lines.append(f"  - {h}")
+
+    if p.get("education"):
+        lines.append("\n## Education")
+        for edu in p["education"]:
+            gpa_str = f" — GPA: {edu['gpa']}" if "gpa" in edu else ""
+            lines.append(f"  - {edu['degree']}, {edu['institution']} ({edu['period']}){gpa_str}")
+
+    if p.get("technical_skills"):
+        lines.append("\n## Technical Skills")
+        for category, skills in p["technical_skills"].items():
+            lines.append(f"  - {category.replace('_', ' ').title()}: {skills}")
+
+    if p.get("certifications"):
+        lines.append("\n## Certifications")
+        for cert in p["certifications"]:
+            lines.append(f"  - {cert}")
+
+    if p.get("projects"):
+        lines.append("\n## Projects")
+        for proj in p["projects"]:
+            lines.append(f"\n### {proj['name']}")
+            lines.append(f"  {proj['description']}")
+
+    if p.get("languages"):
+        lines.append("\n## Languages")
+        for lang, level in p["languages"].items():
+            lines.append(f"  - {lang}: {level}")
+
+    if p.get("organizations") or p.get("volunteering"):
+        lines.append("\n## Organizations & Volunteering")
+        for org in p.get("organizations", []):
+            lines.append(f"  - {org}")
+        for vol in p.get("volunteering", []):
+            lines.append(
+                f"  - {vol['role']} at {vol['organization']} ({vol['period']}): {vol['description']}"
+            )
 
     return "\n".join(lines)
+
+
+class ProfileNotFoundError(KeyError):
+    """Raised when a profile id has no built-in entry or profile file."""
+
+
+class ProfileRegistry:
+    """Resolves profile ids to candidate profile data.
+
+    The built-in PROFILE_DATA is served as ``DEFAULT_PROFILE_ID``; every other
+    profile is a ``<profile_id>.json`` file (same shape as PROFILE_DATA) in
+    ``PROFILES_DIR``. Files are read on demand, so the directory can hold many
+    candidates without loading them all; ``version()`` changes whenever a file
+    is edited, letting caches of derived objects notice. A profile may set
+    ``sender_email`` to send its replies from that address instead of
+    ``FROM_EMAIL``.
+    """
+
+    def __init__(self, directory: str = settings.PROFILES_DIR):
+        self.directory = Path(directory)
+
+    def _path(self, profile_id: str) -> Path:
+        if not PROFILE_ID_PATTERN.fullmatch(profile_id):
+            raise ProfileNotFoundError(profile_id)
+        return self.directory / f"{profile_id}.json"
+
+    def version(self, profile_id: str) -> float:
+        """Modification time of the profile's file (0 for the built-in profile)."""
+        if profile_id == DEFAULT_PROFILE_ID:
+            return 0.0
+        try:
+            return self._path(profile_id).stat().st_mtime
+        except OSError:
+            raise ProfileNotFoundError(profile_id) from None
+
+    def exists(self, profile_id: str) -> bool:
+        try:
+            self.version(profile_id)
+        except ProfileNotFoundError:
+            return False
+        return True
+
+    def get(self, profile_id: str) -> dict:
+        """Load a profile's data.
+
+        Raises:
+            ProfileNotFoundError: Unknown id, or the file is missing/unreadable.
+        """
+        if profile_id == DEFAULT_PROFILE_ID:
+            return PROFILE_DATA
+        try:
+            data = json.loads(self._path(profile_id).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            raise ProfileNotFoundError(profile_id) from None
+        if not isinstance(data, dict) or not data.get("name"):
+            raise ProfileNotFoundError(profile_id)
+        return data
+
+    def list_ids(self) -> list[str]:
+        ids = [DEFAULT_PROFILE_ID]
+        if self.directory.is_dir():
+            ids += sorted(
+                path.stem
+                for path in self.directory.glob("*.json")
+                if PROFILE_ID_PATTERN.fullmatch(path.stem) and path.stem != DEFAULT_PROFILE_ID
+            )
+        return ids
+
+
+# Singleton instance
+profiles = ProfileRegistry()
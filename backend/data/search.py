@@ -0,0 +1,239 @@
+"""In-process full-text search over conversations and evaluation logs.
+
+Each index is an inverted index (term -> {doc_id: term frequency}) ranked
+with BM25. Documents are added and removed incrementally by the stores that
+own them, so queries never scan the underlying data.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from typing import Any, Callable, Optional
+
+# Unicode word characters, so Turkish (and other non-ASCII) words stay whole
+TOKEN_PATTERN = re.compile(r"\w+")
+# Turkish dotted capital I casefolds to "i" + combining dot; map it to plain "i"
+_FOLD_TABLE = str.maketrans({"İ": "i"})
+
+# Very common words carry no ranking signal and would make the largest postings
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it of on or our "
+    "that the this to was we were will with you your".split()
+)
+
+# BM25 parameters (standard defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+SNIPPET_RADIUS = 80
+
+
+def fold(text: str) -> str:
+    """Case-insensitive form of ``text`` used for indexing, queries and snippets."""
+    return unicodedata.normalize("NFC", text.translate(_FOLD_TABLE)).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    """Casefolded word tokens, without stopwords."""
+    return [t for t in TOKEN_PATTERN.findall(fold(text)) if t not in STOPWORDS]
+
+
+def make_snippet(text: str, terms: list[str]) -> str:
+    """Excerpt of ``text`` around the first occurrence of any query term."""
+    # Casefolding can change lengths ("ß" -> "ss"), so matches in the folded
+    # text are mapped back to positions in the (NFC-normalized) original
+    text = unicodedata.normalize("NFC", text)
+    folded = []
+    origin = []
+    for index, char in enumerate(text):
+        piece = fold(char)
+        folded.append(piece)
+        origin.extend([index] * len(piece))
+    lowered = "".join(folded)
+    positions = [origin[p] for p in (lowered.find(t) for t in terms) if p >= 0]
+    if not positions:
+        return text[: 2 * SNIPPET_RADIUS]
+    start = max(0, min(positions) - SNIPPET_RADIUS)
+    end = min(len(text), min(positions) + SNIPPET_RADIUS)
+    return ("…" if start else "") + text[start:end] + ("…" if end < len(text) else "")
+
+class _Doc:
+    __slots__ = ("length", "created_at", "sender_email", "status", "profile_id", "payload")
+
+    def __init__(
+        self,
+        length: int,
+        created_at: float,
+        sender_email: str,
+        status: str,
+        profile_id: str,
+        payload,
+    ):
+        self.length = length
+        self.created_at = created_at
+        self.sender_email = sender_email
+        self.status = status
+        self.profile_id = profile_id
+        self.payload = payload
+
+
+class SearchIndex:
+    """BM25-ranked inverted index with incremental add/remove.
+
+    Documents carry the fields search results can be filtered on (sender,
+    status, profile, creation time) plus a ``payload`` — a reference to the stored
+    object. Text is derived from the payload by ``text_of`` both when indexing
+    and when removing, so it is never copied into the index.
+    """
+
+    def __init__(self, kind: str, text_of: Callable[[Any], str]):
+        self.kind = kind
+        self.text_of = text_of
+        self._postings: dict[str, dict[int, int]] = {}
+        self._docs: dict[int, _Doc] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(
+        self,
+        doc_id: int,
+        payload: Any,
+        created_at: float,
+        sender_email: str = "",
+        status: str = "",
+        profile_id: str = "",
+    ) -> None:
+        """Index a document under a new, unique ``doc_id``."""
+        tokens = tokenize(self.text_of(payload))
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+            postings[doc_id] = postings.get(doc_id, 0) + 1
+        self._docs[doc_id] = _Doc(
+            len(tokens), created_at, sender_email, status, profile_id, payload
+        )
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document (no-op if it is not indexed)."""
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for token in set(tokenize(self.text_of(doc.payload))):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._docs.clear()
+        self._total_length = 0
+
+    def search(
+        self,
+        terms: list[str],
+        sender_email: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        profile_id: Optional[str] = None,
+        top_k: int = 20,
+    ) -> tuple[int, list[tuple[float, float, int, Any]]]:
+        """Find documents containing every term, best BM25 score first.
+
+        Returns:
+            (total matches after filtering,
+             up to ``top_k`` tuples of (score, created_at, doc_id, payload))
+        """
+        terms = list(dict.fromkeys(terms))
+        if not terms or not self._docs:
+            return 0, []
+        postings = [self._postings.get(term) for term in terms]
+        if any(p is None for p in postings):
+            return 0, []
+
+        # Intersect starting from the rarest term so the candidate set stays small
+        postings.sort(key=len)
+        candidates = postings[0].keys()
+        for p in postings[1:]:
+            candidates = [doc_id for doc_id in candidates if doc_id in p]
+
+        n_docs = len(self._docs)
+        avg_length = self._total_length / n_docs or 1.0
+        weighted = [
+            (p, math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5)) * (BM25_K1 + 1))
+            for p in postings
+        ]
+        norm_base = BM25_K1 * (1 - BM25_B)
+        norm_per_token = BM25_K1 * BM25_B / avg_length
+        filtered = any(f is not None for f in (sender_email, status, since, until, profile_id))
+        docs = self._docs
+
+        total = 0
+        heap: list[tuple[float, float, int]] = []
+        for doc_id in candidates:
+            doc = docs[doc_id]
+            if filtered and (
+                (sender_email is not None and doc.sender_email != sender_email)
+                or (status is not None and doc.status != status)
+                or (since is not None and doc.created_at < since)
+                or (until is not None and doc.created_at > until)
+                or (profile_id is not None and doc.profile_id != profile_id)
+            ):
+                continue
+            total += 1
+            norm = norm_base + norm_per_token * doc.length
+            score = 0.0
+            for p, weight in weighted:
+                tf = p[doc_id]
+                score += weight * tf / (tf + norm)
+            # Keep only the best top_k in a min-heap
+            hit = (score, doc.created_at, doc_id)
+            if len(heap) < top_k:
+                heapq.heappush(heap, hit)
+            elif hit > heap[0]:
+                heapq.heapreplace(heap, hit)
+
+        return total, [
+            (score, created_at, doc_id, docs[doc_id].payload)
+            for score, created_at, doc_id in sorted(heap, reverse=True)
+        ]
+
+    def get_stats(self) -> dict:
+        return {"documents": len(self._docs), "terms": len(self._postings)}
+
+
+def conversation_text(payload: tuple) -> str:
+    """Searchable text of a ``(sender_email, ConversationEntry)`` payload."""
+    sender_email, entry = payload
+    return f"{sender_email} {entry.subject} {entry.employer_message} {entry.agent_response}"
+
+
+def log_text(log: dict) -> str:
+    """Searchable text of a cached evaluation log dict."""
+    evaluation = log.get("evaluation") or {}
+    confidence = log.get("confidence") or {}
+    return " ".join(
+        (
+            log.get("sender_name", ""),
+            log.get("sender_email", ""),
+            log.get("subject", ""),
+            log.get("employer_message", ""),
+            log.get("response_text", ""),
+            evaluation.get("feedback", ""),
+            confidence.get("category", ""),
+            confidence.get("reason", ""),
+        )
+    )
+
+
+# Singleton instances, maintained by ConversationMemory and the log store
+conversation_index = SearchIndex("conversation", conversation_text)
+log_index = SearchIndex("log", log_text)
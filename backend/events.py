@@ -0,0 +1,148 @@
+"""Live event channel — pushes new logs and conversation entries to dashboards.
+
+Stores publish events synchronously as they write. ``publish`` never awaits:
+each event is serialized once and handed to every subscriber's bounded
+queue, and a per-connection task drains that queue onto its WebSocket. A
+dashboard that falls behind has its backlog dropped and is told to resync
+(re-fetch everything), so slow or stalled clients cannot hold up the
+pipeline or grow memory without bound.
+"""
+
+import asyncio
+from typing import Optional
+
+import anyio
+import orjson
+from fastapi import APIRouter, WebSocket
+
+from config import settings
+from responses import ORJSONResponse
+
+RESYNC_FRAME = orjson.dumps({"type": "resync", "data": None}).decode()
+
+
+class Subscriber:
+    """One connected dashboard: a bounded queue of serialized event frames."""
+
+    def __init__(self, profile_id: Optional[str], max_pending: int):
+        self.profile_id = profile_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(max_pending)
+
+    def offer(self, frame: str) -> bool:
+        """Queue a frame without waiting; on overflow replace the backlog with a resync."""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_FRAME)
+            return False
+
+
+class EventHub:
+    """Fans published events out to all subscribers (event-loop thread only)."""
+
+    def __init__(
+        self,
+        max_subscribers: int = settings.EVENTS_MAX_SUBSCRIBERS,
+        max_pending: int = settings.EVENTS_MAX_PENDING,
+    ):
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self._subscribers: set[Subscriber] = set()
+        self.published = 0
+        self.delivered = 0
+        self.resyncs = 0
+
+    def subscribe(self, profile_id: Optional[str] = None) -> Optional[Subscriber]:
+        """Register a dashboard (None when at capacity)."""
+        if len(self._subscribers) >= self.max_subscribers:
+            return None
+        subscriber = Subscriber(profile_id, self.max_pending)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, data: dict, profile_id: Optional[str] = None) -> None:
+        """Send an event to every subscriber watching ``profile_id`` (or all profiles).
+
+        Events without a profile (e.g. a global clear) reach every subscriber.
+        """
+        if not self._subscribers:
+            return
+        self.published += 1
+        frame = None
+        for subscriber in self._subscribers:
+            if profile_id is not None and subscriber.profile_id not in (None, profile_id):
+                continue
+            if frame is None:
+                # Serialized once, shared by every subscriber
+                frame = orjson.dumps(
+                    {"type": event_type, "profile_id": profile_id, "data": data}
+                ).decode()
+            if subscriber.offer(frame):
+                self.delivered += 1
+            else:
+                self.resyncs += 1
+
+    def get_stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "published": self.published,
+            "delivered": self.delivered,
+            "resyncs": self.resyncs,
+        }
+
+
+# Singleton instance
+event_hub = EventHub()
+
+router = APIRouter(prefix="/api", tags=["Events"], default_response_class=ORJSONResponse)
+
+
+@router.websocket("/events")
+async def events_socket(websocket: WebSocket, profile_id: Optional[str] = None):
+    """Stream log/conversation events as JSON text frames.
+
+    Frames look like ``{"type": "log" | "conversation" | "reset" | "resync",
+    "profile_id": ..., "data": ...}``. Pass ``profile_id`` to receive only
+    that profile's events.
+    """
+    subscriber = event_hub.subscribe(profile_id)
+    if subscriber is None:
+        # 1013: try again later
+        await websocket.close(code=1013)
+        return
+    await websocket.accept()
+
+    try:
+        async with anyio.create_task_group() as task_group:
+
+            async def forward() -> None:
+                try:
+                    while True:
+                        await websocket.send_text(await subscriber.queue.get())
+                except Exception:
+                    # A failed send means the client is gone
+                    task_group.cancel_scope.cancel()
+
+            async def wait_for_close() -> None:
+                # Clients only listen; draining receive() notices disconnects promptly
+                while (await websocket.receive())["type"] != "websocket.disconnect":
+                    pass
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(forward)
+            task_group.start_soon(wait_for_close)
+    finally:
+        event_hub.unsubscribe(subscriber)
+
+
+@router.get("/events/stats")
+async def get_event_stats():
+    """Return connected dashboards and event fan-out counters."""
+    return event_hub.get_stats()
@@ -0,0 +1,398 @@
+"""Asynchronous job API — queue messages for background pipeline processing."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import orjson
+from fastapi import APIRouter, HTTPException
+
+from config import settings
+from data.profile import profiles
+from models.schemas import EmployerMessage, JobRequest, JobStatus
+from responses import ORJSONResponse
+
+# Pipeline stages in order, as reported by run_pipeline via report_progress()
+PIPELINE_STAGES = ("notifying", "preprocessing", "detecting", "drafting", "evaluating", "sending", "storing")
+FINISHED_STATUSES = ("completed", "failed")
+
+# How often idle workers re-check for delayed (retrying) jobs
+POLL_SECONDS = 1.0
+
+# Job id of the pipeline run in the current task, if it runs as a job
+_current_job: ContextVar[Optional[str]] = ContextVar("current_job", default=None)
+
+
+def report_progress(stage: str) -> None:
+    """Record the pipeline stage reached by the current job (no-op outside jobs)."""
+    job_id = _current_job.get()
+    if job_id is not None and queue is not None:
+        queue.track_stage(job_id, stage)
+
+
+class JobStore:
+    """SQLite job table, so queued and interrupted jobs survive restarts.
+
+    Methods are blocking; JobQueue runs them in worker threads via
+    ``asyncio.to_thread``. A lock serializes them, and keeps claim_next's
+    select-then-update atomic across threads.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            status TEXT NOT NULL,
+            stage TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            message TEXT NOT NULL,
+            callback_url TEXT,
+            callback_status TEXT,
+            result TEXT,
+            error TEXT,
+            run_after REAL NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, run_after);
+    """
+
+    def __init__(self, path: str = settings.JOBS_DB_PATH):
+        # autocommit; used from asyncio.to_thread workers, serialized by _lock
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+
+    def _execute(self, sql: str, params: tuple = ()) -> int:
+        """Run a write statement and return the number of rows it changed."""
+        with self._lock:
+            return self._db.execute(sql, params).rowcount
+
+    def _query(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    def _update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = datetime.now().isoformat()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        self._execute(f"UPDATE jobs SET {columns} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def create(
+        self, message: EmployerMessage, callback_url: Optional[str] = None, delay: float = 0
+    ) -> str:
+        job_id = uuid.uuid4().hex
+        now = datetime.now().isoformat()
+        self._execute(
+            "INSERT INTO jobs (job_id, status, message, callback_url, run_after, created_at, updated_at)"
+            " VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+            (job_id, message.model_dump_json(), callback_url, time.time() + delay, now, now),
+        )
+        return job_id
+
+    def get(self, job_id: str) -> Optional[sqlite3.Row]:
+        rows = self._query("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+        return rows[0] if rows else None
+
+    def claim_next(self) -> Optional[sqlite3.Row]:
+        """Mark the oldest runnable queued job as running and return it."""
+        with self._lock:
+            rows = self._query(
+                "SELECT * FROM jobs WHERE status = 'queued' AND run_after <= ?"
+                " ORDER BY created_at LIMIT 1",
+                (time.time(),),
+            )
+            if not rows:
+                return None
+            job_id = rows[0]["job_id"]
+            self._update(job_id, status="running", attempts=rows[0]["attempts"] + 1)
+            return self.get(job_id)
+
+    def set_stage(self, job_id: str, stage: str) -> None:
+        self._update(job_id, stage=stage)
+
+    def complete(self, job_id: str, result: dict) -> None:
+        self._update(job_id, status="completed", result=orjson.dumps(result).decode(), error=None)
+
+    def fail(self, job_id: str, error: str) -> None:
+        self._update(job_id, status="failed", error=error)
+
+    def retry_later(self, job_id: str, error: str, delay: float) -> None:
+        self._update(job_id, status="queued", error=error, run_after=time.time() + delay)
+
+    def set_callback_status(self, job_id: str, callback_status: str) -> None:
+        self._update(job_id, callback_status=callback_status)
+
+    def requeue_interrupted(self) -> int:
+        """Put jobs left 'running' by a stopped worker back in the queue."""
+        return self._execute(
+            "UPDATE jobs SET status = 'queued', updated_at = ? WHERE status = 'running'",
+            (datetime.now().isoformat(),),
+        )
+
+    def purge_finished(self, older_than_days: float) -> int:
+        cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+        return self._execute(
+            "DELETE FROM jobs WHERE status IN ('completed', 'failed') AND updated_at < ?",
+            (cutoff,),
+        )
+
+    def list_recent(self, status: Optional[str] = None, limit: int = 20) -> list[sqlite3.Row]:
+        if status:
+            return self._query(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                (status, limit),
+            )
+        return self._query("SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,))
+
+    def counts(self) -> dict:
+        rows = self._query("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        return {status: count for status, count in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def job_status(row: sqlite3.Row, include_result: bool = True) -> dict:
+    """Render a job row as a JobStatus payload."""
+    if row["status"] == "completed":
+        progress = 1.0
+    elif row["stage"] in PIPELINE_STAGES:
+        progress = PIPELINE_STAGES.index(row["stage"]) / len(PIPELINE_STAGES)
+    else:
+        progress = 0.0
+    result = orjson.loads(row["result"]) if include_result and row["result"] else None
+    return JobStatus(
+        job_id=row["job_id"],
+        status=row["status"],
+        stage=row["stage"],
+        progress=round(progress, 3),
+        attempts=row["attempts"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        result=result,
+        error=row["error"],
+        callback_url=row["callback_url"],
+        callback_status=row["callback_status"],
+    ).model_dump()
+
+
+class JobQueue:
+    """Background workers that run queued jobs through a pipeline handler.
+
+    Jobs interrupted by a shutdown are re-queued on the next start and run
+    again from the beginning. Exceptions listed in ``retry_on`` (e.g. the LLM
+    provider being unavailable) re-queue the job after ``retry_delay`` seconds,
+    up to ``max_attempts`` runs; any other exception fails the job.
+
+    Callbacks are only POSTed to http(s) URLs whose host is in
+    ``callback_hosts``, so a submitted job cannot make the server send
+    requests to arbitrary (e.g. internal) addresses.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[EmployerMessage], Awaitable[dict]],
+        retry_on: tuple[type[BaseException], ...] = (),
+        path: str = settings.JOBS_DB_PATH,
+        workers: int = settings.JOB_WORKERS,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        retry_delay: float = settings.JOB_RETRY_SECONDS,
+        callback_hosts: str = settings.JOB_CALLBACK_ALLOWED_HOSTS,
+    ):
+        self.handler = handler
+        self.retry_on = retry_on
+        self.store = JobStore(path)
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.callback_hosts = {
+            host.strip().lower() for host in callback_hosts.split(",") if host.strip()
+        }
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        # Latest stage per running job, and the in-flight writes persisting it
+        self._stages: dict[str, str] = {}
+        self._stage_writes: set[asyncio.Task] = set()
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        self.jobs_retried = 0
+
+    async def start(self) -> None:
+        recovered = await asyncio.to_thread(self.store.requeue_interrupted)
+        purged = await asyncio.to_thread(self.store.purge_finished, settings.JOB_RETENTION_DAYS)
+        print(f"[JOBS] Starting {self.workers} workers ({recovered} recovered, {purged} purged)")
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._stage_writes, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self.store.close)
+
+    def callback_url_error(self, url: str) -> Optional[str]:
+        """Why ``url`` may not receive job callbacks, or None if it may."""
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            return "callback_url must be an absolute http(s) URL"
+        if parts.hostname.lower() not in self.callback_hosts:
+            return f"callback host '{parts.hostname}' is not in JOB_CALLBACK_ALLOWED_HOSTS"
+        return None
+
+    async def submit(self, request: JobRequest, delay: float = 0) -> str:
+        """Queue a job; with ``delay`` it becomes runnable only after that many seconds."""
+        message = EmployerMessage(**request.model_dump(exclude={"callback_url"}))
+        job_id = await asyncio.to_thread(self.store.create, message, request.callback_url, delay)
+        self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[sqlite3.Row]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def list_recent(self, status: Optional[str] = None, limit: int = 20) -> list[sqlite3.Row]:
+        return await asyncio.to_thread(self.store.list_recent, status, limit)
+
+    async def counts(self) -> dict:
+        return await asyncio.to_thread(self.store.counts)
+
+    def track_stage(self, job_id: str, stage: str) -> None:
+        """Persist a job's pipeline stage in the background (called from sync code).
+
+        Each write stores the job's latest stage when it runs, so writes that
+        finish out of order still leave the newest stage in the table.
+        """
+        self._stages[job_id] = stage
+        task = asyncio.create_task(asyncio.to_thread(self._write_stage, job_id))
+        self._stage_writes.add(task)
+        task.add_done_callback(self._stage_writes.discard)
+
+    def _write_stage(self, job_id: str) -> None:
+        stage = self._stages.get(job_id)
+        if stage is not None:
+            self.store.set_stage(job_id, stage)
+
+    async def _worker(self) -> None:
+        while True:
+            row = await asyncio.to_thread(self.store.claim_next)
+            if row is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(row)
+
+    async def _run(self, row: sqlite3.Row) -> None:
+        job_id = row["job_id"]
+        message = EmployerMessage.model_validate_json(row["message"])
+        token = _current_job.set(job_id)
+        try:
+            result = await self.handler(message)
+        except self.retry_on as e:
+            if row["attempts"] >= self.max_attempts:
+                await self._fail(job_id, f"Gave up after {row['attempts']} attempts: {e}")
+            else:
+                self.jobs_retried += 1
+                await asyncio.to_thread(self.store.retry_later, job_id, str(e), self.retry_delay)
+                print(f"[JOBS] Job {job_id} will retry in {self.retry_delay:.0f}s: {e}")
+                return
+        except Exception as e:
+            await self._fail(job_id, f"{type(e).__name__}: {e}")
+        else:
+            await asyncio.to_thread(self.store.complete, job_id, result)
+            self.jobs_completed += 1
+        finally:
+            _current_job.reset(token)
+            self._stages.pop(job_id, None)
+        await self._send_callback(job_id)
+
+    async def _fail(self, job_id: str, error: str) -> None:
+        await asyncio.to_thread(self.store.fail, job_id, error)
+        self.jobs_failed += 1
+        print(f"[JOBS] Job {job_id} failed: {error}")
+
+    async def _send_callback(self, job_id: str) -> None:
+        row = await self.get(job_id)
+        if row is None or not row["callback_url"]:
+            return
+        # Re-checked here, since the allow-list may have changed since submission
+        error = self.callback_url_error(row["callback_url"])
+        if error is not None:
+            callback_status = f"rejected: {error}"
+        else:
+            try:
+                async with httpx.AsyncClient(timeout=settings.HTTP_TIMEOUT_SECONDS) as client:
+                    response = await client.post(row["callback_url"], json=job_status(row))
+                callback_status = f"delivered ({response.status_code})"
+            except Exception as e:
+                callback_status = f"failed: {type(e).__name__}: {e}"
+        await asyncio.to_thread(self.store.set_callback_status, job_id, callback_status)
+
+    async def get_stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "by_status": await self.counts(),
+            "completed": self.jobs_completed,
+            "failed": self.jobs_failed,
+            "retried": self.jobs_retried,
+        }
+
+
+# Created by main.py once the pipeline handler is importable
+queue: Optional[JobQueue] = None
+
+router = APIRouter(prefix="/api", tags=["Jobs"], default_response_class=ORJSONResponse)
+
+
+def _require_queue() -> JobQueue:
+    if queue is None:
+        raise HTTPException(status_code=503, detail="Job workers are not running")
+    return queue
+
+
+@router.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """Queue a message for background processing and return its job id immediately."""
+    if not profiles.exists(request.profile_id):
+        raise HTTPException(status_code=404, detail=f"Unknown profile '{request.profile_id}'")
+    job_queue = _require_queue()
+    if request.callback_url is not None:
+        error = job_queue.callback_url_error(request.callback_url)
+        if error is not None:
+            raise HTTPException(status_code=422, detail=error)
+    job_id = await job_queue.submit(request)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/jobs/{job_id}"}
+
+
+@router.get("/jobs")
+async def list_jobs(status: Optional[str] = None, limit: int = 20):
+    """List recent jobs (without results), plus worker counters."""
+    job_queue = _require_queue()
+    rows = await job_queue.list_recent(status, min(limit, 200))
+    return {
+        "stats": await job_queue.get_stats(),
+        "jobs": [job_status(row, include_result=False) for row in rows],
+    }
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Return a job's status, current pipeline stage and, once completed, its result."""
+    row = await _require_queue().get(job_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(row)
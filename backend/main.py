@@ -1,16 +1,54 @@
 """Career Assistant AI Agent — FastAPI Entry Point."""
 
+from contextlib import asynccontextmanager
 from pathlib import Path
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from routes.api import router as api_router
+from routes.api import (
+    router as api_router,
+    process_inbound_message,
+    process_job_message,
+)
+from agents.llm_client import LLMUnavailableError
+from agents.revision_policy import revision_policy
+from data.logs import evaluation_logs
+from connectors import imap_connector
+import jobs
+import events
+import archive
+import cassette
+from responses import CompressionMiddleware
+from assets import pipeline as asset_pipeline, router as assets_router, REVALIDATE_CACHE
+from tools.notification_tool import aggregator as notification_aggregator
+from profiling import ProfilingMiddleware, loop_monitor, profiler, router as profiling_router
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background services (job workers, inbound mail, loop monitor)."""
+    profiler.bind_loop_thread()
+    learned = revision_policy.rebuild(evaluation_logs.newest_first())
+    print(f"[POLICY] Revision policy seeded from {learned} stored trajectories")
+    loop_monitor.start()
+    jobs.queue = jobs.JobQueue(handler=process_job_message, retry_on=(LLMUnavailableError,))
+    await jobs.queue.start()
+    imap_connector.connector = imap_connector.InboundConnector(handler=process_inbound_message)
+    imap_connector.connector.start()
+    yield
+    await imap_connector.connector.stop()
+    await jobs.queue.stop()
+    # Deliver events still waiting for the next digest window
+    await notification_aggregator.flush()
+    profiler.stop_session()
+    await loop_monitor.stop()
+
 
 app = FastAPI(
     title="Career Assistant AI Agent",
     description="Multi-agent AI system for professional career communication",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -22,18 +60,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli compression for API payloads above the size threshold
+app.add_middleware(CompressionMiddleware)
+
+# Wall-clock profiles for a sampled fraction of /api/message requests (PROFILE_SAMPLE_RATE)
+app.add_middleware(ProfilingMiddleware)
+
 # Include API routes
 app.include_router(api_router)
+app.include_router(imap_connector.router)
+app.include_router(jobs.router)
+app.include_router(events.router)
+app.include_router(archive.router)
+app.include_router(cassette.router)
+app.include_router(profiling_router)
+
+# Build minified, content-hashed, precompressed frontend assets once at startup
+asset_pipeline.build()
+app.include_router(assets_router)
 
-# Serve static frontend files
+# Serve raw frontend files (unhashed, kept for direct links and debugging)
 frontend_dir = Path(__file__).resolve().parent.parent / "frontend"
 app.mount("/static", StaticFiles(directory=str(frontend_dir)), name="static")
 
 
 @app.get("/")
-async def serve_frontend():
-    """Serve the frontend index.html."""
-    return FileResponse(str(frontend_dir / "index.html"))
+async def serve_frontend(request: Request):
+    """Serve the rewritten index.html (compressed, revalidated via ETag)."""
+    return asset_pipeline.respond(asset_pipeline.index, request, REVALIDATE_CACHE)
 
 
 if __name__ == "__main__":
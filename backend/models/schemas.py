@@ -4,6 +4,8 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 
+from data.profile import DEFAULT_PROFILE_ID
+
 
 class EmployerMessage(BaseModel):
     """Incoming message from a potential employer."""
@@ -12,6 +14,9 @@ class EmployerMessage(BaseModel):
     sender_email: str = Field(..., description="Email address of the sender")
     subject: str = Field(..., description="Email subject line")
     message: str = Field(..., description="Full message body from the employer")
+    profile_id: str = Field(
+        DEFAULT_PROFILE_ID, description="Candidate profile the message is addressed to"
+    )
 
 
 class EvaluationDetail(BaseModel):
@@ -39,29 +44,81 @@ class ConfidenceDetail(BaseModel):
 class AgentResponse(BaseModel):
     """Full response from the career agent pipeline."""
 
-    status: str = Field(..., description="'approved', 'flagged_unknown', or 'error'")
+    status: str = Field(
+        ..., description="'approved', 'unsent' (approved but the email failed), 'flagged_unknown', "
+        "'escalated', 'queued' or 'error'"
+    )
     response_text: str = Field(default="", description="Final generated response")
     evaluation: Optional[EvaluationDetail] = None
     revision_count: int = 0
     unknown_detection: Optional[dict] = None
     confidence: Optional[ConfidenceDetail] = None
+    escalation: Optional[dict] = None
+    usage: Optional[dict] = Field(
+        None, description="Token usage and cost per pipeline stage, plus totals"
+    )
     email_result: Optional[dict] = None
     notification_result: Optional[dict] = None
     conversation_history: Optional[list] = None
     error: Optional[str] = None
+    job_id: Optional[str] = Field(
+        None, description="Background job that retries a message deferred while the LLM is down"
+    )
 
 
 class EvaluationLog(BaseModel):
     """Single evaluation log entry."""
 
+    log_id: Optional[int] = Field(None, description="Sequential id assigned when logged")
+    profile_id: str = DEFAULT_PROFILE_ID
     timestamp: str = Field(default_factory=lambda: datetime.now().isoformat())
     sender_name: str = ""
     sender_email: str = ""
     subject: str = ""
     employer_message: str = ""
+    message_id: Optional[int] = Field(
+        None, description="ConversationMemory entry id holding the employer message"
+    )
     response_text: str = ""
     evaluation: Optional[EvaluationDetail] = None
     revision_count: int = 0
+    score_history: list[float] = Field(
+        default_factory=list, description="Overall score after each evaluation round"
+    )
     status: str = ""
     unknown_detection: Optional[dict] = None
     confidence: Optional[ConfidenceDetail] = None
+    escalation: Optional[dict] = None
+    usage: Optional[dict] = Field(
+        None, description="Token usage and cost per pipeline stage, plus totals"
+    )
+    stage_latency_ms: dict[str, float] = Field(
+        default_factory=dict, description="Wall time spent in each pipeline stage"
+    )
+    preprocessing: Optional[dict] = Field(
+        None, description="Estimated input tokens before/after cleaning and digesting"
+    )
+
+
+class JobRequest(EmployerMessage):
+    """Employer message submitted for background processing."""
+
+    callback_url: Optional[str] = Field(
+        None, description="URL that receives a POST with the job once it finishes"
+    )
+
+
+class JobStatus(BaseModel):
+    """State of a background message-processing job."""
+
+    job_id: str
+    status: str = Field(..., description="'queued', 'running', 'completed' or 'failed'")
+    stage: Optional[str] = Field(None, description="Current (or last reached) pipeline stage")
+    progress: float = Field(0.0, description="Fraction of pipeline stages completed (0–1)")
+    attempts: int = 0
+    created_at: str
+    updated_at: str
+    result: Optional[dict] = Field(None, description="Pipeline response once completed")
+    error: Optional[str] = None
+    callback_url: Optional[str] = None
+    callback_status: Optional[str] = None
@@ -0,0 +1,400 @@
+"""Opt-in profiling: sampled request profiles, on-demand sessions and event-loop lag monitoring.
+
+Everything here uses the standard library only:
+- a wall-clock stack sampler (a thread that periodically snapshots the event
+  loop thread's stack, so time spent waiting on I/O shows up too),
+- cProfile for CPU profiles downloadable as pstats,
+- a watchdog thread that captures the stack of any callback blocking the
+  event loop for longer than a threshold.
+"""
+
+import asyncio
+import cProfile
+import itertools
+import json
+import marshal
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response
+
+from config import settings
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval (wall-clock)."""
+
+    def __init__(self, thread_id: int, interval: float = settings.PROFILE_SAMPLE_INTERVAL_SECONDS):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: dict[tuple, int] = {}
+        self.sample_count = 0
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.stopped_at = time.time()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            key = tuple(reversed(stack))
+            self.samples[key] = self.samples.get(key, 0) + 1
+            self.sample_count += 1
+
+    def to_speedscope(self, name: str) -> dict:
+        """Render the samples in speedscope's 'sampled' file format."""
+        frame_index: dict[tuple, int] = {}
+        frames = []
+        samples = []
+        weights = []
+        for stack, count in self.samples.items():
+            indices = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+            samples.append(indices)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": round(self.stopped_at - self.started_at, 6),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "name": name,
+            "exporter": "career-agent-profiler",
+        }
+
+
+class ProfileStore:
+    """Keeps the most recent profiles in memory for download."""
+
+    def __init__(self, max_profiles: int = settings.PROFILE_MAX_STORED):
+        self._profiles: deque[dict] = deque(maxlen=max_profiles)
+        self._ids = itertools.count(1)
+
+    def add(self, name: str, sampler: StackSampler, cpu: Optional[cProfile.Profile] = None) -> dict:
+        profile = {
+            "id": next(self._ids),
+            "name": name,
+            "started_at": sampler.started_at,
+            "duration_s": round(sampler.stopped_at - sampler.started_at, 4),
+            "samples": sampler.sample_count,
+            "speedscope": sampler.to_speedscope(name),
+            "pstats": _dump_pstats(cpu) if cpu is not None else None,
+        }
+        self._profiles.append(profile)
+        return profile
+
+    def get(self, profile_id: int) -> Optional[dict]:
+        for profile in self._profiles:
+            if profile["id"] == profile_id:
+                return profile
+        return None
+
+    def list(self) -> list[dict]:
+        return [
+            {k: v for k, v in p.items() if k not in ("speedscope", "pstats")}
+            | {"has_pstats": p["pstats"] is not None}
+            for p in reversed(self._profiles)
+        ]
+
+
+def _dump_pstats(profiler: cProfile.Profile) -> bytes:
+    # Same bytes pstats.Stats.dump_stats() writes to disk
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
+
+
+class Profiler:
+    """Coordinates sampled request profiling and on-demand profiling sessions."""
+
+    def __init__(self, sample_rate: float = settings.PROFILE_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.store = ProfileStore()
+        self.loop_thread_id: Optional[int] = None
+        self._request_sampler_busy = False
+        self._session: Optional[tuple[StackSampler, cProfile.Profile]] = None
+        self._session_name = ""
+        self._session_task: Optional[asyncio.Task] = None
+
+    def bind_loop_thread(self) -> None:
+        """Record the event loop thread (call from inside the running loop)."""
+        self.loop_thread_id = threading.get_ident()
+
+    # ---- sampled request profiling ----
+
+    def should_sample_request(self) -> bool:
+        # One request profile at a time: concurrent requests share the loop
+        # thread, so overlapping samplers would only duplicate each other.
+        return (
+            self.sample_rate > 0
+            and self.loop_thread_id is not None
+            and not self._request_sampler_busy
+            and self._session is None
+            and random.random() < self.sample_rate
+        )
+
+    def start_request_sampler(self) -> StackSampler:
+        self._request_sampler_busy = True
+        sampler = StackSampler(self.loop_thread_id)
+        sampler.start()
+        return sampler
+
+    def finish_request_sampler(self, sampler: StackSampler, name: str) -> None:
+        sampler.stop()
+        self._request_sampler_busy = False
+        self.store.add(name, sampler)
+
+    # ---- on-demand sessions ----
+
+    @property
+    def session_active(self) -> bool:
+        return self._session is not None
+
+    def start_session(self, seconds: float) -> None:
+        """Profile everything on the event loop for ``seconds`` (wall + CPU)."""
+        sampler = StackSampler(self.loop_thread_id or threading.get_ident())
+        cpu = cProfile.Profile()
+        sampler.start()
+        cpu.enable()
+        self._session = (sampler, cpu)
+        self._session_name = f"session-{time.strftime('%Y%m%d-%H%M%S')}"
+        self._session_task = asyncio.create_task(self._stop_after(seconds))
+
+    async def _stop_after(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+        self._session_task = None
+        self.stop_session()
+
+    def stop_session(self) -> Optional[dict]:
+        if self._session is None:
+            return None
+        sampler, cpu = self._session
+        cpu.disable()
+        sampler.stop()
+        self._session = None
+        if self._session_task is not None:
+            self._session_task.cancel()
+            self._session_task = None
+        return self.store.add(self._session_name, sampler, cpu)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that wall-clock profiles a sampled fraction of API requests."""
+
+    def __init__(self, app, path_prefix: str = "/api/message"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.path_prefix)
+            or not profiler.should_sample_request()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        sampler = profiler.start_request_sampler()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profiler.finish_request_sampler(
+                sampler, f"{scope['method']} {scope['path']} {time.strftime('%H:%M:%S')}"
+            )
+
+
+class LoopLagMonitor:
+    """Detects callbacks that block the event loop.
+
+    An asyncio task refreshes a heartbeat every ``interval`` seconds; a
+    watchdog thread checks it, and when the heartbeat is older than
+    ``threshold`` seconds it records the event loop thread's current stack —
+    which is the callback doing the blocking.
+    """
+
+    def __init__(
+        self,
+        threshold: float = settings.LOOP_LAG_THRESHOLD_SECONDS,
+        interval: float = 0.05,
+    ):
+        self.threshold = threshold
+        self.interval = interval
+        self.events: deque[dict] = deque(maxlen=50)
+        self.max_lag = 0.0
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._reported_beat = 0.0
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._task = asyncio.create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _beat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - expected
+            self.max_lag = max(self.max_lag, lag)
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._heartbeat
+            stalled = time.monotonic() - beat
+            # Report each stall once, while the blocking callback is still on the stack
+            if stalled > self.threshold and beat != self._reported_beat:
+                self._reported_beat = beat
+                frame = sys._current_frames().get(self._loop_thread_id)
+                stack = traceback.format_stack(frame) if frame is not None else []
+                self.events.append(
+                    {
+                        "detected_at": time.time(),
+                        "blocked_for_s": round(stalled, 3),
+                        "stack": [line.strip() for line in stack[-8:]],
+                    }
+                )
+                print(f"[PROFILER] Event loop blocked for {stalled:.3f}s")
+
+    def get_status(self) -> dict:
+        tasks = asyncio.all_tasks()
+        coroutines: dict[str, int] = {}
+        for task in tasks:
+            coro = task.get_coro()
+            name = getattr(coro, "__qualname__", type(coro).__name__)
+            coroutines[name] = coroutines.get(name, 0) + 1
+        return {
+            "threshold_s": self.threshold,
+            "max_lag_s": round(self.max_lag, 4),
+            "task_count": len(tasks),
+            "tasks_by_coroutine": dict(sorted(coroutines.items(), key=lambda kv: -kv[1])),
+            "blocking_events": list(self.events),
+        }
+
+
+# Singleton instances
+profiler = Profiler()
+loop_monitor = LoopLagMonitor()
+
+router = APIRouter(prefix="/api/admin", tags=["Profiling"])
+
+
+def _require_admin(token: Optional[str]) -> None:
+    if not settings.PROFILING_ENABLED:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if settings.ADMIN_TOKEN and token != settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.post("/profiler/start")
+async def start_profiling(
+    seconds: float = Query(30.0, gt=0), x_admin_token: Optional[str] = Header(None)
+):
+    """Start an on-demand profiling session that stops itself after ``seconds``.
+
+    ``seconds`` is capped at PROFILE_MAX_SESSION_SECONDS; the response holds
+    the duration actually used.
+    """
+    _require_admin(x_admin_token)
+    if profiler.session_active:
+        raise HTTPException(status_code=409, detail="A profiling session is already running")
+    effective_seconds = min(seconds, settings.PROFILE_MAX_SESSION_SECONDS)
+    profiler.start_session(effective_seconds)
+    return {"message": "Profiling started", "seconds": effective_seconds}
+
+
+@router.post("/profiler/stop")
+async def stop_profiling(x_admin_token: Optional[str] = Header(None)):
+    """Stop the running profiling session early and store its profile."""
+    _require_admin(x_admin_token)
+    profile = profiler.stop_session()
+    if profile is None:
+        raise HTTPException(status_code=409, detail="No profiling session is running")
+    return {"message": "Profiling stopped", "id": profile["id"]}
+
+
+@router.get("/profiler/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """List stored profiles (sampled requests and sessions)."""
+    _require_admin(x_admin_token)
+    return {"sample_rate": profiler.sample_rate, "profiles": profiler.store.list()}
+
+
+@router.get("/profiler/profiles/{profile_id}")
+async def download_profile(
+    profile_id: int,
+    format: str = "speedscope",
+    x_admin_token: Optional[str] = Header(None),
+):
+    """Download a profile as speedscope JSON or (sessions only) a pstats file."""
+    _require_admin(x_admin_token)
+    profile = profiler.store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    if format == "pstats":
+        if profile["pstats"] is None:
+            raise HTTPException(status_code=404, detail="No CPU profile for this entry")
+        return Response(
+            content=profile["pstats"],
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="{profile["name"]}.pstats"'},
+        )
+    return Response(
+        content=json.dumps(profile["speedscope"]),
+        media_type="application/json",
+        headers={
+            "Content-Disposition": f'attachment; filename="{profile["name"]}.speedscope.json"'
+        },
+    )
+
+
+@router.get("/event-loop")
+async def event_loop_status(x_admin_token: Optional[str] = Header(None)):
+    """Report event-loop lag, running asyncio tasks and recent blocking callbacks."""
+    _require_admin(x_admin_token)
+    return loop_monitor.get_status()
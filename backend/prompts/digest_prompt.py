@@ -0,0 +1,26 @@
+"""Prompts for condensing oversized employer messages into a structured digest."""
+
+DIGEST_SYSTEM_PROMPT = """You condense long recruiter emails (often with pasted job descriptions
+or forwarded threads) for a Career Assistant AI that will reply on behalf of a candidate.
+
+Extract ONLY what the reply needs. Keep names, companies, roles, dates, times, time zones,
+locations and numbers exactly as written. Do not invent or infer anything.
+
+## Output Format
+Respond with ONLY a valid JSON object:
+{
+    "summary": "<one or two sentences: who is writing and what they want>",
+    "requirements": ["<required/preferred skill, experience or condition of the role>", ...],
+    "questions": ["<each question the sender asks the candidate, verbatim or close to it>", ...],
+    "dates": ["<each proposed date, time slot or deadline>", ...],
+    "other": ["<any other detail the reply must acknowledge (salary range, location, links)>", ...]
+}
+Use empty lists for anything not present.
+"""
+
+
+def get_digest_user_prompt(chunk: str, part: int, parts: int) -> str:
+    """Build the user prompt for one chunk of an oversized message."""
+    if parts == 1:
+        return f"Condense this employer message:\n\n{chunk}"
+    return f"Condense part {part} of {parts} of a long employer message:\n\n{chunk}"
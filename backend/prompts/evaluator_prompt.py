@@ -48,3 +48,18 @@ The response is approved if overall_score >= {threshold}. Set "approved" accordi
 
 Evaluate now and respond with ONLY the JSON object.
 """
+
+
+def get_evaluator_followup_prompt(agent_response: str, threshold: int) -> str:
+    """Build the follow-up turn of an evaluation session: only the revised response."""
+    return f"""## Revised Response
+The Career Agent revised its response based on your feedback. Evaluate the revision
+against the same employer message, from scratch.
+
+{agent_response}
+
+## Threshold
+The response is approved if overall_score >= {threshold}. Set "approved" accordingly.
+
+Evaluate now and respond with ONLY the JSON object.
+"""
@@ -0,0 +1,123 @@
+"""Optimized API response layer — orjson serialization and gzip/brotli compression."""
+
+import gzip
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+from assets import brotli, negotiate_encoding
+
+# Bodies smaller than this are sent as-is; compressing them costs more than it saves.
+COMPRESSION_MIN_SIZE = 1024
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Accepts plain dicts/lists (already-dumped pydantic data) as well as pydantic
+    models, so cached payloads are serialized directly without re-validation.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _default(obj: Any) -> Any:
+    # pydantic models (e.g. nested EvaluationDetail) that were not pre-dumped
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses buffered responses with brotli or gzip.
+
+    Skips responses that are streamed (``more_body``), already encoded (e.g.
+    precompressed static assets), not text-like, or below ``minimum_size``.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        available = {"gzip": b""}
+        if brotli is not None:
+            available["br"] = b""
+        encoding = negotiate_encoding(accept_encoding, available)
+        if encoding == "identity":
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            if start_message is not None:
+                headers = {k.lower(): v for k, v in start_message["headers"]}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                body = message.get("body", b"")
+                should_compress = (
+                    not message.get("more_body", False)
+                    and b"content-encoding" not in headers
+                    and content_type.startswith(COMPRESSIBLE_TYPES)
+                    and len(body) >= self.minimum_size
+                )
+                if not should_compress:
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+
+                compressed = _compress(body, encoding)
+                raw_headers = [
+                    (k, v)
+                    for k, v in start_message["headers"]
+                    if k.lower() not in (b"content-length", b"vary")
+                ]
+                vary = headers.get(b"vary", b"")
+                vary = vary + b", Accept-Encoding" if vary else b"Accept-Encoding"
+                raw_headers += [
+                    (b"content-encoding", encoding.encode("latin-1")),
+                    (b"content-length", str(len(compressed)).encode("latin-1")),
+                    (b"vary", vary),
+                ]
+                start_message["headers"] = raw_headers
+                await send(start_message)
+                start_message = None
+                await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def _compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        # Quality 5 keeps per-request CPU low while still beating gzip on JSON
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
@@ -1,15 +1,18 @@
 """API route definitions for the Career Assistant Agent."""
 
+import orjson
 from datetime import datetime
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
 from models.schemas import (
     EmployerMessage,
+    JobRequest,
     AgentResponse,
     EvaluationDetail,
     EvaluationLog,
     ConfidenceDetail,
 )
-from agents.career_agent import CareerAgent
+from agents.career_agent import career_agents
 from agents.evaluator_agent import EvaluatorAgent
 from tools.unknown_detector import UnknownDetector
 from tools.email_tool import send_email
@@ -17,33 +20,191 @@ from tools.notification_tool import (
     notify_new_message,
     notify_response_sent,
     notify_unknown_question,
+    aggregator as notification_aggregator,
 )
-from data.memory import memory
+from data.memory import memories
+from data.logs import evaluation_logs
+from data.profile import DEFAULT_PROFILE_ID, profiles
+from data.search import conversation_index, log_index, make_snippet, tokenize
+from data.analytics import analytics, StageTimer
+from agents.usage import usage_tracker, budget
+from agents.preprocessor import preprocessor
+from agents.revision_policy import revision_policy
+from agents.llm_client import llm_client, LLMRequestError, LLMUnavailableError
+from circuit_breaker import breakers, llm_breaker
+from admission import admission, AdmissionRejected
+import jobs
+from jobs import report_progress
 from config import settings
+from responses import ORJSONResponse
 
-router = APIRouter(prefix="/api", tags=["Career Agent"])
+router = APIRouter(
+    prefix="/api", tags=["Career Agent"], default_response_class=ORJSONResponse
+)
 
-# Initialize agents (singleton instances)
-career_agent = CareerAgent()
+# Initialize agents (singleton instances); career agents are per profile,
+# built on demand by career_agents
 evaluator_agent = EvaluatorAgent()
 unknown_detector = UnknownDetector()
 
-# In-memory evaluation logs
-evaluation_logs: list[EvaluationLog] = []
+
+CANNED_ACKNOWLEDGEMENT = (
+    "Thank you for your message. I have received it and will get back to you "
+    "as soon as possible."
+)
+
+
+def _usage_for_log(request_usage: dict) -> dict:
+    return {"stages": request_usage["stages"], "total": request_usage["total"]}
+
+
+def require_profile(profile_id: str) -> None:
+    """Reject unknown profile ids with 404 before any work is done for them."""
+    if not profiles.exists(profile_id):
+        raise HTTPException(status_code=404, detail=f"Unknown profile '{profile_id}'")
 
 
 @router.get("/health")
 async def health_check():
-    """Simple health check endpoint."""
-    return {"status": "healthy", "service": "Career Assistant AI Agent"}
+    """Health check, including circuit breaker state for each dependency."""
+    degraded = any(b.state != "closed" for b in breakers.values())
+    return {
+        "status": "degraded" if degraded else "healthy",
+        "service": "Career Assistant AI Agent",
+        "breakers": {name: b.get_status() for name, b in breakers.items()},
+        "queued_jobs": (await jobs.queue.counts()).get("queued", 0) if jobs.queue else 0,
+        "admission": {
+            key: value
+            for key, value in admission.get_stats().items()
+            if key in ("in_flight", "queue_depth", "shed")
+        },
+    }
 
 
 @router.post("/message", response_model=AgentResponse)
 async def process_employer_message(message: EmployerMessage):
     """Main endpoint: process an employer message through the full agent pipeline.
 
+    Admission control bounds how many pipelines run at once; when saturated
+    the message is shed with 429/503 and a ``Retry-After`` header. While the
+    LLM provider is unavailable (circuit open, or a transient failure
+    mid-pipeline) the message is queued as a background job for automatic
+    retry and a canned acknowledgement is returned instead of waiting out
+    timeouts. A request the LLM rejects outright fails with 502.
+    """
+    require_profile(message.profile_id)
+    try:
+        async with admission.admit(message):
+            return await _process_admitted(message)
+    except AdmissionRejected as e:
+        return ORJSONResponse(
+            {"detail": f"{e.reason} — retry in {e.retry_after}s", "retry_after": e.retry_after},
+            status_code=e.status_code,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def process_inbound_message(message: EmployerMessage):
+    """Pipeline handler for the inbound mailbox connector.
+
+    The connector already bounds its own concurrency, so its messages wait
+    for a slot instead of being shed (a shed mail would never be re-fetched).
+    """
+    async with admission.admit(message, sheddable=False):
+        return await _process_admitted(message)
+
+
+async def process_job_message(message: EmployerMessage) -> dict:
+    """Pipeline handler for background jobs; returns the response payload.
+
+    Unlike the synchronous endpoint, an unavailable LLM is raised rather than
+    deferred, so the job queue keeps the job and retries it later.
+    """
+    async with admission.admit(message, sheddable=False):
+        if not llm_breaker.is_available():
+            raise LLMUnavailableError("LLM provider circuit is open")
+        response = await run_pipeline(message)
+    return orjson.loads(response.body)
+
+
+async def _process_admitted(message: EmployerMessage):
+    if not llm_breaker.is_available():
+        return await _defer_message(message, "LLM provider circuit is open")
+    try:
+        return await run_pipeline(message)
+    except LLMUnavailableError as e:
+        return await _defer_message(message, str(e))
+    except LLMRequestError as e:
+        # Retrying would fail the same way — report it instead of queueing
+        print(f"[PIPELINE] Failed message from {message.sender_email}: {e}")
+        return ORJSONResponse(
+            {
+                **_empty_result(message),
+                "status": "error",
+                "detail": str(e),
+                "error": str(e),
+            },
+            status_code=502,
+        )
+
+
+def _empty_result(message: EmployerMessage) -> dict:
+    return {
+        "status": "",
+        "response_text": "",
+        "evaluation": None,
+        "revision_count": 0,
+        "unknown_detection": None,
+        "confidence": None,
+        "escalation": None,
+        "email_result": None,
+        "notification_result": None,
+        "conversation_history": memories.get(message.profile_id).get_history(
+            message.sender_email
+        ),
+        "usage": None,
+        "error": None,
+    }
+
+
+async def _defer_message(message: EmployerMessage, reason: str):
+    """Queue a message as a delayed background job and flag it for human review.
+
+    Deferred messages live in the job database, so they survive restarts, are
+    retried at most JOB_MAX_ATTEMPTS times and go through admission control
+    like any other job.
+    """
+    if jobs.queue is None:
+        return ORJSONResponse(
+            {"detail": f"LLM unavailable and job workers are not running ({reason})"},
+            status_code=503,
+            headers={"Retry-After": str(int(settings.DEFERRED_RETRY_SECONDS))},
+        )
+    job_id = await jobs.queue.submit(
+        JobRequest(**message.model_dump()), delay=settings.DEFERRED_RETRY_SECONDS
+    )
+    print(f"[PIPELINE] Deferred message from {message.sender_email} as job {job_id}: {reason}")
+    # Skipped automatically if ntfy's own circuit is open
+    await notify_unknown_question(
+        message.sender_name, f"LLM unavailable — message queued for retry ({reason})"
+    )
+    return ORJSONResponse(
+        {
+            **_empty_result(message),
+            "status": "queued",
+            "response_text": CANNED_ACKNOWLEDGEMENT,
+            "job_id": job_id,
+            "error": reason,
+        }
+    )
+
+
+async def run_pipeline(message: EmployerMessage):
+    """Run the full agent pipeline for one message.
+
     Pipeline:
     1. Notify about new message (ntfy)
+    1b. Strip quotes/signatures; digest oversized messages once
     2. Check for unknown/risky questions
     3. Generate career agent response (with conversation context)
     4. Evaluate response (with revision loop)
@@ -53,11 +214,26 @@ async def process_employer_message(message: EmployerMessage):
     8. Log everything
     """
 
+    # Per-profile agent, conversation memory and log partition
+    career_agent = career_agents.get(message.profile_id)
+    memory = memories.get(message.profile_id)
+    logs = evaluation_logs.get(message.profile_id)
+
+    # Collect per-stage token usage and latency for this request
+    request_usage = usage_tracker.start_request(message.sender_email)
+    stage_timer = StageTimer(on_stage=report_progress)
+
     # Step 1: Notify about new incoming message
-    await notify_new_message(message.sender_name, message.subject)
+    stage_timer.start("notifying")
+    await notify_new_message(message.sender_name, message.sender_email, message.subject)
+
+    # Step 1b: Preprocess the input; every LLM call below uses prepared.text
+    stage_timer.start("preprocessing")
+    prepared = await preprocessor.prepare(message.message)
 
     # Step 2: Unknown question detection
-    detection_result = await unknown_detector.check(message.message)
+    stage_timer.start("detecting")
+    detection_result = await unknown_detector.check(prepared.text)
 
     # Build confidence detail (always returned, even for safe messages)
     confidence_detail = ConfidenceDetail(
@@ -77,11 +253,12 @@ async def process_employer_message(message: EmployerMessage):
         )
 
         # Store in memory (no response sent)
-        memory.add_entry(
+        stored_entry = memory.add_entry(
             sender_email=message.sender_email,
             employer_message=message.message,
             agent_response="",
             status="flagged_unknown",
+            subject=message.subject,
         )
 
         # Log the event
@@ -90,67 +267,181 @@ async def process_employer_message(message: EmployerMessage):
             sender_name=message.sender_name,
             sender_email=message.sender_email,
             subject=message.subject,
-            employer_message=message.message,
+            message_id=stored_entry.entry_id,
             status="flagged_unknown",
             unknown_detection=detection_result,
             confidence=confidence_detail,
+            usage=_usage_for_log(request_usage),
+            stage_latency_ms=stage_timer.stop(),
+            preprocessing=prepared.to_dict(),
         )
-        evaluation_logs.append(log_entry)
-
-        return AgentResponse(
-            status="flagged_unknown",
-            response_text="",
-            unknown_detection=detection_result,
-            confidence=confidence_detail,
-            conversation_history=conversation_history,
+        logs.append(log_entry, stored_entry.employer_message)
+
+        # Serialize directly — the payload is built from already-validated parts
+        return ORJSONResponse(
+            {
+                "status": "flagged_unknown",
+                "response_text": "",
+                "evaluation": None,
+                "revision_count": 0,
+                "unknown_detection": detection_result,
+                "confidence": confidence_detail.model_dump(),
+                "escalation": None,
+                "email_result": None,
+                "notification_result": None,
+                "conversation_history": conversation_history,
+                "usage": _usage_for_log(request_usage),
+                "error": None,
+            }
         )
 
     # Step 3: Generate initial response with conversation context
+    stage_timer.start("drafting")
+    use_fallback_evaluator = budget.use_cheap_evaluator()
+    # In session mode each agent keeps a chat for this request and later
+    # rounds send only the new feedback or draft
+    if settings.REVISION_MODE == "session":
+        career_session = career_agent.start_session()
+        evaluator_session = evaluator_agent.start_session(use_fallback_evaluator)
+    else:
+        career_session = evaluator_session = None
     conversation_context = memory.get_context_prompt(message.sender_email)
     response_text = await career_agent.generate_response(
-        message.message, conversation_context
+        prepared.text, conversation_context, session=career_session
     )
 
-    # Step 4: Evaluation loop
+    # Step 4: Evaluation loop (revisions and evaluator model follow the budget;
+    # the revision policy decides after each round whether revising is worth it)
     revision_count = 0
     evaluation_result = None
+    max_revisions = budget.max_revision_attempts()
+    score_history: list[float] = []
+    decision = "accept"
+    estimate: dict = {}
 
-    for attempt in range(settings.MAX_REVISION_ATTEMPTS + 1):
+    stage_timer.start("evaluating")
+    for attempt in range(max_revisions + 1):
         evaluation_result = await evaluator_agent.evaluate(
-            message.message, response_text
+            prepared.text,
+            response_text,
+            use_fallback_model=use_fallback_evaluator,
+            session=evaluator_session,
         )
-
-        if evaluation_result.approved:
+        score_history.append(evaluation_result.overall_score)
+
+        decision, estimate = revision_policy.decide(
+            category=confidence_detail.category,
+            round_index=attempt,
+            score=evaluation_result.overall_score,
+            approved=evaluation_result.approved,
+            remaining_revisions=max_revisions - attempt,
+        )
+        if decision != "revise":
             break
 
-        # If not approved and we have remaining attempts, revise
-        if attempt < settings.MAX_REVISION_ATTEMPTS:
-            revision_count += 1
-            response_text = await career_agent.revise_response(
-                message.message, response_text, evaluation_result.feedback
-            )
+        revision_count += 1
+        response_text = await career_agent.revise_response(
+            prepared.text, response_text, evaluation_result.feedback, session=career_session
+        )
+
+    if decision == "escalate":
+        # Draft is unlikely to converge — hand over to a human instead of
+        # spending more LLM calls. Escalated trajectories are not learned from,
+        # since they were cut short by the policy itself.
+        eval_detail = EvaluationDetail(**evaluation_result.to_dict())
+        escalation = {
+            "reason": (
+                f"Draft scored {evaluation_result.overall_score}/10 after "
+                f"{revision_count} revision(s); estimated approval chance "
+                f"{estimate['p_approve_eventually']:.0%}"
+            ),
+            **estimate,
+        }
+        await notify_unknown_question(message.sender_name, escalation["reason"])
+
+        stored_entry = memory.add_entry(
+            sender_email=message.sender_email,
+            employer_message=message.message,
+            agent_response="",
+            status="escalated",
+            subject=message.subject,
+        )
+
+        log_entry = EvaluationLog(
+            timestamp=datetime.now().isoformat(),
+            sender_name=message.sender_name,
+            sender_email=message.sender_email,
+            subject=message.subject,
+            message_id=stored_entry.entry_id,
+            response_text=response_text,
+            evaluation=eval_detail,
+            revision_count=revision_count,
+            score_history=score_history,
+            status="escalated",
+            confidence=confidence_detail,
+            escalation=escalation,
+            usage=_usage_for_log(request_usage),
+            stage_latency_ms=stage_timer.stop(),
+            preprocessing=prepared.to_dict(),
+        )
+        logs.append(log_entry, stored_entry.employer_message)
+
+        return ORJSONResponse(
+            {
+                "status": "escalated",
+                "response_text": "",
+                "evaluation": eval_detail.model_dump(),
+                "revision_count": revision_count,
+                "unknown_detection": None,
+                "confidence": confidence_detail.model_dump(),
+                "escalation": escalation,
+                "email_result": None,
+                "notification_result": None,
+                "conversation_history": conversation_history,
+                "usage": _usage_for_log(request_usage),
+                "error": None,
+            }
+        )
+
+    revision_policy.observe(
+        confidence_detail.category, score_history, evaluation_result.approved
+    )
 
     # Build evaluation detail
     eval_detail = EvaluationDetail(**evaluation_result.to_dict())
 
     # Step 5: Send email via Resend
+    stage_timer.start("sending")
     email_result = await send_email(
         to=message.sender_email,
         subject=f"Re: {message.subject}",
         body=response_text,
+        sender_name=career_agent.profile["name"],
+        from_email=career_agent.profile.get("sender_email"),
     )
 
-    # Step 6: Notify about sent response
-    notif_result = await notify_response_sent(
-        message.sender_name, evaluation_result.overall_score
-    )
+    # Step 6: Notify about sent response. An approved reply that was not
+    # delivered (Resend down or rejecting it) is kept as "unsent" and handed
+    # to a human to send, rather than recorded as answered.
+    status = "approved" if email_result.get("success") else "unsent"
+    if status == "approved":
+        notif_result = await notify_response_sent(
+            message.sender_name, message.sender_email, evaluation_result.overall_score
+        )
+    else:
+        notif_result = await notify_unknown_question(
+            message.sender_name,
+            f"Approved reply was not sent — send it manually ({email_result.get('error')})",
+        )
 
     # Step 7: Store in conversation memory
-    memory.add_entry(
+    stage_timer.start("storing")
+    stored_entry = memory.add_entry(
         sender_email=message.sender_email,
         employer_message=message.message,
         agent_response=response_text,
-        status="approved",
+        status=status,
+        subject=message.subject,
     )
 
     # Update conversation history (now includes this exchange)
@@ -162,66 +453,273 @@ async def process_employer_message(message: EmployerMessage):
         sender_name=message.sender_name,
         sender_email=message.sender_email,
         subject=message.subject,
-        employer_message=message.message,
+        message_id=stored_entry.entry_id,
         response_text=response_text,
         evaluation=eval_detail,
         revision_count=revision_count,
-        status="approved",
+        score_history=score_history,
+        status=status,
         confidence=confidence_detail,
+        usage=_usage_for_log(request_usage),
+        stage_latency_ms=stage_timer.stop(),
+        preprocessing=prepared.to_dict(),
     )
-    evaluation_logs.append(log_entry)
-
-    return AgentResponse(
-        status="approved",
-        response_text=response_text,
-        evaluation=eval_detail,
-        revision_count=revision_count,
-        email_result=email_result,
-        notification_result=notif_result,
-        confidence=confidence_detail,
-        conversation_history=conversation_history,
+    logs.append(log_entry, stored_entry.employer_message)
+
+    return ORJSONResponse(
+        {
+            "status": status,
+            "response_text": response_text,
+            "evaluation": eval_detail.model_dump(),
+            "revision_count": revision_count,
+            "unknown_detection": None,
+            "confidence": confidence_detail.model_dump(),
+            "escalation": None,
+            "email_result": email_result,
+            "notification_result": notif_result,
+            "conversation_history": conversation_history,
+            "usage": _usage_for_log(request_usage),
+            "error": None,
+        }
     )
 
 
 @router.get("/logs")
-async def get_evaluation_logs():
-    """Return all evaluation logs."""
-    return {
-        "total": len(evaluation_logs),
-        "logs": [log.model_dump() for log in reversed(evaluation_logs)],
-    }
+async def get_evaluation_logs(profile_id: Optional[str] = None):
+    """Return evaluation logs, newest first, for one profile or all of them."""
+    if profile_id is not None:
+        require_profile(profile_id)
+    # Returned as a Response so FastAPI skips jsonable_encoder on the stored dicts
+    return ORJSONResponse(
+        {
+            "total": evaluation_logs.total(profile_id),
+            "logs": evaluation_logs.newest_first(profile_id),
+        }
+    )
 
 
 @router.delete("/logs")
-async def clear_logs():
-    """Clear all evaluation logs."""
-    evaluation_logs.clear()
+async def clear_logs(profile_id: Optional[str] = None):
+    """Clear evaluation logs and their analytics, for one profile or all of them."""
+    if profile_id is not None:
+        require_profile(profile_id)
+        store = evaluation_logs.find(profile_id)
+        if store is not None:
+            store.clear()
+            # Rollups span all profiles; recount them from the remaining logs
+            evaluation_logs.rebuild_analytics()
+    else:
+        for store in evaluation_logs.all():
+            store.clear()
+        log_index.clear()
+        analytics.clear()
     return {"message": "Logs cleared successfully"}
 
 
-@router.get("/conversations")
-async def get_conversations():
-    """Return all conversation histories grouped by employer email."""
-    conversations = memory.get_all_conversations()
+@router.get("/revision-policy")
+async def get_revision_policy(category: Optional[str] = None):
+    """Return the learned revision policy estimates and decision counters."""
     return {
-        "total_employers": len(conversations),
-        "conversations": conversations,
+        **revision_policy.get_status(),
+        "estimates": revision_policy.get_table(category),
     }
 
 
-@router.get("/conversations/{email}")
-async def get_conversation_by_email(email: str):
-    """Return the conversation history for a specific employer."""
-    history = memory.get_history(email)
+@router.get("/stats")
+async def get_stats(
+    granularity: str = Query("hour", pattern="^(hour|day)$"),
+    since: Optional[str] = Query(None, description="ISO timestamp (or prefix) lower bound"),
+    until: Optional[str] = Query(None, description="ISO timestamp (or prefix) upper bound"),
+):
+    """Return hourly/daily evaluation rollups: scores, approval rate, histograms, latency."""
+    return ORJSONResponse(analytics.get_stats(granularity, since, until))
+
+
+@router.get("/admission/stats")
+async def get_admission_stats():
+    """Return in-flight count, queue depth per priority class and shed counters."""
+    return admission.get_stats()
+
+
+@router.get("/llm/stats")
+async def get_llm_stats():
+    """Return per-role LLM latency percentiles and request hedging counters."""
+    return llm_client.get_stats()
+
+
+@router.get("/usage")
+async def get_usage():
+    """Return token/cost aggregates per stage, sender and day, plus budget state."""
     return {
-        "email": email,
-        "total_messages": len(history),
-        "history": history,
+        **usage_tracker.get_summary(),
+        "budget": budget.get_status(),
     }
 
 
+@router.post("/maintenance/compact")
+async def compact_storage():
+    """Apply the retention policy to every profile's memory and evaluation logs."""
+    result = {"removed_entries": 0, "removed_senders": 0}
+    for memory in memories.all():
+        for key, removed in memory.compact().items():
+            result[key] = result.get(key, 0) + removed
+    result["removed_logs"] = sum(store.compact() for store in evaluation_logs.all())
+    if result["removed_logs"]:
+        evaluation_logs.rebuild_analytics()
+    return result
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """Return the available profile ids and agent cache counters."""
+    ids = profiles.list_ids()
+    return {"total": len(ids), "profiles": ids, "agent_cache": career_agents.get_stats()}
+
+
+@router.post("/profiles/{profile_id}/message", response_model=AgentResponse)
+async def process_profile_message(profile_id: str, message: EmployerMessage):
+    """Same as POST /api/message, addressed to the profile named in the path."""
+    message.profile_id = profile_id
+    return await process_employer_message(message)
+
+
+@router.get("/conversations")
+async def get_conversations(profile_id: str = DEFAULT_PROFILE_ID):
+    """Return all conversation histories grouped by employer email."""
+    require_profile(profile_id)
+    memory = memories.find(profile_id)
+    conversations = memory.get_all_conversations() if memory is not None else {}
+    return ORJSONResponse(
+        {
+            "total_employers": len(conversations),
+            "conversations": conversations,
+        }
+    )
+
+
+@router.get("/conversations/index")
+async def get_conversation_index(profile_id: str = DEFAULT_PROFILE_ID):
+    """Return lightweight per-employer summaries without message bodies."""
+    require_profile(profile_id)
+    memory = memories.find(profile_id)
+    index = memory.get_index() if memory is not None else []
+    return ORJSONResponse(
+        {
+            "total_employers": len(index),
+            "employers": index,
+        }
+    )
+
+
+@router.get("/conversations/{email}")
+async def get_conversation_by_email(
+    email: str,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    since: Optional[datetime] = Query(None, description="ISO timestamp lower bound"),
+    until: Optional[datetime] = Query(None, description="ISO timestamp upper bound"),
+    profile_id: str = DEFAULT_PROFILE_ID,
+):
+    """Return the conversation history for a specific employer (paginated/ranged)."""
+    require_profile(profile_id)
+    memory = memories.find(profile_id)
+    if memory is None:
+        history = []
+    else:
+        history = memory.get_history(
+            email,
+            offset=offset,
+            limit=limit,
+            since=since.isoformat() if since else None,
+            until=until.isoformat() if until else None,
+        )
+    return ORJSONResponse(
+        {
+            "email": email,
+            "total_messages": memory.count(email) if memory is not None else 0,
+            "offset": offset,
+            "history": history,
+        }
+    )
+
+
 @router.delete("/conversations")
-async def clear_conversations():
-    """Clear all conversation history."""
-    memory.clear()
+async def clear_conversations(profile_id: Optional[str] = None):
+    """Clear conversation history of one profile, or of all profiles."""
+    if profile_id is not None:
+        require_profile(profile_id)
+        memory = memories.find(profile_id)
+        if memory is not None:
+            memory.clear()
+    else:
+        for memory in memories.all():
+            memory.clear()
     return {"message": "Conversation history cleared successfully"}
+
+
+@router.get("/search")
+async def search(
+    q: str = Query(..., min_length=1, description="Search terms (all must match)"),
+    kind: Optional[str] = Query(None, pattern="^(conversation|log)$"),
+    sender_email: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None, description="ISO timestamp lower bound"),
+    until: Optional[datetime] = Query(None, description="ISO timestamp upper bound"),
+    profile_id: Optional[str] = Query(None),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+):
+    """Full-text search over conversations and evaluation logs, ranked by BM25."""
+    terms = tokenize(q)
+    filters = {
+        "sender_email": sender_email,
+        "status": status,
+        "since": since.timestamp() if since else None,
+        "until": until.timestamp() if until else None,
+        "profile_id": profile_id,
+        "top_k": offset + limit,
+    }
+    indexes = [i for i in (conversation_index, log_index) if kind in (None, i.kind)]
+
+    total = 0
+    hits = []
+    for index in indexes:
+        index_total, index_hits = index.search(terms, **filters)
+        total += index_total
+        hits.extend(
+            (score, created_at, index.kind, payload)
+            for score, created_at, _doc_id, payload in index_hits
+        )
+    hits.sort(key=lambda hit: (hit[0], hit[1]), reverse=True)
+
+    results = []
+    for score, _, hit_kind, payload in hits[offset : offset + limit]:
+        if hit_kind == "conversation":
+            hit_email, entry = payload
+            document = {"sender_email": hit_email, **entry.to_dict()}
+            text = f"{entry.employer_message}\n{entry.agent_response}"
+        else:
+            document = payload
+            text = f"{payload['employer_message']}\n{payload['response_text']}"
+        results.append(
+            {
+                "kind": hit_kind,
+                "score": round(score, 4),
+                "snippet": make_snippet(text, terms),
+                "document": document,
+            }
+        )
+
+    return ORJSONResponse({"query": q, "total": total, "offset": offset, "results": results})
+
+
+@router.get("/notifications/stats")
+async def get_notification_stats():
+    """Return ntfy digest counters (events received, pushes sent, pushes saved)."""
+    return notification_aggregator.get_stats()
+
+
+@router.post("/notifications/flush")
+async def flush_notifications():
+    """Send any pending digest notifications immediately."""
+    return await notification_aggregator.flush()
@@ -0,0 +1,8 @@
+import os
+import sys
+from pathlib import Path
+
+# Settings() requires the API keys at import time; tests never call the APIs
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("RESEND_API_KEY", "test")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,22 @@
+from agents.preprocessor import strip_signature
+
+
+def test_text_after_valediction_is_kept():
+    text = (
+        "Hi,\n\nWe loved your profile.\n\nThanks!\n\n"
+        "Also, what is your notice period\nand salary expectation\n"
+    )
+    assert strip_signature(text) == text.strip()
+
+
+def test_wrapped_lines_after_valediction_are_kept():
+    text = "Hi,\nQuick question.\nThanks\nLet me know\nwhen you are free"
+    assert strip_signature(text) == text
+
+
+def test_contact_block_is_stripped():
+    text = (
+        "Hi Deniz,\nCan we talk?\n\nBest regards,\nJane Smith\n"
+        "Senior Recruiter | Acme Inc.\n+1 555 123 4567\njane@acme.com"
+    )
+    assert strip_signature(text) == "Hi Deniz,\nCan we talk?\n\nBest regards,\nJane Smith"
@@ -0,0 +1,7 @@
+from data.search import make_snippet
+
+
+def test_snippet_offsets_survive_length_changing_casefold():
+    text = "Straße " * 200 + "Kubernetes experience" + " and more" * 40
+    snippet = make_snippet(text, ["kubernetes"])
+    assert "Kubernetes experience" in snippet
@@ -1,22 +1,39 @@
 """Email notification tool using Resend API (direct HTTP for UTF-8 support)."""
 
+import asyncio
+import html
+from typing import Optional
+
 import httpx
 from config import settings
+from cassette import cassettes
+from circuit_breaker import email_breaker, is_transient_error
+from data.profile import PROFILE_DATA
 
 RESEND_API_URL = "https://api.resend.com/emails"
 
 
-async def send_email(to: str, subject: str, body: str) -> dict:
+async def send_email(
+    to: str,
+    subject: str,
+    body: str,
+    sender_name: str = PROFILE_DATA["name"],
+    from_email: Optional[str] = None,
+) -> dict:
     """Send an email via Resend HTTP API.
 
     Args:
         to: Recipient email address.
         subject: Email subject line.
         body: Email body text (will be wrapped in HTML).
+        sender_name: Candidate the reply is sent for, shown in the header.
+        from_email: Sender address for this profile (defaults to FROM_EMAIL).
 
     Returns:
         dict with success status and message/error.
     """
+    from_email = from_email or settings.FROM_EMAIL
+
     # Convert plain text body to simple HTML
     html_body = f"""
     <div style="font-family: 'Segoe UI', Arial, sans-serif; max-width: 600px; margin: 0 auto;
@@ -24,7 +41,7 @@ async def send_email(to: str, subject: str, body: str) -> dict:
         <div style="border-bottom: 3px solid #6c63ff; padding-bottom: 16px; margin-bottom: 24px;">
             <h2 style="margin: 0; color: #6c63ff;">Career Agent Response</h2>
             <p style="margin: 4px 0 0; color: #888; font-size: 14px;">
-                Automated response from Deniz Buyuksahin's Career Assistant
+                Automated response from {html.escape(sender_name)}'s Career Assistant
             </p>
         </div>
         <div style="white-space: pre-wrap; font-size: 15px;">
@@ -41,21 +58,28 @@ async def send_email(to: str, subject: str, body: str) -> dict:
     # Resend test domain (onboarding@resend.dev) can ONLY send to the account owner.
     # Redirect to NOTIFY_EMAIL when using the test domain.
     actual_to = to
-    if "resend.dev" in settings.FROM_EMAIL:
+    if "resend.dev" in from_email:
         actual_to = settings.NOTIFY_EMAIL
         print(f"[EMAIL] Test domain detected — redirecting to {actual_to} (original: {to})")
 
     payload = {
-        "from": settings.FROM_EMAIL,
+        "from": from_email,
         "to": [actual_to],
         "subject": subject,
         "html": html_body,
     }
 
-    print(f"[EMAIL] Sending to: {to}, from: {settings.FROM_EMAIL}, subject: {subject}")
+    # Fail fast while Resend is known to be down
+    if not email_breaker.allow():
+        print(f"[EMAIL] Circuit open — skipping email to {to}")
+        return {"success": False, "skipped": True, "error": "Email delivery circuit open"}
+
+    print(f"[EMAIL] Sending to: {to}, from: {from_email}, subject: {subject}")
 
     try:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(
+            timeout=settings.HTTP_TIMEOUT_SECONDS, transport=cassettes.http_transport()
+        ) as client:
             response = await client.post(
                 RESEND_API_URL,
                 json=payload,
@@ -66,6 +90,12 @@ async def send_email(to: str, subject: str, body: str) -> dict:
             )
             print(f"[EMAIL] Resend status: {response.status_code}, body: {response.text}")
 
+            # Only server-side errors and throttling count against the breaker
+            if response.status_code >= 500 or response.status_code == 429:
+                email_breaker.record_failure(f"status {response.status_code}")
+            else:
+                email_breaker.record_success()
+
             if response.status_code in (200, 202):
                 result = response.json()
                 return {
@@ -78,6 +108,14 @@ async def send_email(to: str, subject: str, body: str) -> dict:
                     "success": False,
                     "error": f"Resend returned status {response.status_code}: {response.text}",
                 }
+    except asyncio.CancelledError:
+        # No outcome: give back a half-open probe slot so the circuit can recover
+        email_breaker.release()
+        raise
     except Exception as e:
+        if is_transient_error(e):
+            email_breaker.record_failure(str(e))
+        else:
+            email_breaker.release()
         print(f"[EMAIL] Exception: {e}")
         return {"success": False, "error": str(e)}
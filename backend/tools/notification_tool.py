@@ -1,7 +1,10 @@
 """Mobile notification tool using ntfy.sh — free push notification service."""
 
+import asyncio
 import httpx
 from config import settings
+from cassette import cassettes
+from circuit_breaker import notification_breaker, is_transient_error
 
 NTFY_BASE_URL = "https://ntfy.sh"
 
@@ -31,13 +34,23 @@ async def send_notification(
         "Tags": tags,
     }
 
+    # Skip notifications while ntfy is known to be down
+    if not notification_breaker.allow():
+        return {"success": False, "skipped": True, "error": "Notification circuit open"}
+
     try:
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(
+            timeout=settings.HTTP_TIMEOUT_SECONDS, transport=cassettes.http_transport()
+        ) as client:
             response = await client.post(
                 url,
                 content=message.encode("utf-8"),
                 headers=headers,
             )
+            if response.status_code >= 500 or response.status_code == 429:
+                notification_breaker.record_failure(f"status {response.status_code}")
+            else:
+                notification_breaker.record_success()
             if response.status_code == 200:
                 return {"success": True, "message": "Notification sent successfully"}
             else:
@@ -45,33 +58,184 @@ async def send_notification(
                     "success": False,
                     "error": f"ntfy returned status {response.status_code}: {response.text}",
                 }
+    except asyncio.CancelledError:
+        # No outcome: give back a half-open probe slot so the circuit can recover
+        notification_breaker.release()
+        raise
     except Exception as e:
+        if is_transient_error(e):
+            notification_breaker.record_failure(str(e))
+        else:
+            notification_breaker.release()
         return {"success": False, "error": str(e)}
 
 
-async def notify_new_message(sender_name: str, subject: str) -> dict:
-    """Send notification when a new employer message arrives."""
-    return await send_notification(
-        title="New Employer Message",
-        message=f"From: {sender_name}\nSubject: {subject}",
-        priority="high",
-        tags="briefcase,incoming_envelope",
+class NotificationAggregator:
+    """Coalesces low-priority ntfy pushes into periodic digest notifications.
+
+    Urgent events bypass the buffer and are pushed immediately. Everything else
+    is held for up to ``window_seconds`` (or until ``max_batch`` events are
+    pending) and then sent as a single digest push. Events are deduplicated per
+    sender email and event kind, so a burst from one recruiter collapses into
+    one line. With the digest disabled every event is pushed on its own, with
+    the title, priority and tags of its kind.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = settings.NTFY_DIGEST_WINDOW_SECONDS,
+        max_batch: int = settings.NTFY_DIGEST_MAX_BATCH,
+        enabled: bool = settings.NTFY_DIGEST_ENABLED,
+    ):
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.enabled = enabled
+        # (kind, sender_email) -> {"line": str, "count": int}; dicts keep insertion order
+        self._pending: dict[tuple[str, str], dict] = {}
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self.events_received = 0
+        self.events_deduplicated = 0
+        self.pushes_sent = 0
+        self.pushes_failed = 0
+        self.digests_sent = 0
+
+    async def _push(self, title: str, message: str, priority: str, tags: str) -> dict:
+        result = await send_notification(title, message, priority, tags)
+        # Skipped (circuit open) and rejected pushes never reached the phone
+        if result.get("success"):
+            self.pushes_sent += 1
+        else:
+            self.pushes_failed += 1
+        return result
+
+    async def send_immediate(self, title: str, message: str, priority: str, tags: str) -> dict:
+        """Push a notification right away, bypassing the digest buffer."""
+        self.events_received += 1
+        return await self._push(title, message, priority, tags)
+
+    async def enqueue(self, kind: str, sender_email: str, line: str) -> dict:
+        """Buffer a low-priority event for the next digest.
+
+        Args:
+            kind: Event type used for dedup and grouping (e.g. 'new_message').
+            sender_email: Sender the event is about — repeated events per sender are merged.
+            line: Human-readable digest line for this event.
+
+        Returns:
+            dict describing whether the event was queued or sent.
+        """
+        self.events_received += 1
+
+        if not self.enabled:
+            title, priority, tags = _EVENT_NOTIFICATIONS.get(kind, _DEFAULT_NOTIFICATION)
+            return await self._push(title, line, priority, tags)
+
+        async with self._lock:
+            key = (kind, sender_email.lower())
+            if key in self._pending:
+                self._pending[key]["line"] = line
+                self._pending[key]["count"] += 1
+                self.events_deduplicated += 1
+            else:
+                self._pending[key] = {"line": line, "count": 1}
+
+            batch_full = len(self._pending) >= self.max_batch
+            if not batch_full and self._flush_task is None:
+                self._flush_task = asyncio.create_task(self._flush_after_window())
+
+        if batch_full:
+            return await self.flush()
+
+        return {"success": True, "message": "Queued for digest notification", "queued": True}
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self.window_seconds)
+        self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> dict:
+        """Send all pending events as one digest push (no-op when nothing is pending)."""
+        async with self._lock:
+            pending = self._pending
+            self._pending = {}
+            if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+                self._flush_task.cancel()
+            self._flush_task = None
+
+        if not pending:
+            return {"success": True, "message": "Nothing to flush"}
+
+        lines = []
+        for (kind, _sender), event in pending.items():
+            suffix = f" (x{event['count']})" if event["count"] > 1 else ""
+            lines.append(f"- {event['line']}{suffix}")
+
+        total = sum(e["count"] for e in pending.values())
+        result = await self._push(
+            title=f"Career Agent Digest ({total} events)",
+            message="\n".join(lines),
+            priority="default",
+            tags="inbox_tray",
+        )
+        if result.get("success"):
+            self.digests_sent += 1
+        return result
+
+    def get_stats(self) -> dict:
+        """Return counters describing how many pushes the digest has saved."""
+        return {
+            "enabled": self.enabled,
+            "window_seconds": self.window_seconds,
+            "max_batch": self.max_batch,
+            "events_received": self.events_received,
+            "events_deduplicated": self.events_deduplicated,
+            "events_pending": sum(e["count"] for e in self._pending.values()),
+            "pushes_sent": self.pushes_sent,
+            "pushes_failed": self.pushes_failed,
+            "digests_sent": self.digests_sent,
+            "pushes_saved": max(
+                0,
+                self.events_received
+                - self.pushes_sent
+                - self.pushes_failed
+                - sum(e["count"] for e in self._pending.values()),
+            ),
+        }
+
+
+# Title, priority and tags per event kind when pushed on its own (digest disabled)
+_EVENT_NOTIFICATIONS = {
+    "new_message": ("New Employer Message", "high", "briefcase,incoming_envelope"),
+    "response_sent": ("Response Sent", "default", "white_check_mark,email"),
+}
+_DEFAULT_NOTIFICATION = ("Career Agent", "default", "")
+
+# Singleton instance
+aggregator = NotificationAggregator()
+
+
+async def notify_new_message(sender_name: str, sender_email: str, subject: str) -> dict:
+    """Queue a digest notification when a new employer message arrives."""
+    return await aggregator.enqueue(
+        kind="new_message",
+        sender_email=sender_email,
+        line=f"New message from {sender_name}: {subject}",
     )
 
 
-async def notify_response_sent(sender_name: str, score: float) -> dict:
-    """Send notification when a response is approved and sent."""
-    return await send_notification(
-        title="Response Sent",
-        message=f"Reply sent to {sender_name}\nEvaluation Score: {score}/10",
-        priority="default",
-        tags="white_check_mark,email",
+async def notify_response_sent(sender_name: str, sender_email: str, score: float) -> dict:
+    """Queue a digest notification when a response is approved and sent."""
+    return await aggregator.enqueue(
+        kind="response_sent",
+        sender_email=sender_email,
+        line=f"Reply sent to {sender_name} (score {score}/10)",
     )
 
 
 async def notify_unknown_question(sender_name: str, reason: str) -> dict:
-    """Send notification when an unknown question is detected."""
-    return await send_notification(
+    """Send an immediate notification when an unknown question is detected."""
+    return await aggregator.send_immediate(
         title="Human Intervention Needed",
         message=f"From: {sender_name}\nReason: {reason}\n\nPlease review and respond manually.",
         priority="urgent",
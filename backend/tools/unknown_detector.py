@@ -3,9 +3,13 @@
 import json
 import google.generativeai as genai
 from config import settings
+from agents.usage import usage_tracker
+from agents.llm_client import llm_client
 
 genai.configure(api_key=settings.GEMINI_API_KEY)
 
+MODEL_NAME = "gemini-2.0-flash"
+
 DETECTION_PROMPT = """You are an Unknown Question Detector for a Career Assistant AI Agent.
 Your job is to analyze incoming employer messages and determine if the question/request
 is something the AI agent can safely and confidently handle.
@@ -51,7 +55,7 @@ class UnknownDetector:
 
     def __init__(self):
         self.model = genai.GenerativeModel(
-            model_name="gemini-2.0-flash",
+            model_name=MODEL_NAME,
             system_instruction=DETECTION_PROMPT,
         )
 
@@ -64,9 +68,10 @@ class UnknownDetector:
         Returns:
             dict with is_unknown, confidence, reason, and category fields.
         """
-        response = self.model.generate_content(
-            f"Analyze this employer message:\n\n{employer_message}"
+        response = await llm_client.generate(
+            "detector", self.model, f"Analyze this employer message:\n\n{employer_message}"
         )
+        usage_tracker.record("detection", MODEL_NAME, response)
         raw_text = response.text.strip()
 
         # Parse JSON (handle markdown code blocks)
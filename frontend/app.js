@@ -28,10 +28,7 @@ async function handleSubmit(event) {
     submitBtn.disabled = true;
 
     try {
-        // Animate pipeline steps
-        animatePipeline();
-
-        const response = await fetch(`${API_BASE}/api/message`, {
+        const response = await fetch(`${API_BASE}/api/jobs`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify(payload),
@@ -42,9 +39,10 @@ async function handleSubmit(event) {
             throw new Error(errData.detail || `Server error: ${response.status}`);
         }
 
-        const data = await response.json();
+        const job = await response.json();
+        const data = await waitForJob(job.job_id);
         showResponse(data);
-        refreshLogs();
+        if (!eventsConnected) refreshLogs();
     } catch (error) {
         console.error('Error:', error);
         showErrorResponse(error.message);
@@ -53,6 +51,41 @@ async function handleSubmit(event) {
     }
 }
 
+// ========== Job Polling ==========
+const JOB_POLL_INTERVAL_MS = 1000;
+
+// Pipeline stage reported by the job API -> loading step number (1–5)
+const STAGE_STEPS = {
+    notifying: 1,
+    preprocessing: 2,
+    detecting: 2,
+    drafting: 3,
+    evaluating: 4,
+    sending: 5,
+    storing: 5,
+};
+
+async function waitForJob(jobId) {
+    while (true) {
+        const response = await fetch(`${API_BASE}/api/jobs/${jobId}`);
+        if (!response.ok) {
+            throw new Error(`Server error: ${response.status}`);
+        }
+
+        const job = await response.json();
+        if (job.status === 'completed') {
+            updatePipeline(6);
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Processing failed');
+        }
+
+        updatePipeline(STAGE_STEPS[job.stage] || 0);
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+}
+
 // ========== Loading Animation ==========
 function showLoading() {
     document.getElementById('formSection').classList.add('hidden');
@@ -66,19 +99,11 @@ function showLoading() {
     }
 }
 
-function animatePipeline() {
-    const delays = [300, 1500, 3000, 5000, 7000];
-    const doneDelays = [1400, 2900, 4900, 6900, 9000];
-
-    for (let i = 0; i < 5; i++) {
-        setTimeout(() => {
-            document.getElementById(`step${i + 1}`).classList.add('active');
-        }, delays[i]);
-
-        setTimeout(() => {
-            document.getElementById(`step${i + 1}`).classList.remove('active');
-            document.getElementById(`step${i + 1}`).classList.add('done');
-        }, doneDelays[i]);
+function updatePipeline(activeStep) {
+    for (let i = 1; i <= 5; i++) {
+        const step = document.getElementById(`step${i}`);
+        step.classList.toggle('done', i < activeStep);
+        step.classList.toggle('active', i === activeStep);
     }
 }
 
@@ -93,15 +118,21 @@ function showResponse(data) {
     // Show conversation thread if history exists
     showConversationThread(data.conversation_history);
 
-    if (data.status === 'flagged_unknown') {
+    if (data.status === 'flagged_unknown' || data.status === 'escalated') {
         showUnknownResponse(data);
         return;
     }
 
+    if (data.status === 'queued') {
+        showQueuedResponse(data);
+        return;
+    }
+
     // Response text
     document.getElementById('responseTitle').textContent = 'Response Generated';
-    document.getElementById('responseSubtitle').textContent =
-        'Evaluated and approved by the critic agent';
+    document.getElementById('responseSubtitle').textContent = data.status === 'unsent'
+        ? 'Approved, but the email could not be sent — flagged for manual sending'
+        : 'Evaluated and approved by the critic agent';
     document.getElementById('responseBody').textContent = data.response_text;
     document.getElementById('responseBody').classList.remove('hidden');
 
@@ -155,13 +186,28 @@ function showUnknownResponse(data) {
     const alert = document.getElementById('unknownAlert');
     alert.classList.remove('hidden');
 
-    if (data.unknown_detection) {
+    if (data.escalation) {
+        // Draft did not converge during revisions — handed over to a human
+        document.getElementById('unknownReason').textContent = data.escalation.reason;
+        document.getElementById('unknownCategory').textContent = 'escalated';
+    } else if (data.unknown_detection) {
         document.getElementById('unknownReason').textContent = data.unknown_detection.reason;
         document.getElementById('unknownCategory').textContent =
             data.unknown_detection.category || 'unknown';
     }
 }
 
+function showQueuedResponse(data) {
+    // LLM provider unavailable — message queued for automatic retry
+    document.getElementById('responseTitle').textContent = 'Message Queued';
+    document.getElementById('responseSubtitle').textContent =
+        'The AI service is temporarily unavailable; the message will be processed automatically';
+    document.getElementById('responseBody').textContent = data.response_text;
+    document.getElementById('responseBody').classList.remove('hidden');
+    document.getElementById('evalSection').classList.add('hidden');
+    document.getElementById('unknownAlert').classList.add('hidden');
+}
+
 function showErrorResponse(message) {
     document.getElementById('loadingSection').classList.add('hidden');
     document.getElementById('responseSection').classList.remove('hidden');
@@ -334,59 +380,140 @@ function toggleHistory() {
     const historySection = document.getElementById('historySection');
     historySection.classList.toggle('hidden');
 
-    if (!historySection.classList.contains('hidden')) {
+    // With the event channel up, the local store is already current
+    if (!historySection.classList.contains('hidden') && !(store.employers && eventsConnected)) {
         refreshHistory();
     }
 }
 
 async function refreshHistory() {
     try {
-        const resp = await fetch(`${API_BASE}/api/conversations`);
+        const resp = await fetch(`${API_BASE}/api/conversations/index`);
         const data = await resp.json();
 
-        const container = document.getElementById('historyContainer');
+        store.employers = new Map(data.employers.map(summary => [summary.email, summary]));
+        renderHistory();
+    } catch (error) {
+        console.error('Failed to refresh history:', error);
+    }
+}
+
+function renderHistory() {
+    const container = document.getElementById('historyContainer');
+
+    if (store.employers.size === 0) {
+        container.innerHTML = `
+            <div class="empty-logs">
+                <p>No conversations yet. Process a message to start tracking.</p>
+            </div>`;
+        return;
+    }
+
+    container.innerHTML = [...store.employers.values()].map(renderEmployer).join('');
+}
 
-        if (data.total_employers === 0) {
-            container.innerHTML = `
-                <div class="empty-logs">
-                    <p>No conversations yet. Process a message to start tracking.</p>
-                </div>`;
-            return;
+function renderEmployer(summary) {
+    const time = new Date(summary.last_timestamp).toLocaleString();
+    const statusIcon = summary.last_status === 'approved' ? '✓' : '⚠';
+    const count = summary.message_count;
+
+    return `
+        <div class="history-employer" data-email="${escapeHtml(summary.email)}">
+            <div class="history-employer-header" onclick="toggleThread(this.parentElement)">
+                <span class="history-employer-email">${escapeHtml(summary.email)}</span>
+                <span class="history-employer-count">${count} message${count !== 1 ? 's' : ''}</span>
+            </div>
+            <div class="history-exchange-time">${time} ${statusIcon} ${escapeHtml(summary.last_subject || '')}</div>
+            <div class="history-thread hidden"></div>
+        </div>`;
+}
+
+function renderExchange(entry) {
+    const time = new Date(entry.timestamp).toLocaleString();
+    const snippet = entry.employer_message.length > 80
+        ? entry.employer_message.substring(0, 80) + '...'
+        : entry.employer_message;
+    const statusIcon = entry.status === 'approved' ? '✓' : '⚠';
+
+    return `
+        <div class="history-exchange" data-message-id="${entry.message_id}">
+            <div class="history-exchange-time">${time} ${statusIcon}</div>
+            <div class="history-exchange-snippet">${escapeHtml(snippet)}</div>
+        </div>`;
+}
+
+// Move the employer to the top with its new summary; extend its thread if open
+function applyConversationEvent({ summary, entry }) {
+    const container = document.getElementById('historyContainer');
+    const existing = container.querySelector(`.history-employer[data-email="${CSS.escape(summary.email)}"]`);
+    const thread = existing?.querySelector('.history-thread');
+
+    store.employers.delete(summary.email);
+    store.employers = new Map([[summary.email, summary], ...store.employers]);
+    if (store.employers.size === 1) {
+        container.innerHTML = '';
+    }
+
+    const template = document.createElement('template');
+    template.innerHTML = renderEmployer(summary).trim();
+    const employerEl = template.content.firstChild;
+    if (thread) {
+        // Keep the loaded thread; append the entry when every page is already shown
+        employerEl.replaceChild(thread, employerEl.querySelector('.history-thread'));
+        if (thread.dataset.loaded && !thread.querySelector('.history-more')
+            && !thread.querySelector(`[data-message-id="${entry.message_id}"]`)) {
+            thread.insertAdjacentHTML('beforeend', renderExchange(entry));
         }
+    }
+    existing?.remove();
+    container.prepend(employerEl);
+}
 
-        container.innerHTML = Object.entries(data.conversations).map(([email, entries]) => {
-            const exchangesHtml = entries.map(entry => {
-                const time = new Date(entry.timestamp).toLocaleString();
-                const snippet = entry.employer_message.length > 80
-                    ? entry.employer_message.substring(0, 80) + '...'
-                    : entry.employer_message;
-                const statusIcon = entry.status === 'approved' ? '✓' : '⚠';
-
-                return `
-                    <div class="history-exchange">
-                        <div class="history-exchange-time">${time} ${statusIcon}</div>
-                        <div class="history-exchange-snippet">${escapeHtml(snippet)}</div>
-                    </div>`;
-            }).join('');
-
-            return `
-                <div class="history-employer">
-                    <div class="history-employer-header">
-                        <span class="history-employer-email">${escapeHtml(email)}</span>
-                        <span class="history-employer-count">${entries.length} message${entries.length !== 1 ? 's' : ''}</span>
-                    </div>
-                    ${exchangesHtml}
-                </div>`;
-        }).join('');
+const HISTORY_PAGE_SIZE = 20;
+
+async function toggleThread(employerEl) {
+    const thread = employerEl.querySelector('.history-thread');
+    thread.classList.toggle('hidden');
+
+    // Load the first page lazily, only on first expand
+    if (!thread.classList.contains('hidden') && !thread.dataset.loaded) {
+        thread.dataset.loaded = 'true';
+        await loadThreadPage(employerEl, 0);
+    }
+}
+
+async function loadThreadPage(employerEl, offset) {
+    const email = employerEl.dataset.email;
+    const thread = employerEl.querySelector('.history-thread');
+
+    try {
+        const resp = await fetch(
+            `${API_BASE}/api/conversations/${encodeURIComponent(email)}?offset=${offset}&limit=${HISTORY_PAGE_SIZE}`
+        );
+        const data = await resp.json();
+
+        thread.querySelector('.history-more')?.remove();
+        thread.insertAdjacentHTML('beforeend', data.history
+            .filter(entry => !thread.querySelector(`[data-message-id="${entry.message_id}"]`))
+            .map(renderExchange).join(''));
+
+        const nextOffset = offset + data.history.length;
+        if (nextOffset < data.total_messages) {
+            const more = document.createElement('button');
+            more.className = 'btn btn-ghost history-more';
+            more.textContent = `Load more (${data.total_messages - nextOffset} remaining)`;
+            more.onclick = () => loadThreadPage(employerEl, nextOffset);
+            thread.appendChild(more);
+        }
     } catch (error) {
-        console.error('Failed to refresh history:', error);
+        console.error('Failed to load conversation thread:', error);
     }
 }
 
 async function clearHistory() {
     try {
         await fetch(`${API_BASE}/api/conversations`, { method: 'DELETE' });
-        refreshHistory();
+        if (!eventsConnected) refreshHistory();
     } catch (error) {
         console.error('Failed to clear history:', error);
     }
@@ -398,7 +525,12 @@ function toggleLogs() {
     logsSection.classList.toggle('hidden');
 
     if (!logsSection.classList.contains('hidden')) {
-        refreshLogs();
+        // With the event channel up, the local store is already current
+        if (store.logs && eventsConnected) {
+            refreshStats();
+        } else {
+            refreshLogs();
+        }
     }
 }
 
@@ -407,54 +539,259 @@ async function refreshLogs() {
         const resp = await fetch(`${API_BASE}/api/logs`);
         const data = await resp.json();
 
-        document.getElementById('logCount').textContent = data.total;
-        const container = document.getElementById('logsContainer');
+        store.logs = data.logs;
+        store.logIds = new Set(data.logs.map(log => log.log_id));
+        renderLogs();
+        refreshStats();
+    } catch (error) {
+        console.error('Failed to refresh logs:', error);
+    }
+}
 
-        if (data.total === 0) {
-            container.innerHTML = `
-                <div class="empty-logs">
-                    <p>No logs yet. Process a message to see evaluation history.</p>
-                </div>`;
-            return;
-        }
+function renderLogs() {
+    document.getElementById('logCount').textContent = store.logs.length;
+    const container = document.getElementById('logsContainer');
 
-        container.innerHTML = data.logs.map(log => {
-            const time = new Date(log.timestamp).toLocaleString();
-            const statusClass = log.status === 'approved' ? 'approved' : 'flagged';
-            const statusLabel = log.status === 'approved' ? 'Approved' : 'Flagged';
-            const scoreText = log.evaluation
-                ? `Score: ${log.evaluation.overall_score.toFixed(1)}/10`
-                : '';
-            const confText = log.confidence
-                ? `Conf: ${Math.round(log.confidence.confidence * 100)}%`
-                : '';
-
-            return `
-                <div class="log-entry">
-                    <div class="log-header">
-                        <span class="log-sender">${escapeHtml(log.sender_name)}</span>
-                        <span class="log-time">${time}</span>
-                    </div>
-                    <div class="log-subject">${escapeHtml(log.subject)}</div>
-                    <div class="log-meta">
-                        <span class="log-badge ${statusClass}">${statusLabel}</span>
-                        ${scoreText ? `<span class="log-badge score">${scoreText}</span>` : ''}
-                        ${confText ? `<span class="log-badge score">${confText}</span>` : ''}
-                        ${log.revision_count > 0
-                    ? `<span class="log-badge score">${log.revision_count} revision(s)</span>`
-                    : ''}
-                    </div>
-                </div>`;
-        }).join('');
+    if (store.logs.length === 0) {
+        container.innerHTML = `
+            <div class="empty-logs">
+                <p>No logs yet. Process a message to see evaluation history.</p>
+            </div>`;
+        return;
+    }
+
+    container.innerHTML = store.logs.map(renderLogEntry).join('');
+}
+
+function renderLogEntry(log) {
+    const time = new Date(log.timestamp).toLocaleString();
+    const statusClass = log.status === 'approved' ? 'approved' : 'flagged';
+    const statusLabel = log.status === 'approved'
+        ? 'Approved'
+        : log.status === 'escalated' ? 'Escalated'
+        : log.status === 'unsent' ? 'Unsent' : 'Flagged';
+    const scoreText = log.evaluation
+        ? `Score: ${log.evaluation.overall_score.toFixed(1)}/10`
+        : '';
+    const confText = log.confidence
+        ? `Conf: ${Math.round(log.confidence.confidence * 100)}%`
+        : '';
+
+    return `
+        <div class="log-entry">
+            <div class="log-header">
+                <span class="log-sender">${escapeHtml(log.sender_name)}</span>
+                <span class="log-time">${time}</span>
+            </div>
+            <div class="log-subject">${escapeHtml(log.subject)}</div>
+            <div class="log-meta">
+                <span class="log-badge ${statusClass}">${statusLabel}</span>
+                ${scoreText ? `<span class="log-badge score">${scoreText}</span>` : ''}
+                ${confText ? `<span class="log-badge score">${confText}</span>` : ''}
+                ${log.revision_count > 0
+            ? `<span class="log-badge score">${log.revision_count} revision(s)</span>`
+            : ''}
+            </div>
+        </div>`;
+}
+
+function applyLogEvent(log) {
+    // Already included by a full fetch that raced with the event
+    if (store.logIds.has(log.log_id)) {
+        return;
+    }
+    store.logIds.add(log.log_id);
+    store.logs.unshift(log);
+
+    const container = document.getElementById('logsContainer');
+    if (store.logs.length === 1) {
+        container.innerHTML = '';
+    }
+    container.insertAdjacentHTML('afterbegin', renderLogEntry(log));
+    document.getElementById('logCount').textContent = store.logs.length;
+    scheduleStatsRefresh();
+}
+
+// ========== Live Updates ==========
+// Local copies of the dashboard data, kept current by /api/events deltas
+const store = {
+    logs: null,        // newest first, as returned by /api/logs
+    logIds: new Set(),
+    employers: null,   // Map email -> summary, most recently active first
+};
+
+let eventsConnected = false;
+let eventsRetryMs = 1000;
+const EVENTS_MAX_RETRY_MS = 30000;
+const STATS_REFRESH_DELAY_MS = 2000;
+let statsRefreshTimer = null;
+
+function connectEvents() {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const socket = new WebSocket(`${protocol}//${window.location.host}/api/events`);
+
+    socket.onopen = () => {
+        eventsConnected = true;
+        eventsRetryMs = 1000;
+        // (Re)load after subscribing, so nothing published in between is missed;
+        // events that raced with the fetch are deduplicated
+        refreshLogs();
+        if (store.employers) refreshHistory();
+    };
+    socket.onmessage = (message) => handleEvent(JSON.parse(message.data));
+    socket.onclose = () => {
+        // Without the channel, fall back to fetching on demand
+        if (store.logs === null) refreshLogs();
+        eventsConnected = false;
+        setTimeout(connectEvents, eventsRetryMs);
+        eventsRetryMs = Math.min(eventsRetryMs * 2, EVENTS_MAX_RETRY_MS);
+    };
+}
+
+function handleEvent(event) {
+    switch (event.type) {
+        case 'log':
+            if (store.logs) applyLogEvent(event.data);
+            break;
+        case 'conversation':
+            // The history panel shows the default profile
+            if (store.employers && event.profile_id === 'default') applyConversationEvent(event.data);
+            break;
+        case 'reset':
+            if (event.data.scope === 'logs' && store.logs) refreshLogs();
+            if (event.data.scope === 'conversations' && store.employers) refreshHistory();
+            break;
+        case 'resync':
+            resyncStores();
+            break;
+    }
+}
+
+function resyncStores() {
+    if (store.logs) refreshLogs();
+    if (store.employers) refreshHistory();
+}
+
+// New logs arrive in bursts; re-read the rollups once things settle
+function scheduleStatsRefresh() {
+    clearTimeout(statsRefreshTimer);
+    statsRefreshTimer = setTimeout(refreshStats, STATS_REFRESH_DELAY_MS);
+}
+
+// ========== Stats Charts ==========
+let statsGranularity = 'hour';
+
+// Most recent buckets shown in the volume / approval-rate chart
+const STATS_SERIES_BUCKETS = 24;
+
+function setStatsGranularity(granularity) {
+    statsGranularity = granularity;
+    document.querySelectorAll('.stats-granularity').forEach(btn => {
+        btn.classList.toggle('active', btn.dataset.granularity === granularity);
+    });
+    refreshStats();
+}
+
+async function refreshStats() {
+    if (document.getElementById('logsSection').classList.contains('hidden')) {
+        return;
+    }
+    try {
+        const resp = await fetch(`${API_BASE}/api/stats?granularity=${statsGranularity}`);
+        renderStats(await resp.json());
     } catch (error) {
-        console.error('Failed to refresh logs:', error);
+        console.error('Failed to refresh stats:', error);
+    }
+}
+
+function renderStats(stats) {
+    const container = document.getElementById('statsContainer');
+    const totals = stats.totals;
+
+    if (totals.count === 0) {
+        container.innerHTML = '<p class="stats-empty">No data yet.</p>';
+        return;
+    }
+
+    const scoreRows = stats.criteria.map(c => ({
+        label: c,
+        value: totals.avg_scores[c] || 0,
+        display: totals.avg_scores[c] === null ? '–' : totals.avg_scores[c].toFixed(1),
+    }));
+    const revisionRows = stats.histogram_labels.revisions.map((label, i) => ({
+        label: `${label} rev.`,
+        value: totals.revision_histogram[i],
+    }));
+    const categoryRows = Object.entries(totals.flagged_categories)
+        .sort((a, b) => b[1] - a[1])
+        .map(([label, value]) => ({ label, value }));
+    const latencyRows = Object.entries(totals.stage_latency).map(([label, s]) => ({
+        label,
+        value: s.avg_ms,
+        display: `${Math.round(s.avg_ms)} ms`,
+    }));
+
+    container.innerHTML = `
+        ${statsSeriesChart(stats.buckets.slice(-STATS_SERIES_BUCKETS))}
+        ${statsBarChart('Average scores', scoreRows, 10)}
+        ${statsBarChart('Revisions per message', revisionRows)}
+        ${statsBarChart('Flagged categories', categoryRows)}
+        ${statsBarChart('Avg stage latency', latencyRows)}`;
+}
+
+function statsBarChart(title, rows, max) {
+    if (rows.length === 0) {
+        return `<div class="stats-chart"><h3>${title}</h3><p class="stats-empty">None</p></div>`;
     }
+    const scale = max || Math.max(...rows.map(r => r.value), 1);
+    return `
+        <div class="stats-chart">
+            <h3>${title}</h3>
+            ${rows.map(r => `
+                <div class="stats-row">
+                    <span class="stats-row-label">${escapeHtml(r.label)}</span>
+                    <div class="stats-row-track">
+                        <div class="stats-row-fill" style="width:${(r.value / scale) * 100}%"></div>
+                    </div>
+                    <span class="stats-row-value">${r.display ?? r.value}</span>
+                </div>`).join('')}
+        </div>`;
+}
+
+function statsSeriesChart(buckets) {
+    const width = 600;
+    const height = 120;
+    const maxCount = Math.max(...buckets.map(b => b.count), 1);
+    const step = width / buckets.length;
+
+    const bars = buckets.map((b, i) => {
+        const h = (b.count / maxCount) * (height - 10);
+        return `<rect class="bar" x="${i * step + 2}" y="${height - h}" width="${Math.max(step - 4, 1)}" height="${h}">
+                    <title>${b.bucket}: ${b.count} messages, ${Math.round((b.approval_rate || 0) * 100)}% approved</title>
+                </rect>`;
+    }).join('');
+    const points = buckets.map((b, i) =>
+        `${i * step + step / 2},${height - (b.approval_rate || 0) * (height - 10)}`
+    ).join(' ');
+
+    return `
+        <div class="stats-chart wide">
+            <h3>Volume and approval rate (${buckets[0].bucket} → ${buckets[buckets.length - 1].bucket})</h3>
+            <svg class="stats-series" viewBox="0 0 ${width} ${height}" preserveAspectRatio="none">
+                ${bars}
+                <polyline class="rate" points="${points}" vector-effect="non-scaling-stroke" />
+            </svg>
+            <div class="stats-legend">
+                <span>▮ messages</span>
+                <span style="color: var(--success)">— approval rate</span>
+            </div>
+        </div>`;
 }
 
 async function clearLogs() {
     try {
         await fetch(`${API_BASE}/api/logs`, { method: 'DELETE' });
-        refreshLogs();
+        if (!eventsConnected) refreshLogs();
     } catch (error) {
         console.error('Failed to clear logs:', error);
     }
@@ -473,7 +810,7 @@ function closeArchModal(event) {
     }
 }
 
-// Load log count on page load
+// Subscribe to the event channel on page load; logs are loaded once it opens
 document.addEventListener('DOMContentLoaded', () => {
-    refreshLogs();
+    connectEvents();
 });